@@ -0,0 +1,51 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure the latency of the autocomplete suggestions while typing at the end
+of a long script.
+
+Usage: python benchmarks/autocomplete.py [lines]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.autocomplete.engine import SQLAutocompleteEngine
+
+STATEMENT = '''SELECT o.customer_id, SUM(o.price * o.quantity) AS total
+FROM orders o JOIN customers c ON c.id = o.customer_id
+WHERE o.status = 'paid' AND c.country IN ('RO', 'FR', 'DE')
+GROUP BY o.customer_id
+ORDER BY total DESC;
+UPDATE customers SET last_order = NOW() WHERE id = 10;
+'''
+
+class Model:
+    '''No database, the suggestions come from the script itself'''
+    database = None
+    connection = None
+    columns = []
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    script = STATEMENT * (lines // STATEMENT.count('\n'))
+    engine = SQLAutocompleteEngine(Model())
+
+    typed = 'SELECT * FROM orders o WHERE o.'
+    engine.get_suggestions(script, len(script))
+
+    start = time.perf_counter()
+    for i in range(1, len(typed) + 1):
+        text = script + typed[0:i]
+        engine.get_suggestions(text, len(text))
+    elapsed = time.perf_counter() - start
+    print('{0} lines: {1:.2f} ms per request'.format(script.count('\n'),
+        elapsed / len(typed) * 1000))
+
+if __name__ == '__main__':
+    main()
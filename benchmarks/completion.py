@@ -0,0 +1,86 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure the latency of the autocomplete suggestions of a database with a
+huge number of tables, ranked by the usage of the tables in the statements
+run by the user.
+
+Usage: python benchmarks/completion.py [tables]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.autocomplete.engine import SQLAutocompleteEngine
+from mitzasql.db.query_log import WordUsage
+
+WORDS = ('orders', 'customers', 'products', 'invoices', 'payments', 'stock',
+        'shipments', 'reviews', 'tags', 'users')
+
+class Cursor:
+    def __init__(self, rows):
+        self.description = ()
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+class Connection:
+    '''Serves the database schema from memory'''
+    WORD_USAGE = WordUsage()
+
+    def __init__(self, tables):
+        self.pool = self
+        self._objects = [(table, 0, 0, None, None, 'InnoDB', '', 'BASE TABLE')
+                for table in tables]
+
+    def spare(self):
+        return self
+
+    def close(self):
+        pass
+
+    def query(self, query, params=None):
+        if query == 'SHOW DATABASES':
+            return Cursor([('shop',)])
+        if 'INFORMATION_SCHEMA.ROUTINES' in query:
+            return Cursor(self._objects)
+        return Cursor([])
+
+class Model:
+    database = 'shop'
+    columns = []
+
+    def __init__(self, connection):
+        self.connection = connection
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tables = ['{0}_{1}'.format(WORDS[i % len(WORDS)], i) for i in range(count)]
+    connection = Connection(tables)
+    for i in range(0, count, 7):
+        connection.WORD_USAGE.add('SELECT * FROM {0} WHERE id = 1'.format(
+            tables[i]))
+    engine = SQLAutocompleteEngine(Model(connection))
+
+    typed = 'SELECT * FROM orders o JOIN payments_'
+    text = typed[0:-9]
+    start = time.perf_counter()
+    engine.get_suggestions(text, len(text))
+    print('{0} tables, catalog loaded in {1:.2f} s'.format(count,
+        time.perf_counter() - start))
+
+    requests = range(len(text), len(typed) + 1)
+    start = time.perf_counter()
+    for i in requests:
+        engine.get_suggestions(typed, i)
+    elapsed = time.perf_counter() - start
+    print('{0:.2f} ms per request'.format(elapsed / len(requests) * 1000))
+
+if __name__ == '__main__':
+    main()
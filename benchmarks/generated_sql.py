@@ -0,0 +1,56 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure parsing and autocompleting generated SQL: huge IN lists, multi-row
+INSERTs and long chains of conditions.
+
+Usage: python benchmarks/generated_sql.py [rows]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.sql_parser.parser import parse
+from mitzasql.autocomplete.engine import SQLAutocompleteEngine
+
+class Model:
+    '''No database, the suggestions come from the script itself'''
+    database = None
+    connection = None
+    columns = []
+
+def scripts(rows):
+    ids = ', '.join(str(i) for i in range(rows))
+    yield 'IN list', ('SELECT * FROM orders o WHERE o.id IN ({0}) '
+            'AND o.'.format(ids))
+
+    values = ', '.join("({0}, 'name {0}', 19.99, NOW())".format(i)
+            for i in range(rows // 2))
+    yield 'INSERT', ('INSERT INTO orders (id, name, price, created_at) '
+            'VALUES {0};\nSELECT * FROM orders o WHERE o.'.format(values))
+
+    conditions = ' OR '.join('id = {0}'.format(i) for i in range(rows // 10))
+    yield 'OR chain', ('SELECT * FROM orders o WHERE {0} '
+            'AND o.'.format(conditions))
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    for name, sql in scripts(rows):
+        start = time.perf_counter()
+        parse(sql)
+        parsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SQLAutocompleteEngine(Model()).get_suggestions(sql, len(sql))
+        suggested = time.perf_counter() - start
+        print('{0} ({1:.1f} KB): parse {2:.2f} s, autocomplete {3:.2f} s'.format(
+            name, len(sql) / 1024, parsed, suggested))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure the throughput of the SQL lexer on a dump-like script.
+
+Usage: python benchmarks/lexer.py [megabytes]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.sql_parser.lexer import Lexer
+
+STATEMENTS = '''-- Dumping data for table `orders`
+INSERT INTO `orders` (`id`, `customer_id`, `status`, `price`, `created_at`) VALUES
+(1, 10, 'paid', 19.99, '2021-01-01 10:00:00'),
+(2, 11, 'it''s pending', 5.5e2, NULL),
+(3, 12, "refunded", .75, '2021-01-03 12:30:00');
+/* Select the totals */
+SELECT o.customer_id, SUM(o.price * 2) AS total, @rate := 0x1F + b'01'
+FROM orders o WHERE o.status <> 'paid' AND o.price >= 10 # only paid
+GROUP BY o.customer_id HAVING total > 100 ORDER BY total DESC LIMIT 10;
+'''
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    sql = STATEMENTS * int(megabytes * 1024 * 1024 / len(STATEMENTS))
+
+    start = time.perf_counter()
+    count = 0
+    for token in Lexer(sql).tokenize():
+        count += 1
+    elapsed = time.perf_counter() - start
+    print('{0:.1f} MB, {1:,} tokens: {2:.2f} MB/s'.format(
+        len(sql) / 1024 / 1024, count, len(sql) / 1024 / 1024 / elapsed))
+
+if __name__ == '__main__':
+    main()
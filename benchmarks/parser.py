@@ -0,0 +1,39 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure the throughput of the SQL parser on a script of common statements.
+
+Usage: python benchmarks/parser.py [statements]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.sql_parser.parser import parse
+
+STATEMENTS = '''SELECT o.customer_id, SUM(o.price * o.quantity) AS total
+FROM orders o JOIN customers c ON c.id = o.customer_id
+WHERE o.status = 'paid' AND c.country IN ('RO', 'FR', 'DE')
+GROUP BY o.customer_id HAVING total > 100 ORDER BY total DESC LIMIT 10;
+UPDATE customers SET orders = orders + 1, country = UPPER(country) WHERE id = 10;
+INSERT INTO orders (customer_id, price, quantity) VALUES (10, 19.99, 2);
+DELETE FROM carts WHERE updated_at < '2021-01-01' AND customer_id IS NULL;
+'''
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sql = STATEMENTS * (count // STATEMENTS.count(';'))
+
+    start = time.perf_counter()
+    statements = parse(sql)
+    elapsed = time.perf_counter() - start
+    print('{0:,} statements: {1:,.0f} statements/s'.format(len(statements),
+        len(statements) / elapsed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure the latency of typing in the query editor: every keystroke edits
+the text and renders the editor.
+
+Usage: python benchmarks/query_editor.py [lines]
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.ui.widgets.query_editor import QueryEditor
+
+STATEMENT = '''/* Add the customer's order totals */
+INSERT INTO `order_totals` (customer_id, total, updated_at)
+SELECT o.customer_id, SUM(o.price * o.quantity), NOW()
+FROM orders o WHERE o.status = 'paid' -- only paid orders
+GROUP BY o.customer_id;
+'''
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = STATEMENT * (lines // STATEMENT.count('\n'))
+    editor = QueryEditor(None)
+    editor.set_edit_text(text)
+    editor.set_edit_pos(len(text) // 2)
+    size = (120,)
+    editor.render(size, focus=True)
+
+    keystrokes = 50
+    start = time.perf_counter()
+    for i in range(keystrokes):
+        editor.insert_text('x')
+        editor.render(size, focus=True)
+    elapsed = time.perf_counter() - start
+    print('{0} lines: {1:.2f} ms per keystroke'.format(text.count('\n'),
+        elapsed / keystrokes * 1000))
+
+if __name__ == '__main__':
+    main()
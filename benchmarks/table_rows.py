@@ -0,0 +1,74 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Measure how many table rows per second are turned into row widgets and
+rendered.
+
+Usage: python benchmarks/table_rows.py [rows]
+'''
+
+import os
+import sys
+import time
+import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitzasql.db.model import Model
+from mitzasql.ui.widgets.table import TBody
+
+def column(name, max_len, **flags):
+    info = {
+            'name': name,
+            'max_len': max_len,
+            'is_int': False,
+            'is_real': False,
+            'is_binary': False,
+            'is_text': False,
+            'is_spatial': False
+            }
+    info.update(flags)
+    return info
+
+columns = [
+        column('id', 8, is_int=True),
+        column('name', 20, is_text=True),
+        column('description', 40, is_text=True),
+        column('price', 10, is_real=True),
+        column('created', 19),
+        column('data', 12, is_binary=True),
+        column('deleted', 19)
+        ]
+
+def make_rows(count):
+    rows = []
+    for i in range(count):
+        rows.append((i, 'name {0}'.format(i),
+            'a long description which\nspans lines {0}'.format(i) * 2,
+            Decimal('{0}.99'.format(i)), datetime.datetime(2021, 1, 1, 12, 30),
+            bytearray(b'\x00\xff\x10'), None))
+    return rows
+
+def bench(label, rows, job):
+    start = time.perf_counter()
+    for row in rows:
+        job(row)
+    elapsed = time.perf_counter() - start
+    print('{0:<24} {1:>12,.0f} rows/s'.format(label, len(rows) / elapsed))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rows = make_rows(count)
+    cell_sizes = [c['max_len'] for c in columns]
+    body = TBody(columns, cell_sizes, Model(rows, columns))
+    width = sum(cell_sizes) + len(cell_sizes)
+
+    bench('build', rows, body.make_row)
+    bench('build and render', rows,
+            lambda row: body.make_row(row).render((width,), focus=False))
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,8 @@ import sys
 from .sessions_registry import SessionsRegistry
 from .logger import LoggerMixin
 from .ui import ui
-from .db.connection import Connection
+from .db.connection import (Connection, ConnectionPool)
+from .db.executor import executor_instance
 from . import constants as const
 
 class App(LoggerMixin):
@@ -73,22 +74,24 @@ class App(LoggerMixin):
 
         """
         select_session_screen.show_message(u'Connecting...')
-        ui.refresh() # required because the next call will block the event loop
 
         if session_name is not None:
             connection_data = self._sessions_registry[session_name]
 
-        con, error_message = Connection.factory(connection_data,
-                session_name=session_name)
-        if con is None:
-            select_session_screen.set_connection_result(False,
-                    str(error_message), session_name, connection_data)
-            return
+        def connected(result):
+            con, error_message = result
+            if con is None:
+                select_session_screen.set_connection_result(False,
+                        str(error_message), session_name, connection_data)
+                return
 
-        self.connection = con
-        screen = ui.build_screen(const.SCREEN_SESSION, display=True,
-            connection=con)
-        self._screen = screen
+            self.connection = con
+            screen = ui.build_screen(const.SCREEN_SESSION, display=True,
+                connection=con)
+            self._screen = screen
+
+        executor_instance.submit(Connection.factory, connection_data,
+                session_name, callback=connected)
 
     def test_connection(self, select_session_screen, connection_data):
         """Test database connection
@@ -101,14 +104,17 @@ class App(LoggerMixin):
         """
 
         select_session_screen.show_message(u'Connecting...')
-        ui.refresh() # required because the next call will block the event loop
-        result, error_message = Connection.test(connection_data)
 
-        if result is False:
-            select_session_screen.set_connection_test_result(False,
-                    error=error_message)
-            return
-        select_session_screen.set_connection_test_result(True)
+        def tested(result):
+            result, error_message = result
+            if result is False:
+                select_session_screen.set_connection_test_result(False,
+                        error=error_message)
+                return
+            select_session_screen.set_connection_test_result(True)
+
+        executor_instance.submit(Connection.test, connection_data,
+                callback=tested)
 
     @classmethod
     def run(cls, session_name=None, macro=None, sessions_file=None):
@@ -118,3 +124,4 @@ class App(LoggerMixin):
         # Cleanup
         if instance.connection:
             instance.connection.close()
+        ConnectionPool.close_all()
@@ -10,16 +10,16 @@ def detect_select_next_possible_keywords(context):
         return ['from']
 
     if context == 'table':
-        return ['where', 'group', 'by', 'having', 'order', 'limit']
+        return ['by', 'group', 'having', 'limit', 'order', 'where']
 
     if context == 'where':
-        return ['group', 'by', 'having', 'order', 'limit']
+        return ['by', 'group', 'having', 'limit', 'order']
 
     if context == 'group':
-        return ['having', 'order', 'limit']
+        return ['having', 'limit', 'order']
 
     if context == 'having':
-        return ['order', 'by', 'limit']
+        return ['by', 'limit', 'order']
 
     if context == 'order':
         return ['limit']
@@ -28,13 +28,13 @@ def detect_select_next_possible_keywords(context):
 
 def detect_update_next_possible_keywords(context):
     if context == 'table':
-        return ['set', 'where', 'by', 'order', 'limit']
+        return ['by', 'limit', 'order', 'set', 'where']
 
     if context == 'assignment_list':
-        return ['where', 'by', 'order', 'limit']
+        return ['by', 'limit', 'order', 'where']
 
     if context == 'where':
-        return ['by', 'order', 'limit']
+        return ['by', 'limit', 'order']
 
     if context == 'order':
         return ['limit']
@@ -43,13 +43,13 @@ def detect_update_next_possible_keywords(context):
 
 def detect_delete_next_possible_keywords(context):
     if context == 'table_references':
-        return ['from', 'where', 'by', 'order', 'limit']
+        return ['by', 'from', 'limit', 'order', 'where']
 
     if context == 'context':
-        return ['using', 'where', 'by', 'order', 'limit']
+        return ['by', 'limit', 'order', 'using', 'where']
 
     if context == 'where':
-        return ['by', 'order', 'limit']
+        return ['by', 'limit', 'order']
 
     if context == 'order':
         return ['limit']
@@ -57,133 +57,121 @@ def detect_delete_next_possible_keywords(context):
     return []
 
 def detect_call_context(ast_node):
-    if ast_node is None:
-        return
+    while ast_node is not None:
+        node_type = ast_node.type
+        node_value = ast_node.value or ''
+        node_value = node_value.lower()
 
-    node_type = ast_node.type
-    node_value = ast_node.value or ''
-    node_value = node_value.lower()
+        if node_type == 'function':
+            return 'arguments'
 
-    if node_type == 'function':
-        return 'arguments'
+        if node_type == 'proc':
+            return 'proc'
 
-    if node_type == 'proc':
-        return 'proc'
-
-    return detect_call_context(ast_node.parent)
+        ast_node = ast_node.parent
 
 def detect_update_context(ast_node):
-    if ast_node is None:
-        return
-
-    node_type = ast_node.type
-    node_value = ast_node.value or ''
-    node_value = node_value.lower()
+    while ast_node is not None:
+        node_type = ast_node.type
+        node_value = ast_node.value or ''
+        node_value = node_value.lower()
 
-    if node_type == 'assignment_list':
-        return node_type
+        if node_type == 'assignment_list':
+            return node_type
 
-    if node_type == 'join_spec':
-        return 'column'
+        if node_type == 'join_spec':
+            return 'column'
 
-    if node_type == 'table_references':
-        return 'table'
+        if node_type == 'table_references':
+            return 'table'
 
-    if node_type in ('where', 'order'):
-        return node_type
+        if node_type in ('where', 'order'):
+            return node_type
 
-    return detect_update_context(ast_node.parent)
+        ast_node = ast_node.parent
 
 def detect_insert_context(ast_node):
-    if ast_node is None:
-        return
-
-    node_type = ast_node.type
-    node_value = ast_node.value or ''
-    node_value = node_value.lower()
+    while ast_node is not None:
+        node_type = ast_node.type
+        node_value = ast_node.value or ''
+        node_value = node_value.lower()
 
-    if node_type == 'assignment_list':
-        return node_type
+        if node_type == 'assignment_list':
+            return node_type
 
-    if node_type == 'into':
-        return 'table'
+        if node_type == 'into':
+            return 'table'
 
-    if node_type == 'columns':
-        return 'column'
+        if node_type == 'columns':
+            return 'column'
 
-    if node_type == 'update':
-        return 'column'
+        if node_type == 'update':
+            return 'column'
 
-    return detect_insert_context(ast_node.parent)
+        ast_node = ast_node.parent
 
 def detect_delete_context(ast_node):
-    if ast_node is None:
-        return
+    while ast_node is not None:
+        node_type = ast_node.type
+        node_value = ast_node.value or ''
+        node_value = node_value.lower()
 
-    node_type = ast_node.type
-    node_value = ast_node.value or ''
-    node_value = node_value.lower()
+        if node_type == 'join_spec':
+            return 'column'
 
-    if node_type == 'join_spec':
-        return 'column'
+        if node_type == 'table_references':
+            return 'table_references'
 
-    if node_type == 'table_references':
-        return 'table_references'
+        if node_type == 'from' or node_type == 'using':
+            return 'table'
 
-    if node_type == 'from' or node_type == 'using':
-        return 'table'
+        if node_type in ('where', 'order'):
+            return node_type
 
-    if node_type in ('where', 'order'):
-        return node_type
-
-    return detect_delete_context(ast_node.parent)
+        ast_node = ast_node.parent
 
 def detect_select_context(ast_node):
-    if ast_node is None:
-        return
-
-    node_type = ast_node.type
-    node_value = ast_node.value or ''
-    node_value = node_value.lower()
+    while ast_node is not None:
+        node_type = ast_node.type
+        node_value = ast_node.value or ''
+        node_value = node_value.lower()
 
-    if node_type == 'column' or node_type == 'columns' or node_type == 'join_spec':
-        return 'column'
+        if node_type == 'column' or node_type == 'columns' or node_type == 'join_spec':
+            return 'column'
 
-    if node_type == 'index_hint':
-        return node_type
+        if node_type == 'index_hint':
+            return node_type
 
-    if node_type == 'table_reference' or node_type == 'from':
-        return 'table'
+        if node_type == 'table_reference' or node_type == 'from':
+            return 'table'
 
-    if node_type in ('where', 'having', 'order', 'group'):
-        return node_type
+        if node_type in ('where', 'having', 'order', 'group'):
+            return node_type
 
-    if node_type == 'modifier':
-        return 'select_modifier'
+        if node_type == 'modifier':
+            return 'select_modifier'
 
-    if node_type == 'charset':
-        return 'charset'
+        if node_type == 'charset':
+            return 'charset'
 
-    if node_type == 'variable':
-        return 'variable'
+        if node_type == 'variable':
+            return 'variable'
 
-    return detect_select_context(ast_node.parent)
+        ast_node = ast_node.parent
 
 def detect_set_context(ast_node):
-    if ast_node is None:
-        return
-
-    node_type = ast_node.type
-    node_value = ast_node.value or ''
-    node_value = node_value.lower()
+    while ast_node is not None:
+        node_type = ast_node.type
+        node_value = ast_node.value or ''
+        node_value = node_value.lower()
 
-    if node_type == 'set' and ast_node.parent is None:
-        return 'set'
+        if node_type == 'set' and ast_node.parent is None:
+            return 'set'
 
-    if node_type == 'character':
-        return 'character'
+        if node_type == 'character':
+            return 'character'
 
-    if node_type == 'variable':
-        return 'variable'
+        if node_type == 'variable':
+            return 'variable'
 
-    return detect_set_context(ast_node.parent)
+        ast_node = ast_node.parent
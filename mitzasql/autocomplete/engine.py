@@ -5,8 +5,11 @@
 import bisect
 import itertools
 from pygments.lexers import _mysql_builtins
-from ..sql_parser.parser import (parse, get_last_parsed_node)
-from .smart_suggestions import (smart_suggestions, set_smart_suggestions_model)
+from ..sql_parser.parser import (parse, get_last_parsed_node,
+        split_statements)
+from ..db.executor import executor_instance
+from .smart_suggestions import (smart_suggestions, set_smart_suggestions_model,
+        create_suggestions_pool, merge_suggestions_pools)
 
 word_separators = [' ', '\t', '\n', '.', ';', ',', '"', "'", '`', '#', '(',
                    ')', '[', ']', '/', '=', '<', '>', '\\', '|', '+', '-', '%', '*']
@@ -15,13 +18,20 @@ mysql_keywords = itertools.chain(_mysql_builtins.MYSQL_DATATYPES,
         _mysql_builtins.MYSQL_FUNCTIONS, _mysql_builtins.MYSQL_OPTIMIZER_HINTS,
         _mysql_builtins.MYSQL_KEYWORDS)
 
-keywords_pool = {}
-for kw in mysql_keywords:
-    c = kw[0]
-    if c not in keywords_pool:
-        keywords_pool[c] = []
+keywords_pool = sorted(set(kw.lower() for kw in mysql_keywords))
 
-    bisect.insort(keywords_pool[c], kw.lower())
+def prefix_range(items, prefix):
+    '''The start and end indexes of the items starting with `prefix` in the
+    sorted `items`'''
+    start = bisect.bisect_left(items, prefix)
+    end = bisect.bisect_left(items, prefix + '\U0010ffff', start)
+    return (start, end)
+
+def in_range(items, item, start, end):
+    '''True if `item` is between the `start` and `end` indexes of the sorted
+    `items`'''
+    index = bisect.bisect_left(items, item, start, end)
+    return index < end and items[index] == item
 
 
 class SQLAutocompleteEngine:
@@ -29,12 +39,32 @@ class SQLAutocompleteEngine:
     Uses the sql_parser module to generate ASTs from a SQL string
     and determine possible suggestions. If that fails, fall back to
     "dumb" suggestions (reserved keywords)
+
+    The text is split into statements and only the statement the cursor is
+    in is parsed on every request. The ASTs and the suggestions pools of the
+    statements before it are cached by the statements' text.
+
+    The suggestions are ranked by context, then by how many queries of the
+    query log used them, then alphabetically and only the first
+    MAX_SUGGESTIONS are returned.
     '''
+    MAX_SUGGESTIONS = 100
+
     def __init__(self, model):
         self._model = model
         self._last_search = None
         self._cached_suggestions = []
         self._cached_prefix = None
+        self._statements = []
+        # statement text => (ASTs, suggestions pool)
+        self._parsed_statements = {}
+        # The merged pool of the statements before the cursor's statement
+        self._pool_statements = None
+        self._pool = None
+        # (sorted words, word => usage) of the user's statements, see
+        # _word_usage()
+        self._usage = ([], {})
+        self._usage_changes = None
 
     def _get_keyword_prefix(self, text):
         pos = len(text)
@@ -61,11 +91,15 @@ class SQLAutocompleteEngine:
         self._last_search = text
         prefix = self._get_keyword_prefix(text)
 
-        ast = parse(text)
+        statements = self._split_statements(text)
+        ast = parse(statements[-1])
 
         if len(ast):
             last_node = get_last_parsed_node()
-            suggestion_candidates = smart_suggestions(ast, last_node, prefix)
+            pools = [self._statements_pool(statements[0:-1]),
+                    create_suggestions_pool(ast)]
+            suggestion_candidates = smart_suggestions(ast, last_node, prefix,
+                    pools)
         else:
             suggestion_candidates = []
 
@@ -75,32 +109,108 @@ class SQLAutocompleteEngine:
         self._cached_prefix = prefix
         return self._cached_suggestions, self._cached_prefix
 
+    def _split_statements(self, text):
+        '''Split the text into statements. Only the text after the
+        statements found by the previous call, which are still there, is
+        lexed'''
+        statements = []
+        offset = 0
+        for statement in self._statements[0:-1]:
+            if not text.startswith(statement, offset):
+                break
+            statements.append(statement)
+            offset += len(statement)
+
+        statements.extend(split_statements(text[offset:]))
+        self._statements = statements
+        return statements
+
+    def _statements_pool(self, statements):
+        '''The merged suggestions pool of the statements'''
+        if statements == self._pool_statements:
+            return self._pool
+
+        parsed = {}
+        pools = []
+        for statement in statements:
+            result = self._parsed_statements.get(statement)
+            if result is None:
+                ast = parse(statement)
+                result = (ast, create_suggestions_pool(ast))
+            parsed[statement] = result
+            pools.append(result[1])
+
+        self._parsed_statements = parsed
+        self._pool_statements = statements
+        self._pool = merge_suggestions_pools(pools)
+        return self._pool
+
+    def request_suggestions(self, text, pos, callback):
+        '''Same as `get_suggestions` but the suggestions, which may require
+        querying the database, are computed on the database executor and
+        passed to `callback`'''
+        executor_instance.submit(self.get_suggestions, text, pos,
+                callback=callback, key=self._model.connection)
+
     def get_word_separators(self):
         return word_separators
 
+    def _word_usage(self):
+        '''The words used by the statements run by the user, sorted, and the
+        number of statements which used each of them'''
+        connection = self._model.connection
+        if connection is None:
+            return ([], {})
+
+        word_usage = connection.WORD_USAGE
+        if self._usage_changes != (word_usage, word_usage.changes):
+            usage = word_usage.usage()
+            self._usage = (sorted(usage), usage)
+            self._usage_changes = (word_usage, word_usage.changes)
+        return self._usage
+
     def _compile(self, candidates, prefix):
+        '''Merge the candidates starting with the prefix. The candidates are
+        sorted lists, ordered by how well they match the context'''
         candidates += [self._dumb_suggestions(prefix)]
+        prefix = prefix.lower()
+        used_words, usage = self._word_usage()
+        used_start, used_end = prefix_range(used_words, prefix)
 
         compiled_suggestions = []
+        compiled = set()
         for sugg_set in candidates:
-            filtered_set = list(filter(lambda str: str.startswith(prefix.lower()), sugg_set))
-            if not len(filtered_set):
+            start, end = prefix_range(sugg_set, prefix)
+            if start == end:
                 continue
 
-            for item in filtered_set:
-                if item not in compiled_suggestions:
-                    compiled_suggestions.append(item)
+            if end - start <= used_end - used_start:
+                ranked = sorted(sugg_set[start:end],
+                        key=lambda item: -usage.get(item, 0))
+            else:
+                # Rank only the used words which are candidates, the rest
+                # follow in order
+                used = [item for item in used_words[used_start:used_end]
+                        if in_range(sugg_set, item, start, end)]
+                used.sort(key=lambda item: -usage[item])
+                ranked = itertools.chain(used,
+                        (sugg_set[i] for i in range(start, end)))
+
+            for item in ranked:
+                if item in compiled:
+                    continue
+
+                compiled.add(item)
+                compiled_suggestions.append(item)
+                if len(compiled_suggestions) == self.MAX_SUGGESTIONS:
+                    return compiled_suggestions
 
         return compiled_suggestions
 
     def _dumb_suggestions(self, prefix):
+        '''The keywords, `_compile` picks the ones starting with the
+        prefix'''
         if not prefix:
             return []
 
-        first_char = prefix[0].lower()
-
-        try:
-            suggestions = keywords_pool[first_char]
-            return suggestions
-        except:
-            return []
+        return keywords_pool
@@ -5,6 +5,7 @@
 import bisect
 from mitzasql.utils import dfs, walk_ast
 from mitzasql.db.model import *
+from mitzasql.db.catalog import SchemaCatalog
 import mitzasql.sql_parser.ast as Ast
 import mitzasql.sql_parser.tokens as Token
 from mitzasql.autocomplete.context_detection import *
@@ -43,6 +44,19 @@ def add_to_pool(key, value):
 
     bisect.insort(suggestions_pool[key], value)
 
+def add_all_to_pool(key, values):
+    '''Same as add_to_pool() for many values, sorted once'''
+    pool = suggestions_pool[key]
+    values = set(value.lower().replace('`', '') for value in values
+            if value is not None)
+    values.discard(prefix)
+    values.difference_update(pool)
+    if not values:
+        return
+
+    pool.extend(values)
+    pool.sort()
+
 def filter_columns(data, no_aliases=False, filter_star_operator=False):
     if not no_aliases and not filter_star_operator:
         return data
@@ -110,6 +124,36 @@ def create_suggestions_from_ast(ast):
 
     walk_ast(ast, node_inspector)
 
+def create_suggestions_pool(ast_list):
+    '''The pool of tables, columns, aliases and variables found in the
+    statements, regardless of the prefix'''
+    global suggestions_pool
+    global prefix
+
+    saved_pool, saved_prefix = suggestions_pool, prefix
+    prefix = None
+    reset_suggestions_pool()
+    try:
+        for ast_root in ast_list:
+            create_suggestions_from_ast(ast_root)
+        return suggestions_pool
+    finally:
+        suggestions_pool, prefix = saved_pool, saved_prefix
+
+def merge_suggestions_pools(pools, prefix=None):
+    '''Merge the pools created by `create_suggestions_pool` leaving out the
+    prefix, same as add_to_pool()'''
+    merged = {}
+    for key in ('variables', 'columns', 'databases', 'tables'):
+        values = set()
+        for pool in pools:
+            values.update(pool[key])
+        values.discard(prefix)
+        merged[key] = sorted(values)
+
+    merged['aliases'] = [alias for pool in pools for alias in pool['aliases']]
+    return merged
+
 def get_table_for_insert():
     into = ast.get_child('into')
     if into is None or not into.has_children():
@@ -135,9 +179,7 @@ def table_name_from_alias(alias):
     return alias
 
 def current_table_columns_suggestions():
-    cols = model.columns
-    for col in cols:
-        add_to_pool('columns', col['name'])
+    add_all_to_pool('columns', [col['name'] for col in model.columns])
 
     return suggestions_pool['columns']
 
@@ -145,31 +187,19 @@ def table_columns_suggestions(table_name, db_name=None, return_from_pool=True):
     if isinstance(table_name, str):
         table_name = [table_name.replace('`', '')]
 
-    table_name = [item.lower().replace('`', '') for item in table_name]
-
-    query = '''
-        SELECT
-            column_name
-        FROM `information_schema`.`columns`
-        WHERE
-            LOWER(table_schema) = LOWER(%(db_name)s)
-            AND
-            LOWER(table_name) in ("{0}")
-        ORDER BY column_name
-    '''.format('","'.join(table_name))
+    table_name = [item.replace('`', '') for item in table_name]
 
     db_name = db_name if db_name is not None else model.database
     try:
-        cursor = model.connection.query(query, {
-            'db_name': db_name
-            })
+        catalog = SchemaCatalog.get(model.connection)
+        columns = []
+        for table in table_name:
+            columns.extend(catalog.columns(model.connection, db_name, table))
     except:
         return []
 
-    data = cursor.fetchall()
-    columns = [row[0] for row in data]
-    for col in columns:
-        add_to_pool('columns', col)
+    columns.sort()
+    add_all_to_pool('columns', columns)
 
     if return_from_pool:
         return suggestions_pool['columns']
@@ -204,49 +234,28 @@ def column_suggestions(context='column', table_name=None):
     return []
 
 def database_suggestions():
-    query = 'SHOW DATABASES'
     try:
-        cursor = model.connection.query(query)
+        databases = SchemaCatalog.get(model.connection).databases(model.connection)
     except Exception as e:
         return []
 
-    data = cursor.fetchall()
-    for row in data:
-        add_to_pool('databases', row[0])
+    return databases.keys
 
-    return suggestions_pool['databases']
+def table_suggestions():
+    '''The tables of the statements followed by the tables of the
+    database'''
+    if last_node.parent and last_node.parent.type == 'identifier':
+        return [catalog_table_suggestions(last_node.parent.value.replace('`', ''))]
 
-def table_suggestions(database=None, return_from_pool=True):
-    if database is None:
-        if last_node.parent and last_node.parent.type == 'identifier':
-            return table_suggestions(last_node.parent.value.replace('`', ''), return_from_pool=False)
-        else:
-            database = model.database
+    return [suggestions_pool['tables'], catalog_table_suggestions(model.database)]
 
-    query = '''
-        SELECT
-            TABLE_NAME AS Name
-        FROM
-            `information_schema`.`tables`
-        WHERE TABLE_SCHEMA = %(db_name)s
-        ORDER BY Name
-        '''
+def catalog_table_suggestions(database):
     try:
-        cursor = model.connection.query(query, {
-            'db_name': database
-            })
+        return SchemaCatalog.get(model.connection).tables(model.connection,
+                database).keys
     except Exception as e:
         return []
 
-    data = cursor.fetchall()
-    tables = [row[0] for row in data]
-    for table in tables:
-        add_to_pool('tables', table)
-
-    if return_from_pool:
-        return suggestions_pool['tables']
-    return tables
-
 def proc_suggestions(database=None):
     if database is None:
         if last_node.parent and last_node.parent.type == 'identifier':
@@ -254,25 +263,12 @@ def proc_suggestions(database=None):
         else:
             database = model.database
 
-    query = '''
-        SELECT
-            SPECIFIC_NAME AS Name
-        FROM
-            INFORMATION_SCHEMA.ROUTINES
-        WHERE ROUTINE_SCHEMA = %(db_name)s
-        ORDER BY Name
-    '''
-
     try:
-        cursor = model.connection.query(query, {
-            'db_name': database
-            })
+        procs = SchemaCatalog.get(model.connection).routines(model.connection,
+                database).keys
     except Exception as e:
         return []
 
-    data = cursor.fetchall()
-    procs = [row[0] for row in data]
-
     return procs
 
 def select_suggestions():
@@ -282,14 +278,13 @@ def select_suggestions():
         return []
 
     if suggestions_context == 'table':
-        return [table_suggestions(), database_suggestions(), detect_select_next_possible_keywords(suggestions_context)]
+        return [*table_suggestions(), database_suggestions(), detect_select_next_possible_keywords(suggestions_context)]
 
     if suggestions_context in ('column', 'where', 'group', 'having', 'order'):
         col_suggestions =  column_suggestions(context=suggestions_context)
-        tbl_suggestions = table_suggestions()
         db_suggestions = database_suggestions()
         next_possible_keywords = detect_select_next_possible_keywords(suggestions_context)
-        return [col_suggestions, tbl_suggestions, db_suggestions, next_possible_keywords]
+        return [col_suggestions, *table_suggestions(), db_suggestions, next_possible_keywords]
 
     return []
 
@@ -300,14 +295,13 @@ def update_suggestions():
         return []
 
     if suggestions_context == 'table':
-        return [table_suggestions(), database_suggestions(), detect_update_next_possible_keywords(suggestions_context)]
+        return [*table_suggestions(), database_suggestions(), detect_update_next_possible_keywords(suggestions_context)]
 
     if suggestions_context in ('assignment_list', 'column', 'where', 'order'):
         col_suggestions =  column_suggestions(context=suggestions_context)
-        tbl_suggestions = table_suggestions()
         db_suggestions = database_suggestions()
         next_possible_keywords = detect_update_next_possible_keywords(suggestions_context)
-        return [col_suggestions, tbl_suggestions, db_suggestions, next_possible_keywords]
+        return [col_suggestions, *table_suggestions(), db_suggestions, next_possible_keywords]
 
     return []
 
@@ -318,7 +312,7 @@ def insert_suggestions():
         return []
 
     if suggestions_context == 'table':
-        return [table_suggestions(), database_suggestions()]
+        return [*table_suggestions(), database_suggestions()]
 
     if suggestions_context in ('assignment_list', 'column'):
         table = get_table_for_insert()
@@ -336,14 +330,13 @@ def delete_suggestions():
         return []
 
     if suggestions_context == 'table' or suggestions_context == 'table_references':
-        return [table_suggestions(), database_suggestions(), detect_delete_next_possible_keywords(suggestions_context)]
+        return [*table_suggestions(), database_suggestions(), detect_delete_next_possible_keywords(suggestions_context)]
 
     if suggestions_context in ('column', 'where', 'order'):
         col_suggestions =  column_suggestions(context=suggestions_context)
-        tbl_suggestions = table_suggestions()
         db_suggestions = database_suggestions()
         next_possible_keywords = detect_delete_next_possible_keywords(suggestions_context)
-        return [col_suggestions, tbl_suggestions, db_suggestions, next_possible_keywords]
+        return [col_suggestions, *table_suggestions(), db_suggestions, next_possible_keywords]
 
     return []
 
@@ -368,7 +361,7 @@ def set_suggestions():
         return []
 
     if suggestions_context == 'set':
-        return [['names', 'character', 'charset'], suggestions_pool['variables']]
+        return [['character', 'charset', 'names'], suggestions_pool['variables']]
 
     if suggestions_context == 'variable':
         return [suggestions_pool['variables']]
@@ -390,13 +383,10 @@ ast_handlers = {
 
 def get_ast_handler():
     def get_statement_parent(node):
-        if node is None:
-            return
-
-        if isinstance(node, Ast.Statement):
-            return node
+        while node is not None and not isinstance(node, Ast.Statement):
+            node = node.parent
 
-        return get_statement_parent(node.parent)
+        return node
 
     parent_statement = get_statement_parent(last_node)
     if parent_statement is None:
@@ -407,10 +397,17 @@ def get_ast_handler():
     except:
         return
 
-def smart_suggestions(ast_list, last_node_, prefix_):
+def smart_suggestions(ast_list, last_node_, prefix_, pools=None):
+    '''Returns sorted lists of suggestions, the ones matching the context
+    best first.
+
+    `pools` are the pools created by `create_suggestions_pool` for the
+    statements in `ast_list` and for the statements before them, if
+    missing the pool is created from `ast_list`'''
     global ast
     global last_node
     global prefix
+    global suggestions_pool
 
     ast = ast_list[-1]
     last_node = last_node_
@@ -422,10 +419,13 @@ def smart_suggestions(ast_list, last_node_, prefix_):
     if isinstance(ast, (Ast.Op, Ast.Expression)):
         return []
 
-    reset_suggestions_pool()
+    if pools is None:
+        reset_suggestions_pool()
 
-    for ast_root in ast_list:
-        create_suggestions_from_ast(ast_root)
+        for ast_root in ast_list:
+            create_suggestions_from_ast(ast_root)
+    else:
+        suggestions_pool = merge_suggestions_pools(pools, prefix)
 
     suggestions = []
     ast_handler = get_ast_handler()
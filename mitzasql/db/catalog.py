@@ -0,0 +1,352 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+import time
+import bisect
+import threading
+import weakref
+from collections import OrderedDict
+
+import mysql.connector.errors as errors
+
+from ..logger import LoggerMixin
+from . import schema
+from .executor import executor_instance
+
+# Selects the tables, views, triggers and routines of a database in the format
+# shown by the database view
+OBJECTS_QUERY = '''
+SELECT * FROM ((
+    SELECT
+        TABLE_NAME AS Name,
+        TABLE_ROWS AS `Rows`,
+        DATA_LENGTH AS Size,
+        CREATE_TIME AS Created,
+        UPDATE_TIME AS Updated,
+        ENGINE AS Engine,
+        TABLE_COMMENT AS Comment,
+        TABLE_TYPE AS Type
+    FROM
+        INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = %(db_name)s
+) UNION (
+    SELECT
+        TRIGGER_NAME AS Name,
+        NULL AS `Rows`,
+        NULL AS Size,
+        CREATED AS Created,
+        NULL AS Updated,
+        NULL AS Engine,
+        CONCAT_WS(' ', ACTION_TIMING, EVENT_MANIPULATION, 'in',
+        EVENT_OBJECT_TABLE) AS Comment,
+        'TRIGGER' AS Type
+    FROM INFORMATION_SCHEMA.TRIGGERS
+    WHERE TRIGGER_SCHEMA = %(db_name)s
+) UNION (
+    SELECT
+        SPECIFIC_NAME AS Name,
+        NULL AS `Rows`,
+        NULL AS Size,
+        CREATED AS Created,
+        LAST_ALTERED AS Updated,
+        NULL AS Engine,
+        CONVERT(ROUTINE_COMMENT USING utf8) AS Comment,
+        ROUTINE_TYPE AS Type
+    FROM
+        INFORMATION_SCHEMA.ROUTINES
+    WHERE ROUTINE_SCHEMA = %(db_name)s
+)) AS info ORDER BY Name
+'''
+
+COLUMNS_QUERY = '''
+SELECT table_name, {0}
+FROM `information_schema`.`columns`
+WHERE table_schema = %(db_name)s {1}
+ORDER BY table_name, ordinal_position
+'''
+
+TABLE_TYPES = ('BASE TABLE', 'VIEW', 'SYSTEM VIEW')
+ROUTINE_TYPES = ('PROCEDURE', 'FUNCTION')
+
+def _to_str(value):
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    return value
+
+class NameIndex:
+    '''Sorted, case insensitive index of object names'''
+    def __init__(self, names=()):
+        self._names = {}
+        for name in names:
+            self._names.setdefault(name.lower(), name)
+        self._keys = sorted(self._names)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name):
+        return name.lower() in self._names
+
+    @property
+    def names(self):
+        return [self._names[key] for key in self._keys]
+
+    @property
+    def keys(self):
+        '''The lower cased names, sorted. Don't modify the list'''
+        return self._keys
+
+    def get(self, name):
+        '''Returns the real name of `name` or None if it isn't indexed'''
+        return self._names.get(name.lower())
+
+    def find(self, prefix=''):
+        '''Returns the names starting with `prefix`, in order'''
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + '\U0010ffff', start)
+        return [self._names[key] for key in self._keys[start:end]]
+
+class DatabaseCatalog:
+    '''The objects and columns of a database. The columns of all the tables
+    are loaded in bulk after the objects, the columns of the tables needed in
+    the meantime are loaded one table at a time'''
+    def __init__(self, name, objects, description, columns=None):
+        self.name = name
+        self.loaded_at = time.time()
+        # Table name => OrderedDict as built by TableSchema
+        self.columns = columns if columns is not None else {}
+        # True once the columns of all the tables were loaded
+        self.columns_loaded = columns is not None
+        # Tables whose columns must be loaded again
+        self.stale_tables = set()
+        self.set_objects(objects, description)
+
+    def set_objects(self, objects, description):
+        '''Index the rows and cursor description of OBJECTS_QUERY'''
+        self.objects = objects
+        self.description = description
+        self.objects_loaded_at = time.time()
+
+        tables, routines, triggers = [], [], []
+        for row in objects:
+            name, type_ = _to_str(row[0]), _to_str(row[-1])
+            if type_ in TABLE_TYPES:
+                tables.append(name)
+            elif type_ in ROUTINE_TYPES:
+                routines.append(name)
+            elif type_ == 'TRIGGER':
+                triggers.append(name)
+
+        self.tables = NameIndex(tables)
+        self.routines = NameIndex(routines)
+        self.triggers = NameIndex(triggers)
+
+class SchemaCatalog(LoggerMixin):
+    """
+    In memory catalog of the databases, tables, columns, routines and
+    triggers of a session.
+
+    The objects of a database are loaded in bulk the first time they are
+    needed, the columns of its tables in the background, and are served
+    from memory until they expire after `ttl` seconds
+    or are invalidated (manual refresh or DDL statements). Names are matched
+    case insensitively in memory instead of with LOWER() in the queries,
+    which would defeat the information_schema indexes.
+    """
+    TTL = 300
+    # Unknown objects trigger a reload at most once per interval
+    MISS_RELOAD_INTERVAL = 5
+
+    # ConnectionPool => SchemaCatalog
+    _catalogs = weakref.WeakKeyDictionary()
+    _catalogs_lock = threading.Lock()
+
+    def __init__(self, ttl=None):
+        self.set_log_prefix('SchemaCatalog')
+        self.ttl = ttl or self.TTL
+        # (NameIndex, loaded at) of the databases
+        self._databases = None
+        # Lower cased database name => DatabaseCatalog
+        self._database_catalogs = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, connection):
+        '''Return the catalog of the connection's session'''
+        with cls._catalogs_lock:
+            catalog = cls._catalogs.get(connection.pool)
+            if catalog is None:
+                catalog = cls()
+                cls._catalogs[connection.pool] = catalog
+            return catalog
+
+    def databases(self, connection):
+        '''Returns the NameIndex of the databases'''
+        with self._lock:
+            databases = self._databases
+
+        if databases is None or self._expired(databases[1]):
+            cursor = connection.query('SHOW DATABASES')
+            index = NameIndex([_to_str(row[0]) for row in cursor.fetchall()])
+            databases = (index, time.time())
+            with self._lock:
+                self._databases = databases
+        return databases[0]
+
+    def database(self, connection, name):
+        '''Returns the DatabaseCatalog of the `name` database, matched case
+        insensitively'''
+        if name is None:
+            return None
+
+        key = name.lower()
+        with self._lock:
+            catalog = self._database_catalogs.get(key)
+
+        if catalog is None or self._expired(catalog.loaded_at):
+            catalog = self._load_database(connection, name)
+        return catalog
+
+    def tables(self, connection, database):
+        '''Returns the NameIndex of the tables and views of `database`'''
+        catalog = self.database(connection, database)
+        return catalog.tables if catalog else NameIndex()
+
+    def routines(self, connection, database):
+        catalog = self.database(connection, database)
+        return catalog.routines if catalog else NameIndex()
+
+    def triggers(self, connection, database):
+        catalog = self.database(connection, database)
+        return catalog.triggers if catalog else NameIndex()
+
+    def table_schema(self, connection, database, table):
+        '''Returns the columns of `table` in the format built by TableSchema
+        or None if the table doesn't exist'''
+        catalog = self.database(connection, database)
+        if catalog is None:
+            return None
+
+        if table in catalog.stale_tables:
+            self._load_table(connection, catalog, table)
+        elif table not in catalog.columns and not catalog.columns_loaded:
+            # Needed before the columns of all the tables are loaded
+            self._load_table(connection, catalog, table)
+        elif (table not in catalog.columns and
+                time.time() - catalog.objects_loaded_at > self.MISS_RELOAD_INTERVAL):
+            # The table may have been created after the catalog was loaded
+            self._load_objects(connection, catalog)
+            self._load_table(connection, catalog, table)
+
+        return catalog.columns.get(table)
+
+    def columns(self, connection, database, table):
+        '''Returns the column names of `table`, matched case insensitively'''
+        table = self.tables(connection, database).get(table) or table
+        columns = self.table_schema(connection, database, table)
+        if columns is None:
+            return []
+        return list(columns)
+
+    def invalidate(self, database=None, table=None):
+        '''Drop the catalog of `database` or, if `table` is given, only the
+        columns of the table. Without arguments the whole catalog is
+        dropped'''
+        with self._lock:
+            if database is None:
+                self._databases = None
+                self._database_catalogs.clear()
+                return
+
+            if table is None:
+                self._database_catalogs.pop(database.lower(), None)
+                return
+
+            catalog = self._database_catalogs.get(database.lower())
+            if catalog is not None:
+                catalog.stale_tables.add(table)
+
+    def _expired(self, loaded_at):
+        return time.time() - loaded_at > self.ttl
+
+    def _load_database(self, connection, name):
+        # Use the real name so the queries can use the indexes
+        databases = self.databases(connection)
+        name = databases.get(name) or name
+        self.log_debug('Loading database %s', name)
+
+        cursor = connection.query(OBJECTS_QUERY, {'db_name': name})
+        catalog = DatabaseCatalog(name, cursor.fetchall(), cursor.description)
+        with self._lock:
+            self._database_catalogs[name.lower()] = catalog
+
+        self._load_columns_later(connection, catalog)
+        return catalog
+
+    def _load_objects(self, connection, catalog):
+        cursor = connection.query(OBJECTS_QUERY, {'db_name': catalog.name})
+        objects = cursor.fetchall()
+        with self._lock:
+            catalog.set_objects(objects, cursor.description)
+
+    def _load_columns_later(self, connection, catalog):
+        '''Load the columns of all the tables of the database on a separate
+        connection, without holding up the queries of the models'''
+        def load():
+            try:
+                spare = connection.spare()
+                if spare is None:
+                    # The pool is full, the columns are loaded one table at
+                    # a time instead
+                    return
+                try:
+                    columns = self._load_columns(spare, catalog.name)
+                finally:
+                    spare.close()
+            except errors.Error as e:
+                # The columns are loaded one table at a time instead
+                self.log_debug('Loading the columns of %s failed: %s',
+                        catalog.name, e)
+                return
+
+            with self._lock:
+                # The tables loaded in the meantime are up to date
+                columns.update(catalog.columns)
+                catalog.columns = columns
+                catalog.columns_loaded = True
+
+        executor_instance.submit_background(load)
+
+    def _load_table(self, connection, catalog, table):
+        columns = self._load_columns(connection, catalog.name, table)
+
+        with self._lock:
+            catalog.stale_tables.discard(table)
+            if table in columns:
+                catalog.columns[table] = columns[table]
+            else:
+                catalog.columns.pop(table, None)
+
+    def _load_columns(self, connection, database, table=None):
+        '''Returns the columns of the tables of `database` grouped by
+        table'''
+        params = {'db_name': database}
+        table_condition = ''
+        if table is not None:
+            table_condition = 'AND table_name = %(table_name)s'
+            params['table_name'] = table
+
+        query = COLUMNS_QUERY.format(schema.column_schema_fields,
+                table_condition)
+        cursor = connection.query(query, params)
+
+        columns = {}
+        for row in cursor.fetchall():
+            key = _to_str(row[0])
+            if key not in columns:
+                columns[key] = OrderedDict()
+            column_name, info = schema.column_schema(row[1:])
+            columns[key][column_name] = info
+        return columns
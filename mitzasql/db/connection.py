@@ -3,6 +3,7 @@
 # See LICENSE file
 
 import time
+import threading
 from datetime import datetime
 import copy
 
@@ -11,25 +12,253 @@ import mysql.connector
 from mysql.connector import (errorcode, errors)
 
 from ..logger import (LoggerMixin, logger)
+from .query_log import (QueryLog, WordUsage)
 
-class Connection(LoggerMixin):
-    SIGNAL_EXCEPTION = 'exception'
-    QUERY_LOG = []
+class ConnectionPool(LoggerMixin):
+    """
+    Bounded pool of mysql connections shared by the Connection objects of a
+    session.
 
-    def __init__(self, connection_data, session_name=None):
-        self.set_log_prefix('Connection')
-        self.is_tcp = False
-        self.database = None
-        self._retry_count = 0
-        self.con = self._create_mysql_connection(connection_data)
+    Leased connections are reset (session variables, temporary tables,
+    current database) so they look like new ones. Idle connections are
+    health checked before being leased again and closed after
+    MAX_IDLE_TIME seconds.
+    """
+    MAX_SIZE = 5
+    MAX_IDLE_TIME = 300
+    HEALTH_CHECK_INTERVAL = 30
+    LEASE_TIMEOUT = 10
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, connection_data, max_size=None, max_idle_time=None):
+        self.set_log_prefix('ConnectionPool')
         self._connection_data = connection_data
+        self.max_size = max_size or self.MAX_SIZE
+        self.max_idle_time = max_idle_time or self.MAX_IDLE_TIME
+        # (connection, release time) tuples, the most recently used is last
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Condition()
+        # Connection used to kill the queries running on the leased ones
+        self._control = None
+        self._control_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, connection_data, session_name=None):
+        '''Return the pool of the session'''
+        protocol, host = extract_host(connection_data['host'])
+        if protocol == 'tcp':
+            key = (session_name, protocol, host, connection_data.get('port'),
+                    connection_data['username'])
+        else:
+            # The host is the socket
+            key = (session_name, protocol, host, None,
+                    connection_data['username'])
+
+        old_pool = None
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if (pool is not None and not pool.closed and
+                    pool.password != connection_data['password']):
+                # The session was edited
+                old_pool = pool
+                pool = None
+            if pool is None or pool.closed:
+                pool = cls(connection_data)
+                cls._pools[key] = pool
+
+        if old_pool is not None:
+            old_pool.close()
+        return pool
+
+    @classmethod
+    def close_all(cls):
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+
+        for pool in pools:
+            pool.close()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def password(self):
+        return self._connection_data['password']
+
+    @property
+    def size(self):
+        '''The number of open connections, leased or idle'''
+        return self._size
+
+    @property
+    def idle_size(self):
+        return len(self._idle)
+
+    def acquire(self, database=None, wait=True):
+        '''Lease a connection which uses `database`. If the pool is full,
+        wait for a connection to be released unless `wait` is False'''
+        con, released_at = self._lease(wait)
+
+        if con is not None:
+            try:
+                self._check(con, released_at)
+                self._reset(con)
+            except errors.Error as e:
+                self.log_info('Dropping broken connection: %s', e)
+                self._close_connection(con)
+                con = None
+
+        if con is None:
+            try:
+                return self._connect(database)
+            except Exception:
+                self._free_slot()
+                raise
+
+        if database:
+            try:
+                con.cmd_init_db(database)
+            except errors.Error:
+                self.release(con)
+                raise
+        return con
+
+    def release(self, con):
+        '''Return a leased connection to the pool'''
+        if self._closed or con.unread_result:
+            # Don't read the rest of a large result only to throw it away
+            self._close_connection(con)
+            self._free_slot()
+            return
+
+        with self._lock:
+            self._idle.append((con, time.time()))
+            self._lock.notify()
+
+    def discard(self, con):
+        '''Close a leased connection instead of returning it to the pool'''
+        self._close_connection(con)
+        self._free_slot()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._size -= len(idle)
+            self._lock.notify_all()
+
+        for con, released_at in idle:
+            self._close_connection(con)
+
+        with self._control_lock:
+            if self._control is not None:
+                self._close_connection(self._control)
+                self._control = None
+
+    def kill_query(self, connection_id):
+        '''Interrupt the statement running on the connection with the
+        `connection_id` thread id. The session of the connection is kept.
+
+        The KILL QUERY statement is sent over a separate control connection
+        which doesn't count towards the pool's size, the leased connection is
+        busy waiting for the statement to finish.
+        '''
+        query = 'KILL QUERY {0:d}'.format(connection_id)
+        with self._control_lock:
+            if self._closed:
+                raise errors.PoolError('Connection pool is closed')
+
+            for attempt in range(2):
+                if self._control is None:
+                    self._control = self._connect()
+                try:
+                    self._control.cmd_query(query)
+                    return
+                except errors.OperationalError:
+                    # The control connection timed out while idle
+                    self._close_connection(self._control)
+                    self._control = None
+                    if attempt:
+                        raise
+
+    def _lease(self, wait=True):
+        '''Take an idle connection or reserve a slot for a new one. Wait for
+        a connection to be released if the pool is full and `wait` is
+        True'''
+        deadline = time.time() + self.LEASE_TIMEOUT
+        expired = []
         try:
-            self.session_name = connection_data['name']
-        except KeyError:
-            self.session_name = session_name
-        urwid.register_signal(self.__class__, [self.SIGNAL_EXCEPTION])
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise errors.PoolError('Connection pool is closed')
+
+                    expired.extend(self._evict_idle())
+                    if len(self._idle):
+                        return self._idle.pop()
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return (None, None)
+
+                    remaining = deadline - time.time()
+                    if not wait or remaining <= 0:
+                        raise errors.PoolError('Connection pool exhausted')
+                    self._lock.wait(remaining)
+        finally:
+            # Closing a connection may block, don't hold up the other
+            # threads leasing connections
+            for con in expired:
+                self._close_connection(con)
+
+    def _free_slot(self):
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+    def _evict_idle(self):
+        '''Drop the connections idle for too long from the pool. Returns
+        them, they must be closed without holding the lock'''
+        now = time.time()
+        idle = []
+        expired = []
+        for con, released_at in self._idle:
+            if now - released_at > self.max_idle_time:
+                self._size -= 1
+                expired.append(con)
+                continue
+            idle.append((con, released_at))
+        self._idle = idle
+        return expired
+
+    def _check(self, con, released_at):
+        if time.time() - released_at < self.HEALTH_CHECK_INTERVAL:
+            return
+        con.ping()
+
+    def _reset(self, con):
+        '''Clear the session state left by the previous lease'''
+        try:
+            con.cmd_reset_connection()
+        except errors.NotSupportedError:
+            # MySQL < 5.7.3, reset by re-authenticating
+            con.reset_session()
+
+    def _close_connection(self, con):
+        try:
+            con.close()
+        except errors.Error:
+            pass
 
-    def _create_mysql_connection(self, connection_data):
+    def _connect(self, database=None):
+        connection_data = self._connection_data
         kwargs = {
                 'user': connection_data['username'],
                 'password': connection_data['password'],
@@ -37,70 +266,177 @@ class Connection(LoggerMixin):
                 'autocommit': True
                 }
 
-        protocol, host = self._extract_host(connection_data['host'])
+        protocol, host = extract_host(connection_data['host'])
         if protocol == 'tcp':
             kwargs['host'] = host
             kwargs['port'] = connection_data['port']
-            self.is_tcp = True
         else:
             kwargs['unix_socket'] = host
 
-        if 'database' in connection_data and len(connection_data['database']) > 0:
-            kwargs['database'] = connection_data['database']
-            self.database = connection_data['database']
+        if database:
+            kwargs['database'] = database
 
         kwargs['get_warnings'] = True
 
-        con = mysql.connector.connect(**kwargs)
+        self.log_debug('Opening connection %d/%d', self._size, self.max_size)
+        return mysql.connector.connect(**kwargs)
+
+def extract_host(host):
+    if host.startswith('unix://'):
+        protocol = 'unix'
+        hostname = host[7:]
+    else:
+        protocol = 'tcp'
+        hostname = host[6:]
+
+    return (protocol, hostname)
+
+class Connection(LoggerMixin):
+    SIGNAL_EXCEPTION = 'exception'
+    QUERY_LOG = QueryLog()
+    # The words used by the statements run by the user
+    WORD_USAGE = WordUsage()
+
+    def __init__(self, connection_data, session_name=None, pool=None,
+            wait=True):
+        self.set_log_prefix('Connection')
+        self.database = None
         self._retry_count = 0
-        return con
+        self._closed = False
+        self._con = None
+        self._connection_data = connection_data
+        try:
+            self.session_name = connection_data['name']
+        except KeyError:
+            self.session_name = session_name
+
+        if 'database' in connection_data and len(connection_data['database']) > 0:
+            self.database = connection_data['database']
+
+        protocol, host = extract_host(connection_data['host'])
+        self.is_tcp = protocol == 'tcp'
+
+        if pool is None:
+            pool = ConnectionPool.get(connection_data, self.session_name)
+        self._pool = pool
+        # False if leasing must fail instead of waiting when the pool is full
+        self._wait = wait
+
+        # Lease the mysql connection right away to report connection errors
+        self.con
+        urwid.register_signal(self.__class__, [self.SIGNAL_EXCEPTION])
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:
+            pass
+
+    @property
+    def con(self):
+        '''The mysql connection leased from the session's pool'''
+        if self._closed:
+            raise errors.OperationalError('MySQL Connection not available.')
+
+        if self._con is None:
+            self._con = self._pool.acquire(self.database, wait=self._wait)
+            self._retry_count = 0
+        return self._con
+
+    @property
+    def pool(self):
+        return self._pool
 
     @property
     def fresh(self):
+        '''A new connection leased from the same pool'''
+        return self._new_connection()
+
+    def spare(self):
+        '''A new connection leased from the same pool without waiting for
+        one to be released, or None if the pool is full. Used by the
+        optional work done in the background (prefetch, exact counts,
+        catalog loads), which is skipped instead of holding up the rest'''
+        try:
+            return self._new_connection(wait=False)
+        except errors.PoolError as e:
+            self.log_debug('No spare connection: %s', e)
+            return None
+
+    def _new_connection(self, wait=True):
         con_data = copy.deepcopy(self._connection_data)
         if self.database:
             con_data['database'] = self.database
         elif 'database' in con_data:
             del con_data['database']
-        con = self.__class__(con_data, self.session_name)
-        return con
+        return self.__class__(con_data, self.session_name, pool=self._pool,
+                wait=wait)
 
     def _retry_connection(self):
         self.log_info("Disconnected. Retrying mysql connection...")
-        if self._retry_count >= 5:
+        if self._closed or self._retry_count >= 5:
             return False
 
+        if self._con is not None:
+            self._pool.discard(self._con)
+            self._con = None
+
         try:
-            self.con = self._create_mysql_connection(self._connection_data)
-            if self.database:
-                self.change_db(self.database)
+            self.con
             return True
         except errors.OperationalError as e:
             self._retry_count += 1
             time.sleep(1)
             return self._retry_connection()
 
-    def _extract_host(self, host):
-        if host.startswith('unix://'):
-            protocol = 'unix'
-            hostname = host[7:]
-        else:
-            protocol = 'tcp'
-            hostname = host[6:]
-
-        return (protocol, hostname)
-
     @property
     def host(self):
-        protocol, host = self._extract_host(self._connection_data['host'])
+        protocol, host = extract_host(self._connection_data['host'])
         return host
 
     @property
     def port(self):
         return self._connection_data['port']
 
+    def release(self):
+        '''Return the mysql connection to the pool. The next query leases
+        a connection again'''
+        if self._con is None:
+            return
+        con = self._con
+        self._con = None
+        self._pool.release(con)
+
     def close(self):
-        return self.con.close()
+        '''Return the mysql connection to the pool for good'''
+        self.release()
+        self._closed = True
+
+    def cancel(self, connection_id=None):
+        '''Interrupt the statement running on the leased mysql connection.
+        If `connection_id` is given, the statement is interrupted only if it
+        is still the thread id of the leased connection.
+
+        Safe to call from the main loop thread while the query runs on the
+        database executor. Returns False if there is nothing to interrupt.
+        '''
+        con = self._con
+        if con is None or self._closed:
+            return False
+
+        if connection_id is None:
+            connection_id = con.connection_id
+        if connection_id is None or connection_id != con.connection_id:
+            return False
+
+        self.log_info('Killing query on connection %d', connection_id)
+        try:
+            self._pool.kill_query(connection_id)
+        except errors.Error as e:
+            # Unknown thread id: the statement finished in the meantime
+            self.log_info('Kill query failed: %s', e)
+            return False
+        return True
 
     @property
     def cursor(self):
@@ -110,11 +446,22 @@ class Connection(LoggerMixin):
     def dict_cursor(self):
         return self.con.cursor(buffered=True, dictionary=True)
 
-    def query(self, query, params=None, dictionary=False, multi=False):
+    @property
+    def charset(self):
+        '''The character set of the mysql connection'''
+        return self.con.charset
+
+    def query(self, query, params=None, dictionary=False, multi=False,
+            buffered=True, raw=False):
         start = time.time()
         self.log_debug('Query: %s. Params: %s', str(query), str(params))
         try:
-            if dictionary is False:
+            if buffered is False:
+                cursor = self.con.cursor(buffered=False, dictionary=dictionary)
+            elif raw is True:
+                # Skip the type conversion, see raw_row.RawRow
+                cursor = self.con.cursor(buffered=True, raw=True)
+            elif dictionary is False:
                 cursor = self.cursor
             else:
                 cursor = self.dict_cursor
@@ -128,7 +475,8 @@ class Connection(LoggerMixin):
             # Retry connection if exception is "MySQL Connection not available"
             self.log_exception('Query exception: %s', e)
             if self._retry_connection():
-                return self.query(query, params=params, dictionary=dictionary, multi=multi)
+                return self.query(query, params=params, dictionary=dictionary,
+                        multi=multi, buffered=buffered, raw=raw)
             raise e
         except errors.Error as e:
             self.log_exception('Query exception: %s', e)
@@ -138,6 +486,19 @@ class Connection(LoggerMixin):
             duration = now - start
             Connection.QUERY_LOG.append((datetime.now(), query, params, duration))
 
+    def discard_unread_result(self):
+        '''Drop the rows which were not fetched from an unbuffered query.
+
+        Reading the rest of a large result set only to throw it away takes as
+        long as fetching it, so the pool closes the connection instead and
+        the next query leases another one.
+        '''
+        if self._con is None or not self._con.unread_result:
+            return
+
+        self.log_info('Discarding unread result')
+        self.release()
+
     def change_db(self, name):
         self.database = name
         query = 'USE `{0}`'.format(name);
@@ -160,9 +521,9 @@ class Connection(LoggerMixin):
         return False
 
     @classmethod
-    def factory(cls, connection_data, session_name=None):
+    def factory(cls, connection_data, session_name=None, pool=None):
         try:
-            instance = cls(connection_data, session_name)
+            instance = cls(connection_data, session_name, pool=pool)
         except mysql.connector.Error as err:
             logger.exception('Connection exception %s', err)
             return (None, err)
@@ -170,8 +531,11 @@ class Connection(LoggerMixin):
 
     @classmethod
     def test(cls, connection_data):
-        connection, err = cls.factory(connection_data)
+        pool = ConnectionPool(connection_data, max_size=1)
+        connection, err = cls.factory(connection_data, pool=pool)
         if connection is None:
+            pool.close()
             return (False, str(err))
         connection.close()
+        pool.close()
         return (True, None)
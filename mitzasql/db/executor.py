@@ -0,0 +1,202 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+import os
+import queue
+import threading
+from collections import deque
+
+import urwid
+
+from ..logger import LoggerMixin
+
+# Stops a worker
+_STOP = object()
+
+class Executor(LoggerMixin):
+    """
+    Runs the database I/O on worker threads in order to keep the main loop
+    responsive while queries are in flight.
+
+    The jobs submitted with the same key (the connection they use) run one
+    at a time, in the order they were submitted. Jobs with different keys
+    run in parallel on a pool of WORKERS threads, so a slow query doesn't
+    hold up the models using other connections. Their callbacks and the
+    urwid signals emitted while running them are delivered back on the main
+    loop thread through a pipe watched by the main loop. The exceptions
+    raised by the jobs are logged and their callbacks receive None.
+
+    Long running jobs which must not hold up the rest (e.g. counting the
+    rows of a huge table) can be submitted to a separate, background worker.
+    They have to use their own database connection.
+
+    Until a main loop is attached (or in tests) the jobs run synchronously.
+    """
+    WORKERS = 4
+
+    def __init__(self):
+        # key => deque of the jobs of the key, the first one is running
+        self._lanes = {}
+        self._lanes_lock = threading.Lock()
+        # The keys whose first job is ready to run
+        self._ready = queue.Queue()
+        self._background_jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._loop = None
+        self._pipe = None
+        self._pipe_lock = threading.Lock()
+        self._workers = []
+        self._background_worker = None
+        self.set_log_prefix('EXECUTOR')
+
+    @property
+    def running(self):
+        return self._loop is not None
+
+    def start(self, loop):
+        '''Start the worker threads and deliver the results on `loop`'''
+        if self.running:
+            return
+
+        self._loop = loop
+        self._pipe = loop.watch_pipe(self._dispatch)
+        # The jobs left by the previous workers are dropped
+        self._lanes = {}
+        self._ready = queue.Queue()
+        self._workers = [threading.Thread(target=self._work_lanes,
+            name='db-executor-{0}'.format(i), args=(self._lanes, self._ready),
+            daemon=True) for i in range(self.WORKERS)]
+        for worker in self._workers:
+            worker.start()
+        self._background_worker = threading.Thread(target=self._work,
+                name='db-background', args=(self._background_jobs,),
+                daemon=True)
+        self._background_worker.start()
+        self.log_debug('Started')
+
+    def stop(self):
+        if not self.running:
+            return
+
+        for worker in self._workers:
+            self._ready.put(_STOP)
+        self._background_jobs.put(None)
+        with self._pipe_lock:
+            # The workers still running must not write to a closed pipe
+            # whose descriptor may be reused
+            self._loop.remove_watch_pipe(self._pipe)
+            os.close(self._pipe)
+            self._pipe = None
+        self._loop = None
+        self._workers = []
+        self._background_worker = None
+        self.log_debug('Stopped')
+
+    def in_worker(self):
+        current_thread = threading.current_thread()
+        return (current_thread in self._workers or
+                (self._background_worker is not None and
+                    current_thread is self._background_worker))
+
+    def submit(self, job, *args, callback=None, key=None):
+        '''Run `job(*args)` on a worker thread, after the jobs submitted
+        before with the same `key`, and `callback(result)` on the main loop
+        thread'''
+        if not self.running:
+            result = job(*args)
+            if callback is not None:
+                callback(result)
+            return
+
+        if self.in_worker():
+            # Jobs submitted by a running job run right away, otherwise
+            # they would wait for their parent job to finish
+            result = job(*args)
+            if callback is not None:
+                self._post(callback, result)
+            return
+
+        with self._lanes_lock:
+            lane = self._lanes.get(key)
+            if lane is not None:
+                lane.append((job, args, callback))
+                return
+            self._lanes[key] = deque([(job, args, callback)])
+        self._ready.put(key)
+
+    def submit_background(self, job, *args, callback=None):
+        '''Run `job(*args)` on the background worker thread without holding
+        up the jobs submitted with submit()'''
+        if not self.running:
+            result = job(*args)
+            if callback is not None:
+                callback(result)
+            return
+
+        self._background_jobs.put((job, args, callback))
+
+    def emit_signal(self, obj, name, *args):
+        '''Emit an urwid signal on the main loop thread'''
+        if self.in_worker():
+            self._post(urwid.emit_signal, obj, name, *args)
+            return
+        urwid.emit_signal(obj, name, *args)
+
+    def _work(self, jobs):
+        while True:
+            item = jobs.get()
+            if item is None:
+                break
+            self._run(*item)
+
+    def _work_lanes(self, lanes, ready):
+        while True:
+            key = ready.get()
+            if key is _STOP:
+                break
+
+            with self._lanes_lock:
+                item = lanes[key][0]
+            self._run(*item)
+
+            with self._lanes_lock:
+                lane = lanes[key]
+                lane.popleft()
+                if not len(lane):
+                    del lanes[key]
+                    continue
+            ready.put(key)
+
+    def _run(self, job, args, callback):
+        try:
+            result = job(*args)
+        except Exception as e:
+            # Raising on the main loop would stop it
+            self.log_exception('Job failed: %s', e)
+            result = None
+
+        if callback is not None:
+            self._post(callback, result)
+
+    def _post(self, fn, *args):
+        self._results.put((fn, args))
+        with self._pipe_lock:
+            if self._pipe is None:
+                # The main loop is gone
+                return
+            try:
+                os.write(self._pipe, b'1')
+            except OSError:
+                pass
+
+    def _dispatch(self, data):
+        while True:
+            try:
+                fn, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            fn(*args)
+        return True
+
+executor_instance = Executor()
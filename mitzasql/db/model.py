@@ -2,13 +2,23 @@
 # Author: Vlad Balmos <vladbalmos@yahoo.com>
 # See LICENSE file
 
+import threading
 from collections import OrderedDict
 
 import urwid
 import mysql.connector.errors as errors
+from mysql.connector import errorcode
 
+from ..logger import logger
 from . import schema
+from . import row_count
 from .schema_cache import schema_cache_instance
+from .executor import executor_instance
+from .page_cache import (page_cache_instance, CachedCursor)
+from .catalog import SchemaCatalog
+from .raw_row import raw_rows
+from .result_store import ResultStore
+from .spill_store import SpillStore
 
 MAX_ROWS_FOR_COLUMN_LENGTH_DETECTION = 50
 
@@ -16,12 +26,22 @@ class Model:
     SIGNAL_PRE_LOAD = 'preload'
     SIGNAL_LOAD = 'load'
     SIGNAL_NEW_DATA = 'new_data'
+    SIGNAL_ROWCOUNT = 'rowcount'
 
-    SIGNALS = [SIGNAL_PRE_LOAD, SIGNAL_NEW_DATA, SIGNAL_LOAD]
+    SIGNALS = [SIGNAL_PRE_LOAD, SIGNAL_NEW_DATA, SIGNAL_LOAD, SIGNAL_ROWCOUNT]
+
+    # True while the model still has rows to receive
+    streaming = False
+
+    # True if the row count is an estimate
+    rowcount_estimated = False
+
+    # True while the model is waiting for the database
+    loading = False
 
     ''' Base model '''
     def __init__(self, data = [], columns = {}):
-        self.data = data
+        self.data = ResultStore(data)
         self._columns = columns
         self.rowcount = len(data)
         urwid.register_signal(self.__class__, self.SIGNALS)
@@ -40,6 +60,12 @@ class Model:
         for row in self.data:
             yield row
 
+    def row(self, index):
+        '''The row at `index` or None if it isn't loaded'''
+        if 0 <= index < len(self.data):
+            return self.data[index]
+        return None
+
     def col_index(self, name):
         for index, item in enumerate(self._columns):
             if item['name'].lower() == name.lower():
@@ -47,39 +73,44 @@ class Model:
         raise IndexError()
 
     def search(self, keyword, col_index, pos=0, reverse=False):
-        if reverse is True:
-            row_index = 1
-            start = 0
-            end = pos
-        else:
-            row_index = 0
-            start = pos
-            end = None
-
-        data = self.data[start:end]
+        '''Find the first row from `pos` (the last one before `pos` if
+        `reverse` is True) whose `col_index` column contains `keyword`. If
+        `col_index` is None all the columns are searched.
 
+        Returns (row index, row) or None if nothing was found.
+        '''
+        keyword = str(keyword).lower()
         if reverse is True:
-            data = reversed(data)
-
-        for row in data:
-            col = row[col_index]
-            if str(keyword).lower() in str(col).lower():
-                if not reverse:
-                    return (start + row_index, row)
-                return (end - row_index, row)
+            if pos is None:
+                pos = len(self.data)
+            indexes = range(min(pos, len(self.data)) - 1, -1, -1)
+        else:
+            indexes = range(pos, len(self.data))
 
-            row_index += 1
+        for index in indexes:
+            row = self.data[index]
+            values = row if col_index is None else (row[col_index],)
+            for value in values:
+                if keyword in str(value).lower():
+                    return (index, row)
 
 class MysqlModel(Model):
     SIGNAL_ERROR = 'error'
+    SIGNAL_CANCEL = 'cancel'
 
     '''Base mysql query model'''
     def __init__(self, connection):
         self._con = connection
         self.last_error = None
-        self.SIGNALS.extend([self.SIGNAL_ERROR])
+        # True if the last job was interrupted by cancel()
+        self.cancelled = False
+        self._cancel_requested = False
+        # The thread id of the mysql connection running the job of the model
+        self._job_connection_id = None
+        self._job_lock = threading.Lock()
+        self.SIGNALS.extend([self.SIGNAL_ERROR, self.SIGNAL_CANCEL])
         super().__init__()
-        self._fetch_data()
+        self._run(self._fetch_data, callback=self._data_loaded)
 
     @property
     def connection(self):
@@ -117,24 +148,113 @@ class MysqlModel(Model):
         return self._con.session_name
 
     def _fetch_data(self):
+        '''Query the rows. Returns (rows, columns, rowcount) or None if the
+        query failed'''
         cursor = self._query_db()
         if cursor is None:
-            self.data = []
+            return None
+        rows = cursor.fetchall()
+        return (ResultStore(rows), self._schema(cursor, rows).columns,
+                cursor.rowcount)
+
+    def _set_data(self, result):
+        '''Apply the result of _fetch_data(). Returns False if the query
+        failed'''
+        if result is None:
+            self.data = ResultStore()
             self._columns = []
             self.rowcount = 0
             return False
-        self.data = cursor.fetchall()
-        self._columns = self._schema(cursor).columns
-        self.rowcount = cursor.rowcount
+
+        self.data, self._columns, self.rowcount = result
         return True
 
-    def _schema(self, cursor):
+    def _data_loaded(self, result):
+        self._set_data(result)
+        self._emit_load()
+
+    def _schema(self, cursor, rows):
         return schema.QuerySchema(cursor,
-                self.data[0:MAX_ROWS_FOR_COLUMN_LENGTH_DETECTION])
+                rows[0:MAX_ROWS_FOR_COLUMN_LENGTH_DETECTION])
 
     def reload(self):
         urwid.emit_signal(self, self.SIGNAL_PRE_LOAD, self)
-        self._fetch_data()
+        self._run(self._fetch_data, callback=self._data_loaded)
+
+    def _run(self, job, *args, callback=None):
+        '''Run `job` on the database executor. `callback` receives the job's
+        result on the main loop thread.
+
+        The jobs don't change the data of the model, which is rendered by
+        the main loop while they run: they return the rows and the callbacks
+        apply them.'''
+        self.loading = True
+        self.cancelled = False
+        self._cancel_requested = False
+
+        def run(*args):
+            if self._cancel_requested:
+                # Cancelled while waiting for the previous jobs
+                self.cancelled = True
+                return None
+
+            with self._job_lock:
+                try:
+                    self._job_connection_id = self._con.con.connection_id
+                except errors.Error:
+                    # The job reports the connection error
+                    self._job_connection_id = None
+            try:
+                return job(*args)
+            except Exception as e:
+                # Report the bug instead of leaving the model loading
+                # forever
+                logger.exception('Model job failed: %s', e)
+                self._set_error(e)
+                return None
+            finally:
+                with self._job_lock:
+                    self._job_connection_id = None
+
+        def done(result):
+            self.loading = False
+            if callback is not None:
+                callback(result)
+            if self.cancelled:
+                urwid.emit_signal(self, self.SIGNAL_CANCEL, self)
+
+        executor_instance.submit(run, *args, callback=done, key=self._con)
+
+    def cancel(self):
+        '''Interrupt the query the model is waiting for. The model emits
+        SIGNAL_CANCEL instead of SIGNAL_ERROR once the query stops.
+
+        The connection is shared with the other models of the session, so
+        only the connection which started the job of this model is
+        interrupted, and only while the job runs. A job still waiting for
+        the jobs of the other models is skipped instead'''
+        if not self.loading:
+            return False
+
+        self._cancel_requested = True
+        with self._job_lock:
+            # The job can't finish and let the next one start on the same
+            # connection before the kill is sent
+            if self._job_connection_id is not None:
+                self._con.cancel(self._job_connection_id)
+        return True
+
+    def _set_error(self, error):
+        '''Record the error of the last query and report it, unless the
+        query was interrupted by cancel()'''
+        self.last_error = error
+        if (self._cancel_requested and
+                getattr(error, 'errno', None) == errorcode.ER_QUERY_INTERRUPTED):
+            self.cancelled = True
+            return
+        executor_instance.emit_signal(self, self.SIGNAL_ERROR, self, error)
+
+    def _emit_load(self, *args):
         urwid.emit_signal(self, self.SIGNAL_LOAD, self)
 
     def execute_query(self, query, params=None):
@@ -143,8 +263,7 @@ class MysqlModel(Model):
             self.last_error = None
             return cursor
         except errors.Error as e:
-            self.last_error = e
-            urwid.emit_signal(self, self.SIGNAL_ERROR, self, e)
+            self._set_error(e)
 
     def _query_db(self):
         '''Creates and executes a query cursor. Must be implemented by child
@@ -157,6 +276,11 @@ class DatabasesModel(MysqlModel):
     def __init__(self, connection):
         super().__init__(connection)
 
+    def reload(self):
+        # Refreshing the databases list refreshes the whole catalog
+        SchemaCatalog.get(self._con).invalidate()
+        super().reload()
+
     def _query_db(self):
         query = 'SHOW DATABASES'
         cursor = self.execute_query(query)
@@ -168,82 +292,62 @@ class DBTablesModel(MysqlModel):
         self._database = database
         super().__init__(connection)
 
+    def reload(self, cached=False):
+        '''Reload the data. Unless `cached` is True, the database is dropped
+        from the schema catalog first'''
+        if not cached:
+            SchemaCatalog.get(self._con).invalidate(self._database)
+        super().reload()
+
     def _query_db(self):
         try:
             self._con.change_db(self._database)
+            catalog = SchemaCatalog.get(self._con).database(self._con,
+                    self._database)
         except errors.Error as e:
-            self.last_error = e
-            urwid.emit_signal(self, self.SIGNAL_ERROR, self, e)
+            self._set_error(e)
             return
 
-        query = []
-
-        # Get tables
-        query.append('''
-        SELECT
-            TABLE_NAME AS Name,
-            TABLE_ROWS AS `Rows`,
-            DATA_LENGTH AS Size,
-            CREATE_TIME AS Created,
-            UPDATE_TIME AS Updated,
-            ENGINE AS Engine,
-            TABLE_COMMENT AS Comment,
-            TABLE_TYPE AS Type
-        FROM
-            INFORMATION_SCHEMA.TABLES
-        WHERE TABLE_SCHEMA = '{0}'
-        '''.format(self._database))
-
-        # Get triggers
-        query.append('''
-            SELECT
-                TRIGGER_NAME AS Name,
-                NULL AS `Rows`,
-                NULL AS Size,
-                CREATED AS Created,
-                NULL AS Updated,
-                NULL AS Engine,
-                CONCAT_WS(' ', ACTION_TIMING, EVENT_MANIPULATION, 'in',
-                EVENT_OBJECT_TABLE) AS Comment,
-                'TRIGGER' AS Type
-            FROM INFORMATION_SCHEMA.TRIGGERS
-            WHERE TRIGGER_SCHEMA = '{0}'
-        '''.format(self._database))
-
-        # Get functions & procedures
-        query.append('''
-            SELECT
-                SPECIFIC_NAME AS Name,
-                NULL AS `Rows`,
-                NULL AS Size,
-                CREATED AS Created,
-                LAST_ALTERED AS Updated,
-                NULL AS Engine,
-                CONVERT(ROUTINE_COMMENT USING utf8) AS Comment,
-                ROUTINE_TYPE AS Type
-            FROM
-                INFORMATION_SCHEMA.ROUTINES
-            WHERE ROUTINE_SCHEMA = '{0}'
-        '''.format(self._database))
-        query = '(' + '\n) UNION (\n'.join(query) + ')'
-        query = 'SELECT * FROM ({0}) AS info ORDER BY Name'.format(query)
-        cursor = self.execute_query(query)
-        return cursor
+        self.last_error = None
+        return CachedCursor(catalog.objects, catalog.description)
 
 class TableModel(MysqlModel):
     PAGINATION_LIMIT = 100
-
-    '''Model for a database table/view'''
-    def __init__(self, connection, table_name):
+    # The number of pages read ahead by prefetch()
+    PREFETCH_DEPTH = 2
+    # The number of pages loaded by load_rows() kept in memory
+    WINDOW_PAGES = 20
+
+    '''Model for a database table/view.
+
+    The rows read from the first one onwards are kept in `data`. Rows far
+    from them are loaded by load_rows() one page at a time into a sparse map
+    of page index -> rows (windows), so jumping anywhere in a huge table
+    doesn't load the rows in between. The windows farthest from the last
+    loaded page are dropped.
+    '''
+    def __init__(self, connection, table_name, count_strategy=None,
+            prefetch_depth=None):
         self.table_name = table_name
         self._database = connection.database
         self.schema_error = None
+        self._table_schema = None
 
-        try:
-            self._table_schema = schema.TableSchema(connection, table_name)
-        except errors.Error as e:
-            self.schema_error = e
-            self.last_error = e
+        if count_strategy is None:
+            count_strategy = row_count.LazyExactCount()
+        self.count_strategy = count_strategy
+
+        if prefetch_depth is None:
+            prefetch_depth = self.PREFETCH_DEPTH
+        self.prefetch_depth = prefetch_depth
+        # True while the next pages are read in the background
+        self.prefetching = False
+
+        self._page_cache = page_cache_instance
+        self._catalog = SchemaCatalog.get(connection)
+        # Incremented when the cache is invalidated in order to drop the
+        # counts still running in the background
+        self._count_generation = 0
 
         self._limit = self.PAGINATION_LIMIT
         self._page = 1
@@ -251,17 +355,11 @@ class TableModel(MysqlModel):
         self._column_order = None
         self._order_dir = None
         self._where = None
-        super().__init__(connection)
-
-
+        # (index, row) of the last row found by search()
+        self._last_match = None
         self.loaded_rowcount = 0
-        self.rowcount = 0
-
-        if self.last_error:
-            return
-
-        self.loaded_rowcount = len(self.data)
-        self.rowcount = self._count_rows()
+        self._windows = OrderedDict()
+        super().__init__(connection)
 
     @property
     def database(self):
@@ -272,21 +370,63 @@ class TableModel(MysqlModel):
         self._database = db
 
     def _fetch_data(self):
-        result = super()._fetch_data()
-        return result
+        '''Load the table schema, the first rows set and count the rows.
+        Returns (table schema, schema error, rows) where rows is (rows,
+        columns, rowcount, (count, estimated), count later) or None if the
+        queries failed'''
+        try:
+            table_schema = self._load_table_schema()
+        except errors.Error as e:
+            self._set_error(e)
+            return (None, e, None)
+
+        # The schema of the model is replaced on the main loop
+        cursor = self._query_db(table_schema=table_schema)
+        if cursor is None:
+            return (table_schema, None, None)
+
+        rows = cursor.fetchall()
+        table_schema.data = rows[0:MAX_ROWS_FOR_COLUMN_LENGTH_DETECTION]
+        table_schema.cursor = cursor
+        result = (ResultStore(rows), table_schema.columns, cursor.rowcount)
+        return (table_schema, None, result + self._count_rows(len(rows)))
 
-    def reload(self, reset_limit=True, reset_order=True, reset_where=True):
+    def _set_data(self, result):
+        self._windows.clear()
+        if result is not None:
+            table_schema, self.schema_error, result = result
+            if table_schema is not None:
+                self._table_schema = table_schema
+
+        if result is None:
+            super()._set_data(None)
+            self.loaded_rowcount = 0
+            self._set_rowcount(0, False)
+            return False
+
+        super()._set_data(result[0:3])
+        self.loaded_rowcount = len(self.data)
+        count, count_later = result[3:]
+        self._set_rowcount(*count)
+        if count_later:
+            self._count_exact_rows_later(self._cache_key('count', self._where))
+        return True
+
+    def _load_table_schema(self):
+        columns = self._catalog.table_schema(self._con, self._database,
+                self.table_name)
+        if columns is None:
+            columns = OrderedDict()
+        return schema.TableSchema(self._con, self.table_name, columns)
+
+    def reload(self, reset_limit=True, reset_order=True, reset_where=True,
+            callback=None, cached=False):
+        '''Reload the data. Unless `cached` is True, the cached pages and
+        row counts of the table are dropped first'''
         urwid.emit_signal(self, self.SIGNAL_PRE_LOAD, self)
 
-        try:
-            self._table_schema = schema.TableSchema(self._con, self.table_name)
-            self.schema_error = None
-            self.last_error = None
-        except errors.Error as e:
-            self.schema_error = e
-            self.last_error = e
-            urwid.emit_signal(self, self.SIGNAL_LOAD, self)
-            return
+        if not cached:
+            self.invalidate_cache()
 
         if reset_limit:
             self._page = 1
@@ -299,44 +439,198 @@ class TableModel(MysqlModel):
         if reset_where:
             self._where = None
 
-        if self._fetch_data() is False:
-            self.loaded_rowcount = 0
-            self.rowcount = 0
-            urwid.emit_signal(self, self.SIGNAL_LOAD, self)
-            return
+        self._last_match = None
+        self._windows.clear()
+        self.last_error = None
 
-        self.loaded_rowcount = len(self.data)
-        self.rowcount = self._count_rows()
-        urwid.emit_signal(self, self.SIGNAL_LOAD, self)
+        def loaded(result):
+            result = self._set_data(result)
+            if callback is not None:
+                callback(result)
+            self._emit_load()
+
+        self._run(self._fetch_data, callback=loaded)
+
+    def invalidate_cache(self):
+        '''Drop the cached pages, row counts and schema of the table'''
+        self._page_cache.invalidate(*self._cache_key())
+        self._catalog.invalidate(self._database, self.table_name)
+        self._count_generation += 1
+
+    def _cache_key(self, *key):
+        return (self._con.session_name, self._database, self.table_name) + key
+
+    def _count_rows(self, loaded_rowcount):
+        '''Count the rows matching the current filter using the count
+        strategy. Sorting doesn't change the count, so the counts are cached
+        per (table, where) until the cache is invalidated.
+
+        Returns ((count, estimated), count later) where count later is True
+        if the exact count must be computed in the background'''
+        key = self._cache_key('count', self._where)
+        cached_count = self._page_cache.get(key)
+        if cached_count is not None:
+            return (cached_count, False)
+
+        if self._offset == 0 and loaded_rowcount < self._limit:
+            # The first rows set holds all the rows
+            cached_count = (loaded_rowcount, False)
+            self._page_cache.put(key, cached_count)
+            return (cached_count, False)
 
-    def _schema(self, cursor):
-        self._table_schema.data = self.data[0:MAX_ROWS_FOR_COLUMN_LENGTH_DETECTION]
-        self._table_schema.cursor = cursor
-        return self._table_schema
+        try:
+            cached_count = self.count_strategy.count(self._con,
+                    self._database, self.table_name, self._where)
+        except errors.Error as e:
+            self._set_error(e)
+            # Keep the count of the rows which made it
+            return ((loaded_rowcount, False), False)
 
-    def _count_rows(self):
-        query = 'SELECT COUNT(*) AS total FROM `{0}`'.format(self.table_name)
+        self._page_cache.put(key, cached_count)
+        count, estimated = cached_count
+        return (cached_count, estimated and self.count_strategy.lazy)
 
-        if self._where:
-            query += ' WHERE {0}'.format(self._where)
-        cursor = self.execute_query(query)
-        if cursor is None:
-            return 0
-        data = cursor.fetchall()
-        return data[0][0]
+    def _set_rowcount(self, count, estimated):
+        self.rowcount = max(count, self.loaded_rowcount)
+        self.rowcount_estimated = estimated
+
+    def _count_exact_rows_later(self, key):
+        '''Count the rows exactly on a separate connection, without holding
+        up the queries of the model, and swap the estimate for it when done'''
+        session_name, database, table_name, kind, where = key
+        generation = self._count_generation
+
+        def count():
+            try:
+                connection = self._con.spare()
+                if connection is None:
+                    # The pool is full, keep the estimate
+                    return None
+                try:
+                    return self.count_strategy.exact_count(connection,
+                            database, table_name, where)
+                finally:
+                    connection.close()
+            except errors.Error:
+                # Keep the estimate
+                return None
+
+        def counted(count):
+            if count is None or generation != self._count_generation:
+                return
+
+            self._page_cache.put(key, (count, False))
+            if key == self._cache_key('count', self._where):
+                if count != self.rowcount:
+                    # The windows near the end were placed using the estimate
+                    self._windows.clear()
+                self._set_rowcount(count, False)
+                urwid.emit_signal(self, self.SIGNAL_ROWCOUNT, self)
+
+        executor_instance.submit_background(count, callback=counted)
 
     def load_next_set(self):
+        if self.loading:
+            return
+
         self._increment_page()
+        data = self.data
+        seek_row = data[-1] if len(data) else None
+        limit = self._limit
+
+        def loaded(rows):
+            if rows is None or self.data is not data:
+                self._increment_page(-1)
+                rows = []
+            else:
+                self._append_rows(rows, limit)
+            urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, rows, len(rows))
 
         urwid.emit_signal(self, self.SIGNAL_PRE_LOAD, self)
-        result = self._fetch_more_rows()
-        if result is None:
-            self._increment_page(-1)
-            data = []
-            data_length = 0
-        else:
-            data, data_length = result
-        urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, data, data_length)
+        self._run(self._fetch_more_rows, seek_row, self._offset, limit,
+                callback=loaded)
+
+    def prefetch(self):
+        '''Read the next `prefetch_depth` pages ahead on a separate
+        connection, without holding up the queries of the model, and append
+        them to the data set when they arrive.
+
+        The pages are dropped if the data set changed in the meantime (sort,
+        filter, reload or rows loaded by load_next_set()). They remain in the
+        page cache, so they still save the round trip of the next query.
+        Nothing is read if the pool has no spare connection.
+        Returns False if there is nothing to prefetch.
+        '''
+        if (self.prefetching or self.loading or self.prefetch_depth < 1 or
+                self.schema_error is not None or
+                self.loaded_rowcount < self._limit or
+                (not self.rowcount_estimated and self.loaded_rowcount >= self.rowcount)):
+            return False
+
+        data = self.data
+        loaded_rowcount = self.loaded_rowcount
+        limit = self._limit
+        self.prefetching = True
+
+        def fetch():
+            try:
+                connection = self._con.spare()
+                if connection is None:
+                    # The pool is full, the rows will be loaded by
+                    # load_next_set()
+                    return None
+                try:
+                    return self._prefetch_pages(connection, data[-1],
+                            loaded_rowcount, limit)
+                finally:
+                    connection.close()
+            except errors.Error:
+                # The rows will be loaded by load_next_set()
+                return None
+
+        def fetched(rows):
+            self.prefetching = False
+            if (not rows or self.loading or self.data is not data or
+                    self.loaded_rowcount != loaded_rowcount or
+                    self._limit != limit):
+                return
+
+            data_length = len(rows)
+            self.data.extend(rows)
+            self.loaded_rowcount += data_length
+            self._page = self.loaded_rowcount // self.PAGINATION_LIMIT
+            self._drop_loaded_windows()
+
+            if data_length < self.prefetch_depth * limit:
+                # Reached the last row, the count is known
+                self._page_cache.put(self._cache_key('count', self._where),
+                        (self.loaded_rowcount, False))
+                self._set_rowcount(self.loaded_rowcount, False)
+            else:
+                self._set_rowcount(self.rowcount, self.rowcount_estimated)
+            urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, rows, data_length)
+
+        executor_instance.submit_background(fetch, callback=fetched)
+        return True
+
+    def _prefetch_pages(self, connection, seek_row, offset, limit):
+        '''Fetch the pages of `limit` rows which follow `seek_row` (or start
+        at `offset` when paging with offsets) using `connection`'''
+        rows = []
+        for page in range(self.prefetch_depth):
+            cursor = self._query_db(seek_row=seek_row, offset=offset,
+                    limit=limit, connection=connection)
+            if cursor is None:
+                break
+
+            data = cursor.fetchall()
+            rows.extend(data)
+            if len(data) < limit:
+                break
+
+            seek_row = data[-1]
+            offset += len(data)
+        return rows
 
     def sort(self, column, direction):
         self._column_order = column
@@ -344,127 +638,676 @@ class TableModel(MysqlModel):
         self._page = 1
         self._offset = 0
 
-        self.reload(reset_limit=False, reset_order=False, reset_where=False)
+        self.reload(reset_limit=False, reset_order=False, reset_where=False,
+                cached=True)
 
     def filter(self, where):
         if where is None:
-            self.reload(reset_limit=True, reset_order=False, reset_where=True)
+            self.reload(reset_limit=True, reset_order=False, reset_where=True,
+                    cached=True)
             return
         self._where = where
-        self.reload(reset_limit=True, reset_order=False, reset_where=False)
+
+        def clear_invalid_filter(result):
+            if self.last_error or self.cancelled:
+                self.clear_filter()
+
+        self.reload(reset_limit=True, reset_order=False, reset_where=False,
+                callback=clear_invalid_filter, cached=True)
 
     def clear_filter(self):
         self._where = None
 
+    def search(self, keyword, col_index=None, pos=0, reverse=False,
+            callback=None):
+        '''Find the first row from `pos` (the last one before `pos` if
+        `reverse` is True, the last row of the table if `pos` is None) which
+        contains `keyword` in the `col_index` column, or in any column if
+        `col_index` is None.
+
+        The rows are searched on the server, under the current filter and
+        sort order, so rows which were not loaded yet are found as well. The
+        match is reported to `callback` as (row index, row), or None, without
+        loading the rows in between (see load_rows()).
+
+        Tables paged using offsets are searched in the loaded rows only.
+        '''
+        if self.loading:
+            return
+
+        if self.schema_error is not None or self._seek_order() is None:
+            if pos is None:
+                pos = self.loaded_rowcount
+            result = super().search(keyword, col_index, pos, reverse)
+            if callback is not None:
+                callback(result)
+            return
+
+        seek_row = self._search_anchor(pos, reverse)
+        if seek_row is None and pos is not None and (reverse or pos > 0):
+            # Nothing precedes the first row or the row at `pos` is unknown
+            if callback is not None:
+                callback(None)
+            return
+
+        if col_index is None:
+            columns = list(self._table_schema.schema)
+        else:
+            columns = [self._columns[col_index]['name']]
+
+        def found(result):
+            if result is not None:
+                index, row = result
+                loaded_row = self.row(index)
+                if loaded_row is not None:
+                    result = (index, loaded_row)
+                self._last_match = result
+            if callback is not None:
+                callback(result)
+
+        self._run(self._search_rows, keyword, columns, seek_row, reverse,
+                callback=found)
+
+    def _search_rows(self, keyword, columns, seek_row, reverse):
+        '''Query the first row after `seek_row` which contains `keyword` in
+        any of `columns`. Returns (row index, row) or None'''
+        seek_order = self._seek_order()
+        match_terms = []
+        for column in columns:
+            if self._table_schema.column_is_spatial(self._table_schema.schema[column]['type']):
+                column = 'ST_AsText(`{0}`)'.format(column)
+            else:
+                column = 'CAST(`{0}` AS CHAR)'.format(column)
+            match_terms.append('LOWER({0}) LIKE %(search)s'.format(column))
+
+        keyword = str(keyword).lower()
+        for char in ('\\', '%', '_'):
+            keyword = keyword.replace(char, '\\' + char)
+        params = {'search': '%{0}%'.format(keyword)}
+
+        conditions = ['({0})'.format(' OR '.join(match_terms))]
+        if self._where:
+            conditions.append('({0})'.format(self._where))
+        if seek_row is not None:
+            condition, seek_params = self._seek_condition(seek_order, seek_row,
+                    reverse)
+            conditions.append(condition)
+            params.update(seek_params)
+
+        direction = self._seek_direction(reverse)
+        query = '{0} WHERE {1} ORDER BY {2} LIMIT 1'.format(
+                self._select_clause(), ' AND '.join(conditions),
+                ', '.join(['`{0}` {1}'.format(c, direction) for c in seek_order]))
+
+        try:
+            cursor = self._con.query(query, params, raw=True)
+            rows = raw_rows(cursor, self._con.charset)
+            if not rows:
+                self.last_error = None
+                return None
+            row = rows[0]
+
+            # The index of the match is the number of rows preceding it
+            condition, params = self._seek_condition(seek_order, row,
+                    reverse=True)
+            if self._where:
+                condition = '({0}) AND {1}'.format(self._where, condition)
+            cursor = self._con.query('SELECT COUNT(*) FROM `{0}` WHERE {1}'.format(
+                self.table_name, condition), params)
+            index = cursor.fetchone()[0]
+            self.last_error = None
+        except errors.Error as e:
+            self._set_error(e)
+            return None
+
+        return (index, row)
+
+    def _search_anchor(self, pos, reverse):
+        '''The row which bounds the search: the row before `pos` or, if
+        `reverse` is True, the row at `pos`'''
+        if pos is None:
+            return None
+
+        index = pos if reverse else pos - 1
+        if index < 0:
+            return None
+        row = self.row(index)
+        if row is not None:
+            return row
+
+        # The last match may not be loaded yet
+        if self._last_match is not None and self._last_match[0] == index:
+            return self._last_match[1]
+        return None
+
     def load_more(self, count):
+        if self.loading:
+            return
+
         offset = self.loaded_rowcount
         limit = count + 100 # Load 100 more rows in advance
+        data = self.data
+        seek_row = data[-1] if len(data) else None
 
-        old_limit = self._limit
-        old_offset = self._offset
+        def loaded(rows):
+            if rows is None or self.data is not data:
+                rows = []
+            else:
+                self._append_rows(rows, limit)
+                self._offset = offset
 
-        self._limit = limit
-        self._offset = offset
+            self._page = self.loaded_rowcount // self.PAGINATION_LIMIT
+            urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, rows, len(rows))
 
         urwid.emit_signal(self, self.SIGNAL_PRE_LOAD, self)
-        result = self._fetch_more_rows()
-        if result is None:
-            self._limit = old_limit
-            self._offset = old_offset
-            data = []
-            data_length = 0
+        self._run(self._fetch_more_rows, seek_row, offset, limit,
+                callback=loaded)
+
+    def _fetch_more_rows(self, seek_row, offset, limit):
+        '''Query the `limit` rows which follow `seek_row` (or start at
+        `offset` when paging with offsets)'''
+        cursor = self._query_db(seek_row=seek_row, offset=offset, limit=limit)
+        if cursor is None:
+            return None
+        return cursor.fetchall()
+
+    def _append_rows(self, rows, limit):
+        '''Append the rows which follow the loaded rows. Less rows than
+        `limit` means the last row was reached'''
+        data_length = len(rows)
+        self.data.extend(rows)
+        self.loaded_rowcount += data_length
+        self._drop_loaded_windows()
+
+        if self.rowcount_estimated and data_length < limit:
+            # Reached the last row, the count is known
+            self._page_cache.put(self._cache_key('count', self._where),
+                    (self.loaded_rowcount, False))
+            self._set_rowcount(self.loaded_rowcount, False)
         else:
-            data, data_length = result
-        urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, data, data_length)
+            self._set_rowcount(self.rowcount, self.rowcount_estimated)
 
-        self._page = self.loaded_rowcount // self.PAGINATION_LIMIT
-        self._limit = self.PAGINATION_LIMIT
+    def row(self, index):
+        if index < self.loaded_rowcount:
+            return super().row(index)
+
+        page, row_index = divmod(index, self.PAGINATION_LIMIT)
+        rows = self._windows.get(page)
+        if rows is None or row_index >= len(rows):
+            return None
+        return rows[row_index]
+
+    def load_rows(self, index):
+        '''Load the rows around `index`. The rows which follow the loaded
+        rows are appended to them by load_next_set(), the others are loaded
+        as a single page without loading the rows in between.
+
+        The page is queried using a keyset predicate if the row before or
+        after it is loaded, otherwise using an offset counted from the first
+        row or, if closer, from the last one. Emits SIGNAL_NEW_DATA when the
+        rows arrive. Returns False if there is nothing to load.
+        '''
+        if (self.loading or self.schema_error is not None or index < 0 or
+                index >= self.rowcount or self.row(index) is not None):
+            return False
+
+        if index < self.loaded_rowcount + self.PAGINATION_LIMIT:
+            self.load_next_set()
+            return True
+
+        page = index // self.PAGINATION_LIMIT
+        start = page * self.PAGINATION_LIMIT
+        end = min(start + self.PAGINATION_LIMIT, self.rowcount)
+        row_before = self.row(start - 1)
+        row_after = self.row(end) if end < self.rowcount else None
+        data = self.data
+
+        def loaded(result):
+            rows = []
+            if result is not None and self.data is data:
+                rows, reverse = result
+                self._add_window(page, rows, reverse)
+            urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, rows, len(rows))
+
+        urwid.emit_signal(self, self.SIGNAL_PRE_LOAD, self)
+        self._run(self._fetch_window, start, end, self.rowcount, row_before,
+                row_after, callback=loaded)
+        return True
+
+    def _fetch_window(self, start, end, rowcount, row_before, row_after):
+        '''Query the rows from `start` to `end` using the row before or after
+        them if loaded. Returns (rows, reverse) where reverse is True if the
+        rows were read backwards'''
+        limit = self.PAGINATION_LIMIT
+        seek_order = self._seek_order()
+
+        reverse = False
+        if seek_order is not None and row_before is not None:
+            cursor = self._query_db(seek_row=row_before, limit=limit)
+        elif seek_order is not None and row_after is not None:
+            reverse = True
+            cursor = self._query_db(seek_row=row_after, reverse=True,
+                    limit=limit)
+        elif seek_order is not None and rowcount - end < start:
+            # Read the rows backwards from the last one
+            reverse = True
+            cursor = self._query_db(reverse=True, offset=rowcount - end,
+                    limit=end - start)
+        else:
+            cursor = self._query_db(offset=start, limit=limit)
 
-    def _fetch_more_rows(self):
-        cursor = self._query_db()
         if cursor is None:
             return None
-        data = cursor.fetchall()
-        data_length = len(data)
-        self.data.extend(data)
-        self.loaded_rowcount += data_length
-        return (data, data_length)
+
+        rows = cursor.fetchall()
+        if reverse:
+            rows.reverse()
+        return (ResultStore(rows), reverse)
+
+    def _add_window(self, page, rows, reverse):
+        '''Keep the rows of `page` loaded by load_rows()'''
+        if (self.rowcount_estimated and not reverse and
+                0 < len(rows) < self.PAGINATION_LIMIT):
+            # Reached the last row, the count is known
+            count = page * self.PAGINATION_LIMIT + len(rows)
+            self._page_cache.put(self._cache_key('count', self._where),
+                    (count, False))
+            self._set_rowcount(count, False)
+
+        self._windows[page] = rows
+        while len(self._windows) > self.WINDOW_PAGES:
+            farthest = max(self._windows, key=lambda p: abs(p - page))
+            del self._windows[farthest]
+
+    def _drop_loaded_windows(self):
+        '''Drop the windows covered by the loaded rows'''
+        for page in list(self._windows):
+            if (page + 1) * self.PAGINATION_LIMIT <= self.loaded_rowcount:
+                del self._windows[page]
 
     def _increment_page(self, value=1):
         self._page += value
         self._offset = (self._page - value) * self._limit
 
-    def _query_db(self):
-        if self.schema_error is not None:
-            return
+    def _seek_order(self, table_schema=None):
+        '''Returns the columns which define the rows order when paging using
+        a keyset (seek) predicate or None if the table must be paged using
+        offsets.
+
+        The unique key is always appended to the sort column in order to
+        make the ordering deterministic.
+        '''
+        if table_schema is None:
+            if self.schema_error is not None:
+                return None
+            table_schema = self._table_schema
+
+        key = table_schema.seek_key
+        if key is None:
+            return None
+
+        if self._column_order is None:
+            return key
+
+        if self._order_dir is None or self._order_dir.lower() not in ('asc', 'desc'):
+            return None
+
+        if self._column_order in key:
+            return [self._column_order] + [c for c in key if c != self._column_order]
+
+        if not table_schema.column_is_seekable(self._column_order):
+            return None
+
+        return [self._column_order] + key
+
+    def _seek_direction(self, reverse=False):
+        direction = 'ASC'
+        if self._column_order is not None and self._order_dir.lower() == 'desc':
+            direction = 'DESC'
+
+        if reverse:
+            direction = 'DESC' if direction == 'ASC' else 'ASC'
+        return direction
+
+    def _seek_condition(self, columns, row, reverse=False):
+        '''Build the keyset predicate which selects the rows following (or
+        preceding if `reverse` is True) `row` in the current sort order:
+
+            (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ...
+        '''
+        operator = '>' if self._seek_direction(reverse) == 'ASC' else '<'
+        schema_columns = list(self._table_schema.schema)
+
+        params = {}
+        conditions = []
+        for index, column in enumerate(columns):
+            terms = []
+            for prev_index, prev_column in enumerate(columns[0:index]):
+                terms.append('`{0}` = %(seek_{1})s'.format(prev_column, prev_index))
+            terms.append('`{0}` {1} %(seek_{2})s'.format(column, operator, index))
+            conditions.append('({0})'.format(' AND '.join(terms)))
+
+            params['seek_{0}'.format(index)] = row[schema_columns.index(column)]
+
+        return ('({0})'.format(' OR '.join(conditions)), params)
+
+    def _query_db(self, seek_row=None, reverse=False, offset=None, limit=None,
+            connection=None, table_schema=None):
+        '''Query the next rows set.
+
+        If the table has a usable unique key and `seek_row` is given, fetch
+        the rows which follow `seek_row` (or precede it if `reverse` is True)
+        using a keyset predicate. The query cost stays flat regardless of how
+        deep the rows set is. Otherwise fall back to LIMIT offset, limit.
+
+        The query runs on `connection` if given, errors are raised instead
+        of being reported. The columns are read from `table_schema` if
+        given.
+        '''
+        if offset is None:
+            offset = self._offset
+        if limit is None:
+            limit = self._limit
+
+        if table_schema is None:
+            if self.schema_error is not None:
+                return
+            table_schema = self._table_schema
+
+        query = self._select_clause(table_schema)
+        seek_order = self._seek_order(table_schema)
+        params = None
+        conditions = []
+
+        if self._where:
+            conditions.append('({0})'.format(self._where))
+
+        if seek_order is not None and seek_row is not None:
+            condition, params = self._seek_condition(seek_order, seek_row, reverse)
+            conditions.append(condition)
+
+        if len(conditions):
+            query += ' WHERE {0}'.format(' AND '.join(conditions))
+
+        if seek_order is not None:
+            direction = self._seek_direction(reverse)
+            query += ' ORDER BY {0}'.format(', '.join(['`{0}` {1}'.format(c,
+                direction) for c in seek_order]))
+
+            if seek_row is not None:
+                query += ' LIMIT {0:d}'.format(limit)
+            else:
+                query += ' LIMIT {0:d}, {1:d}'.format(offset, limit)
+        else:
+            if self._column_order is not None and self._order_dir is not None:
+                query += ' ORDER BY `{0}` {1}'.format(self._column_order, self._order_dir)
+
+            query += ' LIMIT {0:d}, {1:d}'.format(offset, limit)
+
+        return self._cached_query(query, params, connection)
+
+    def _select_clause(self, table_schema=None):
+        '''SELECT clause of the rows queries. Long text columns are
+        truncated and spatial columns are selected as text'''
+        if table_schema is None:
+            table_schema = self._table_schema
+        seek_key = table_schema.seek_key or []
         select_columns = []
-        for column, info in self._table_schema:
-            if self._table_schema.column_is_text(info['type']) and info['max_len'] is not None and info['max_len'] > 256:
-                column = 'LEFT(`{0}`, 256) as `{1}`'.format(column, column)
-            elif self._table_schema.column_is_spatial(info['type']):
+        for column, info in table_schema:
+            if table_schema.column_is_truncated(info) and column not in seek_key:
+                column = 'LEFT(`{0}`, {1:d}) as `{2}`'.format(column,
+                        schema.max_text_column_length, column)
+            elif table_schema.column_is_spatial(info['type']):
                 column = 'ST_AsText(`{0}`) as `{1}`'.format(column, column)
             else:
                 column = '`{0}`'.format(column)
             select_columns.append(column)
 
-        query = 'SELECT {0} FROM `{1}`'.format(','.join(select_columns),
+        return 'SELECT {0} FROM `{1}`'.format(','.join(select_columns),
                 self.table_name)
 
-        if self._where:
-            query += ' WHERE {0}'.format(self._where)
+    def _cached_query(self, query, params=None, connection=None):
+        '''Serve the rows window from the page cache or query and cache it'''
+        cache_params = None
+        if params:
+            cache_params = tuple((name, bytes(value) if isinstance(value, bytearray) else value)
+                    for name, value in sorted(params.items()))
+        key = self._cache_key('rows', query, cache_params)
 
-        if self._column_order is not None and self._order_dir is not None:
-            query += ' ORDER BY `{0}` {1}'.format(self._column_order, self._order_dir)
+        cursor = self._page_cache.get(key)
+        if cursor is not None:
+            return cursor
 
-        query += ' LIMIT {0:d}, {1:d}'.format(self._offset, self._limit)
-        cursor = self.execute_query(query)
+        # The rows are only decoded when displayed
+        if connection is not None:
+            cursor = connection.query(query, params, raw=True)
+            rows = raw_rows(cursor, connection.charset)
+        else:
+            try:
+                cursor = self._con.query(query, params, raw=True)
+                rows = raw_rows(cursor, self._con.charset)
+                self.last_error = None
+            except errors.Error as e:
+                self._set_error(e)
+                return None
+
+        cursor = CachedCursor(rows, cursor.description)
+        self._page_cache.put(key, cursor)
         return cursor
 
+# Statements which change the schema
+DDL_STATEMENTS = ('create', 'alter', 'drop', 'rename', 'truncate')
+
+def is_ddl(statement):
+    '''Returns True if the statement changes the schema. Unknown statements
+    are assumed to change it'''
+    if statement is None:
+        return True
+
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode('utf-8', 'replace')
+
+    words = statement.split(None, 1)
+    return len(words) > 0 and words[0].lower() in DDL_STATEMENTS
+
 class QueryModel(MysqlModel):
-    def __init__(self, connection, query):
+    '''Model for the queries executed from the query editor.
+
+    In streaming mode the rows are read with an unbuffered cursor: only the
+    first batch is fetched when the query runs, the rest are fetched by calling
+    `fetch_next_batch()` which appends the rows to the data set and emits the
+    SIGNAL_NEW_DATA signal.
+
+    The rows are kept in a SpillStore which moves them to disk once they
+    take more than SpillStore.MEMORY_LIMIT bytes.
+    '''
+    STREAM_BATCH_SIZE = 500
+
+    def __init__(self, connection, query, streaming=False):
         self.query = query
         self.affected_rows = 0
         self.has_rows = False
+        self._streaming = streaming
+        self._results = None
+        self._stream_cursor = None
         super().__init__(connection)
 
+    @property
+    def streaming(self):
+        '''True while a streamed result set still has rows to fetch'''
+        return self._stream_cursor is not None
+
     def execute_query(self, query, params=None):
         try:
-            cursors = self._con.query(query, params, multi=True)
+            cursors = self._con.query(query, params, multi=True,
+                    buffered=not self._streaming)
             self.last_error = None
             return cursors
         except errors.Error as e:
-            self.last_error = e
-            urwid.emit_signal(self, self.SIGNAL_ERROR, self, e)
+            self._set_error(e)
 
     def _fetch_data(self):
-        cursors = self.execute_query(self.query)
+        '''Run the statements. Returns the result of the last statement
+        read (see _consume_results()) or None if one of them failed'''
+        self._close_stream()
+        self._results = self.execute_query(self.query)
 
-        if cursors:
-            try:
-                for cursor in cursors:
-                    if cursor.with_rows:
-                        self.data = cursor.fetchall()
-                        self._columns = self._schema(cursor).columns
-                        self.rowcount = cursor.rowcount
-                        self.affected_rows = 0
-                        self.has_rows = cursor.with_rows
-                    else:
-                        self.data = []
-                        self._columns = []
-                        self.rowcount = 0
-                        self.affected_rows = cursor.rowcount
-            except Exception as e:
-                self.last_error = e
-                urwid.emit_signal(self, self.SIGNAL_ERROR, self, e)
+        result = None
+        if self._results:
+            result = self._consume_results()
 
         if self.last_error:
-            self.data = []
+            self._close_stream()
+            if result is not None:
+                result[0].close()
+            return None
+
+        # The words of the user's statements rank the autocomplete
+        # suggestions
+        self._con.WORD_USAGE.add(self.query)
+        return result
+
+    def _set_data(self, result):
+        # Remove the spill files of the rows being replaced
+        if isinstance(self.data, SpillStore):
+            self.data.close()
+
+        if result is None:
+            self.data = SpillStore()
             self._columns = []
             self.rowcount = 0
             self.affected_rows = 0
             return False
+
+        self.data, self._columns, self.rowcount, self.affected_rows, \
+                has_rows = result
+        self.has_rows = self.has_rows or has_rows
         return True
 
+    def _consume_results(self):
+        '''Iterate the statements results until a result set needs to be
+        streamed or all the results have been read. Returns the result of
+        the last statement read as (rows, columns, rowcount, affected rows,
+        has rows), or None if there was no statement left'''
+        result = None
+        try:
+            for cursor in self._results:
+                if result is not None:
+                    # Only the result of the last statement is kept
+                    result[0].close()
+                    result = None
+
+                if cursor.with_rows:
+                    if self._streaming:
+                        self._stream_cursor = cursor
+                        data = SpillStore(cursor.fetchmany(self.STREAM_BATCH_SIZE))
+                        rowcount = len(data)
+                        if rowcount < self.STREAM_BATCH_SIZE:
+                            self._stream_cursor = None
+                    else:
+                        data = SpillStore(cursor.fetchall())
+                        rowcount = cursor.rowcount
+                    result = (data, self._schema(cursor, data).columns,
+                            rowcount, 0, True)
+
+                    if self.streaming:
+                        return result
+                else:
+                    result = (SpillStore(), [], 0, cursor.rowcount, False)
+                    # The statement may have changed the data of any table
+                    page_cache_instance.invalidate(self._con.session_name)
+                    if is_ddl(cursor.statement):
+                        SchemaCatalog.get(self._con).invalidate()
+            self._results = None
+        except errors.Error as e:
+            self._set_error(e)
+        return result
+
+    def fetch_next_batch(self):
+        '''Fetch the next batch of rows of a streamed result set'''
+        if not self.streaming or self.loading:
+            return
+        self._run(self._fetch_next_batch, callback=self._batch_fetched)
+
+    def _fetch_next_batch(self):
+        '''Returns (rows, following, result) where following is True if
+        the stream was exhausted and the statements which follow it were run
+        and result is the result of the last of them (see
+        _consume_results())'''
+        # The stream was closed while the job was waiting to run
+        if not self.streaming:
+            return None
+
+        try:
+            data = self._stream_cursor.fetchmany(self.STREAM_BATCH_SIZE)
+        except errors.Error as e:
+            self._close_stream()
+            self._set_error(e)
+            return None
+
+        if len(data) < self.STREAM_BATCH_SIZE:
+            self._stream_cursor = None
+
+        if self.streaming or self._results is None:
+            return (data, False, None)
+
+        # The streamed result set was exhausted, run the statements which
+        # follow it. If one of them returns rows as well, it replaces the
+        # current data set just like in buffered mode
+        return (data, True, self._consume_results())
+
+    def _batch_fetched(self, result):
+        if result is None:
+            return
+
+        data, following, following_result = result
+        data_length = len(data)
+        self.data.extend(data)
+        self.rowcount += data_length
+        urwid.emit_signal(self, self.SIGNAL_NEW_DATA, self, data, data_length)
+
+        if not following:
+            return
+        if following_result is not None:
+            self._set_data(following_result)
+        if self.last_error is None:
+            urwid.emit_signal(self, self.SIGNAL_LOAD, self)
+
+    def cancel(self):
+        '''Interrupt the running query or, between two batches, stop
+        streaming the result set'''
+        if not self.loading and self.streaming:
+            self._run(self._cancel_stream)
+            return True
+        return super().cancel()
+
+    def _cancel_stream(self):
+        if not self.streaming:
+            return
+        self._close_stream()
+        self.cancelled = True
+        # Let the views know the result set won't grow anymore
+        executor_instance.emit_signal(self, self.SIGNAL_NEW_DATA, self, [], 0)
+
+    def close(self):
+        '''Stop streaming, drop the rows (and their spill files) and return
+        the connection to the pool'''
+        self._close_stream()
+        if isinstance(self.data, SpillStore):
+            self.data.close()
+        self._con.close()
+
+    def _close_stream(self):
+        if self._stream_cursor is None and self._results is None:
+            return
+
+        self._stream_cursor = None
+        self._results = None
+        try:
+            self._con.discard_unread_result()
+        except errors.Error as e:
+            self.last_error = e
+
 class TriggerModel:
     def __init__(self, connection, database, name):
         self._con = connection
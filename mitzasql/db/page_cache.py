@@ -0,0 +1,135 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+import time
+import threading
+from collections import OrderedDict
+
+from .raw_row import RawRow
+
+class CachedCursor:
+    '''Read only cursor over cached rows. Implements the part of the mysql
+    cursor used by the models'''
+    with_rows = True
+
+    def __init__(self, rows, description):
+        self._rows = rows
+        self.description = description
+
+    @property
+    def rowcount(self):
+        return len(self._rows)
+
+    def fetchall(self):
+        # The models extend their data set, don't let them extend the cache
+        return list(self._rows)
+
+class PageCache:
+    """
+    Memory bounded LRU cache for the data fetched by the table models: rows
+    windows and row counts.
+
+    The keys are tuples starting with (session, database, table) so the
+    entries of a table or of a whole session can be invalidated at once.
+    Entries expire after `ttl` seconds.
+    """
+    MAX_SIZE = 64 * 1024 * 1024
+    TTL = 60
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size or self.MAX_SIZE
+        self.ttl = ttl or self.TTL
+        # key => (value, size, expires at), the least recently used is first
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        '''The estimated number of bytes used by the cached values'''
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, size, expires_at = entry
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, size=None):
+        if size is None:
+            size = estimate_size(value)
+
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, size, time.time() + self.ttl)
+            self._size += size
+
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *prefix):
+        '''Drop the entries whose key starts with `prefix`, e.g.
+        (session, database, table) or (session,)'''
+        length = len(prefix)
+        with self._lock:
+            keys = [key for key in self._entries if key[0:length] == prefix]
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        value, size, expires_at = self._entries.pop(key)
+        self._size -= size
+
+def estimate_size(value):
+    '''Rough estimate of the memory used by a cached value. Rows are lists of
+    tuples or raw rows, anything else is counted as a small object'''
+    if isinstance(value, CachedCursor):
+        value = value._rows
+
+    if not isinstance(value, (list, tuple)):
+        return 64
+
+    size = 64 + 8 * len(value)
+    for row in value:
+        if isinstance(row, RawRow):
+            size += 56
+            row = row.raw
+
+        if not isinstance(row, tuple):
+            size += 64
+            continue
+
+        size += 56 + 8 * len(row)
+        for cell in row:
+            if isinstance(cell, (str, bytes, bytearray)):
+                size += 49 + len(cell)
+            else:
+                size += 32
+    return size
+
+page_cache_instance = PageCache()
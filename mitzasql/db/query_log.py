@@ -0,0 +1,315 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+import re
+import threading
+from collections import (deque, OrderedDict)
+
+from ..sql_parser.lexer import Lexer
+from ..sql_parser import tokens as Token
+
+# Python DB-API parameter placeholders: %s and %(name)s
+_PARAM_PLACEHOLDER = re.compile(r'%(\(\w+\))?s')
+
+# Separators which are not surrounded by spaces in a digest
+_NO_SPACE_BEFORE = (',', ')', '.', ';')
+_NO_SPACE_AFTER = ('(', '.')
+
+# Tokens after which a +/- sign belongs to the number which follows it
+_UNARY_CONTEXT = ('(', ',', '=', '<', '>', '<=', '>=', '<>', '!=', '+', '-',
+        '*', '/', 'AND', 'OR', 'NOT', 'IN', 'BY', 'SELECT', 'WHERE', 'VALUES',
+        'LIMIT', 'BETWEEN', 'SET', 'THEN', 'ELSE', 'WHEN')
+
+# The tokens returned by words()
+_WORD_TYPES = (Token.Name, Token.Other, Token.Keyword, Token.Function,
+        Token.Variable)
+
+def digest(query):
+    '''Normalize a query in order to group the queries which differ only by
+    their literals: the string and number literals are replaced by "?",
+    lists of literals by "...", the keywords are upper cased, the comments
+    are dropped and the whitespace is collapsed'''
+    query = _PARAM_PLACEHOLDER.sub('?', query)
+    values = []
+    # True if the token immediately follows the previous one
+    adjacent = []
+    end = None
+    for ttype, value, pos in Lexer(query).tokenize():
+        if ttype in Token.Whitespace or ttype in Token.Comment:
+            continue
+
+        is_adjacent = pos == end
+        end = pos + len(value)
+
+        if ttype in Token.String or ttype in Token.Number:
+            if (len(values) and values[-1] in ('-', '+') and
+                    (len(values) == 1 or values[-2] in _UNARY_CONTEXT)):
+                # Negative number
+                values.pop()
+                is_adjacent = adjacent.pop()
+            value = '?'
+        elif ttype in Token.Keyword or (ttype in Token.Operator and value.isalpha()):
+            value = value.upper()
+
+        values.append(value)
+        adjacent.append(is_adjacent)
+
+    values, adjacent = _collapse_lists(values, adjacent)
+
+    parts = []
+    for index, value in enumerate(values):
+        if (index > 0 and value not in _NO_SPACE_BEFORE and
+                values[index - 1] not in _NO_SPACE_AFTER and
+                not (value == '(' and adjacent[index])):
+            parts.append(' ')
+        parts.append(value)
+    return ''.join(parts)
+
+def words(query):
+    '''The lower cased names, keywords, functions and variables used by a
+    query, without the backquotes'''
+    return frozenset(value.lower().replace('`', '')
+            for ttype, value, pos in Lexer(query).tokenize()
+            if any(ttype in word_type for word_type in _WORD_TYPES))
+
+def _collapse_lists(values, adjacent):
+    '''Replace "(?, ?, ...)" with "(...)" and the repeated "(...)" row lists
+    of multi-row inserts with a single one'''
+    result = []
+    result_adjacent = []
+    index = 0
+    length = len(values)
+    while index < length:
+        value = values[index]
+        if value == '(':
+            end = index + 1
+            while end < length and values[end] == '?':
+                if end + 1 < length and values[end + 1] == ',':
+                    end += 2
+                    continue
+                end += 1
+                break
+
+            if (end < length and end - index > 2 and values[end] == ')' and
+                    values[end - 1] == '?'):
+                if (len(result) > 2 and result[-1] == ',' and
+                        result[-2] == ')' and result[-3] == '...'):
+                    # Another row of a multi-row insert
+                    result.pop()
+                    result_adjacent.pop()
+                else:
+                    result.extend(['(', '...', ')'])
+                    result_adjacent.extend([adjacent[index], False, False])
+                index = end + 1
+                continue
+
+        result.append(value)
+        result_adjacent.append(adjacent[index])
+        index += 1
+
+    return (result, result_adjacent)
+
+class QueryStats:
+    '''Latency statistics of the queries sharing a digest. The percentiles
+    are computed over the last SAMPLE_SIZE durations'''
+    SAMPLE_SIZE = 1000
+
+    def __init__(self, digest):
+        self.digest = digest
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._durations = deque(maxlen=self.SAMPLE_SIZE)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self._durations.append(duration)
+
+    @property
+    def mean(self):
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    @property
+    def p50(self):
+        return self.percentile(50)
+
+    @property
+    def p95(self):
+        return self.percentile(95)
+
+    def percentile(self, percent):
+        '''Nearest-rank percentile of the sampled durations'''
+        if not len(self._durations):
+            return 0.0
+        durations = sorted(self._durations)
+        rank = max(1, -(-percent * len(durations) // 100))
+        return durations[int(rank) - 1]
+
+class QueryLog:
+    """
+    Ring buffer holding the last `max_size` executed queries as (date,
+    query, params, duration) tuples.
+
+    The durations of all the queries, including the ones which were dropped
+    from the buffer, are aggregated per query digest.
+    """
+    MAX_SIZE = 1000
+    MAX_DIGESTS = 500
+    DIGEST_CACHE_SIZE = 1000
+    # Only the start of longer queries (multi-row inserts, generated IN
+    # lists) is normalized, lexing them whole would hold up the query
+    MAX_DIGEST_LENGTH = 1024
+
+    def __init__(self, max_size=None):
+        self._entries = deque(maxlen=max_size or self.MAX_SIZE)
+        # digest => QueryStats, the least recently used digest is first
+        self._stats = OrderedDict()
+        # hash of the query => digest
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self._entries.maxlen
+
+    def resize(self, max_size):
+        with self._lock:
+            self._entries = deque(self._entries, maxlen=max_size)
+
+    def append(self, entry):
+        date, query, params, duration = entry
+        digest_ = self._digest(query)
+
+        with self._lock:
+            self._entries.append(entry)
+
+            stats = self._stats.get(digest_)
+            if stats is None:
+                stats = QueryStats(digest_)
+                self._stats[digest_] = stats
+                if len(self._stats) > self.MAX_DIGESTS:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(digest_)
+            stats.add(duration)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            self._digests.clear()
+
+    def stats(self):
+        '''The statistics of each digest, slowest (by total duration) first'''
+        with self._lock:
+            stats = list(self._stats.values())
+        return sorted(stats, key=lambda stats: stats.total, reverse=True)
+
+    def _digest(self, query):
+        if not isinstance(query, str):
+            query = str(query)
+
+        # The cache doesn't keep the text of the queries
+        key = hash(query)
+        with self._lock:
+            digest_ = self._digests.get(key)
+            if digest_ is not None:
+                self._digests.move_to_end(key)
+                return digest_
+
+        truncated = len(query) > self.MAX_DIGEST_LENGTH
+        if truncated:
+            query = query[0:self.MAX_DIGEST_LENGTH]
+
+        try:
+            digest_ = digest(query)
+        except Exception:
+            # Never fail a query because it couldn't be normalized
+            digest_ = query
+
+        if truncated:
+            digest_ += ' ...'
+
+        with self._lock:
+            self._digests[key] = digest_
+            if len(self._digests) > self.DIGEST_CACHE_SIZE:
+                self._digests.popitem(last=False)
+        return digest_
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        with self._lock:
+            entries = list(self._entries)
+        return iter(entries)
+
+class WordUsage:
+    """
+    The number of statements run by the user which used each word (see
+    words()), which ranks the autocomplete suggestions. The queries run by
+    the application itself (catalog loads, pages, counts) are not counted.
+
+    The statements are grouped by the set of words they use. Only the
+    MAX_STATEMENTS most recently used groups are counted.
+    """
+    MAX_STATEMENTS = 500
+
+    def __init__(self):
+        # words => number of statements, the least recently used is first
+        self._statements = OrderedDict()
+        # word => number of statements using it
+        self._usage = {}
+        # Incremented on every change, tells the readers of usage() when to
+        # read it again
+        self.changes = 0
+        self._lock = threading.Lock()
+
+    def add(self, statement):
+        if not isinstance(statement, str):
+            statement = str(statement)
+        try:
+            # Like the digests, only the start of long statements is lexed
+            words_ = words(statement[0:QueryLog.MAX_DIGEST_LENGTH])
+        except Exception:
+            return
+
+        with self._lock:
+            self.changes += 1
+            count = self._statements.get(words_)
+            if count is None:
+                count = 0
+                if len(self._statements) >= self.MAX_STATEMENTS:
+                    self._forget(*self._statements.popitem(last=False))
+            else:
+                self._statements.move_to_end(words_)
+            self._statements[words_] = count + 1
+
+            for word in words_:
+                self._usage[word] = self._usage.get(word, 0) + 1
+
+    def _forget(self, words_, count):
+        '''Drop the usage of the words of statements which are no longer
+        tracked'''
+        for word in words_:
+            usage = self._usage[word] - count
+            if usage > 0:
+                self._usage[word] = usage
+            else:
+                del self._usage[word]
+
+    def clear(self):
+        with self._lock:
+            self._statements.clear()
+            self._usage.clear()
+            self.changes += 1
+
+    def usage(self):
+        '''The number of statements which used each word'''
+        with self._lock:
+            return dict(self._usage)
@@ -0,0 +1,105 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Rows fetched with a raw cursor, which skips the driver's type conversion.
+
+Browsing a table only displays the values, so converting every value to
+Decimal, datetime, timedelta or set and back to a string is wasted work.
+A RawRow keeps the bytes sent by the server: `display()` decodes them to the
+text shown by the table widgets, indexing converts them to the python types
+the driver would have returned (used by sorting, keyset pagination and
+export).
+'''
+
+from collections.abc import Sequence
+
+from mysql.connector import (FieldType, FieldFlag)
+from mysql.connector.conversion import MySQLConverter
+
+# Types whose binary values are displayed as bytes
+_blob_ftypes = (FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB,
+        FieldType.LONG_BLOB, FieldType.BLOB, FieldType.STRING,
+        FieldType.VAR_STRING)
+
+class RowDecoder:
+    '''Decodes the raw values of a result set described by `description`'''
+    def __init__(self, description, charset='utf8mb4'):
+        self.description = description
+        self._converter = MySQLConverter(charset, True)
+        self._charset = self._converter.charset
+
+    def display(self, index, value):
+        '''The value of the `index` column as shown in the tables: text for
+        most types, an int for BIT and bytes for binary strings'''
+        if value is None:
+            return None
+
+        field_type = self.description[index][1]
+        if field_type == FieldType.BIT:
+            return int.from_bytes(value, 'big')
+
+        if (field_type in _blob_ftypes and
+                self.description[index][7] & FieldFlag.BINARY):
+            try:
+                return value.decode(self._charset)
+            except UnicodeDecodeError:
+                return value
+
+        return value.decode(self._charset, 'replace')
+
+    def typed(self, index, value):
+        '''The value of the `index` column converted to a python type'''
+        if value is None:
+            return None
+        return self._converter.to_python(self.description[index], value)
+
+class RawRow(Sequence):
+    '''Row of raw values. Indexing returns the typed values'''
+    __slots__ = ('raw', '_decoder')
+
+    def __init__(self, raw, decoder):
+        self.raw = raw
+        self._decoder = decoder
+
+    @property
+    def decoder(self):
+        return self._decoder
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self.raw))))
+
+        if index < 0:
+            index += len(self.raw)
+        return self._decoder.typed(index, self.raw[index])
+
+    def __eq__(self, other):
+        if isinstance(other, RawRow):
+            return self.raw == other.raw
+        if isinstance(other, (tuple, list)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'RawRow({0!r})'.format(self.raw)
+
+    def display_value(self, index):
+        '''The value of the `index` column decoded for display'''
+        return self._decoder.display(index, self.raw[index])
+
+    def display(self):
+        '''The values of the row decoded for display'''
+        decoder = self._decoder
+        return [decoder.display(index, value) for index, value in enumerate(self.raw)]
+
+def raw_rows(cursor, charset='utf8mb4'):
+    '''Fetch all the rows of a raw cursor'''
+    decoder = RowDecoder(cursor.description, charset)
+    return [RawRow(row, decoder) for row in cursor.fetchall()]
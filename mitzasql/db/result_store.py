@@ -0,0 +1,192 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+import array
+from collections.abc import Sequence
+
+from .raw_row import RawRow
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+class Column:
+    """
+    The values of a result set column stored in a compact form picked from
+    the first non null value:
+
+    - int: array of signed 64 bit integers
+    - float: array of doubles
+    - str, bytes, bytearray: one buffer holding all the values and an array
+      with the offset of each value in the buffer
+    - anything else (Decimal, datetime, etc.): list of objects
+
+    If a value doesn't fit the column's form (e.g. an unsigned BIGINT past
+    the signed range) the column falls back to a list of objects. NULLs are
+    recorded in a bitmap.
+    """
+    __slots__ = ('kind', 'length', '_nulls', '_values', '_offsets')
+
+    def __init__(self):
+        self.kind = None
+        self.length = 0
+        self._nulls = bytearray()
+        self._values = None
+        self._offsets = None
+
+    def append(self, value):
+        index = self.length
+        self.length += 1
+        if index & 7 == 0:
+            self._nulls.append(0)
+
+        if value is None:
+            self._nulls[index >> 3] |= 1 << (index & 7)
+            if self.kind is not None:
+                self._append_placeholder()
+            return
+
+        if self.kind is None:
+            self._init(value, index)
+        elif not self._accepts(value):
+            self._to_objects()
+
+        self._append_value(value)
+
+    def __getitem__(self, index):
+        if self._nulls[index >> 3] & (1 << (index & 7)):
+            return None
+
+        kind = self.kind
+        if kind in ('int', 'float', 'object'):
+            return self._values[index]
+
+        value = self._values[self._offsets[index]:self._offsets[index + 1]]
+        if kind == 'str':
+            return value.decode('utf-8', 'surrogatepass')
+        if kind == 'bytes':
+            return bytes(value)
+        return value
+
+    def _init(self, value, nulls_count):
+        '''Pick the column's form from its first non null value. The
+        previous values are NULLs'''
+        if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+            self.kind = 'int'
+            self._values = array.array('q')
+        elif type(value) is float:
+            self.kind = 'float'
+            self._values = array.array('d')
+        elif type(value) in (str, bytes, bytearray):
+            self.kind = {str: 'str', bytes: 'bytes', bytearray: 'bytearray'}[type(value)]
+            self._values = bytearray()
+            self._offsets = array.array('Q', [0])
+        else:
+            self.kind = 'object'
+            self._values = []
+
+        for i in range(nulls_count):
+            self._append_placeholder()
+
+    def _accepts(self, value):
+        kind = self.kind
+        if kind == 'int':
+            return type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+        if kind == 'float':
+            return type(value) is float
+        if kind == 'str':
+            return type(value) is str
+        if kind == 'bytes':
+            return type(value) is bytes
+        if kind == 'bytearray':
+            return type(value) is bytearray
+        return True
+
+    def _append_value(self, value):
+        kind = self.kind
+        if kind in ('int', 'float', 'object'):
+            self._values.append(value)
+            return
+
+        if kind == 'str':
+            value = value.encode('utf-8', 'surrogatepass')
+        self._values += value
+        self._offsets.append(len(self._values))
+
+    def _append_placeholder(self):
+        kind = self.kind
+        if kind == 'int':
+            self._values.append(0)
+        elif kind == 'float':
+            self._values.append(0.0)
+        elif kind == 'object':
+            self._values.append(None)
+        else:
+            self._offsets.append(len(self._values))
+
+    def _to_objects(self):
+        # The value being appended is not counted yet
+        values = [self[index] for index in range(self.length - 1)]
+        self.kind = 'object'
+        self._values = values
+        self._offsets = None
+
+class ResultStore(Sequence):
+    """
+    Columnar storage for the rows of a result set.
+
+    A list of tuples costs an object per cell, which adds up to gigabytes for
+    results with millions of rows. The store keeps each column in a Column
+    and builds the rows back when they are accessed: tuples or, for the rows
+    fetched raw, RawRow objects.
+    """
+    def __init__(self, rows=()):
+        self._columns = None
+        self._length = 0
+        # Set if the rows are RawRow objects
+        self._decoder = None
+        self.extend(rows)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError('result store index out of range')
+        return self._row(index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._row(index)
+
+    def append(self, row):
+        if isinstance(row, RawRow):
+            self._decoder = row.decoder
+            row = row.raw
+
+        if self._columns is None:
+            self._columns = [Column() for value in row]
+
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self._length += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def clear(self):
+        self._columns = None
+        self._length = 0
+        self._decoder = None
+
+    def _row(self, index):
+        row = tuple(column[index] for column in self._columns)
+        if self._decoder is not None:
+            return RawRow(row, self._decoder)
+        return row
@@ -0,0 +1,88 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Strategies used by TableModel to count the rows of a table.
+
+`count()` returns a (count, estimated) tuple. If the count is estimated and
+the strategy is lazy, the model computes the exact count in the background
+with `exact_count()` and swaps it in when done.
+'''
+
+class CountStrategy:
+    '''Base row count strategy'''
+    lazy = False
+
+    def count(self, connection, database, table, where=None):
+        raise NotImplementedError()
+
+    def exact_count(self, connection, database, table, where=None):
+        query = 'SELECT COUNT(*) AS total FROM `{0}`'.format(table)
+        if where:
+            query += ' WHERE {0}'.format(where)
+
+        cursor = connection.query(query)
+        return cursor.fetchall()[0][0]
+
+class ExactCount(CountStrategy):
+    '''Count the rows with SELECT COUNT(*). Exact, but scans the whole table
+    (or index) which takes minutes on huge InnoDB tables'''
+    def count(self, connection, database, table, where=None):
+        return (self.exact_count(connection, database, table, where), False)
+
+class EstimatedCount(CountStrategy):
+    '''Use the optimizer's estimate: TABLE_ROWS from information_schema for
+    the whole table and the rows examined by EXPLAIN for a filtered one.
+    Falls back to the exact count if there is no estimate (e.g. for views)'''
+    def count(self, connection, database, table, where=None):
+        estimate = None
+        if not where:
+            estimate = self._table_rows(connection, database, table)
+
+        if estimate is None:
+            estimate = self._explain_rows(connection, table, where)
+
+        if estimate is None:
+            return (self.exact_count(connection, database, table, where), False)
+        return (estimate, True)
+
+    def _table_rows(self, connection, database, table):
+        query = '''SELECT TABLE_ROWS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND TABLE_TYPE = 'BASE TABLE'
+        '''
+        cursor = connection.query(query, (database, table))
+        rows = cursor.fetchall()
+        if not rows or rows[0][0] is None:
+            return None
+        return int(rows[0][0])
+
+    def _explain_rows(self, connection, table, where=None):
+        query = 'EXPLAIN SELECT * FROM `{0}`'.format(table)
+        if where:
+            query += ' WHERE {0}'.format(where)
+
+        cursor = connection.query(query, dictionary=True)
+        rows = cursor.fetchall()
+        if len(rows) != 1 or rows[0].get('rows') is None:
+            # Views and derived tables have no meaningful estimate
+            return None
+
+        estimate = int(rows[0]['rows'])
+        filtered = rows[0].get('filtered')
+        if filtered is not None:
+            estimate = int(estimate * float(filtered) / 100)
+        return estimate
+
+class LazyExactCount(EstimatedCount):
+    '''Show the estimate right away and count the rows exactly in the
+    background. Tables estimated below EXACT_COUNT_THRESHOLD rows are cheap
+    to count and are counted exactly right away'''
+    lazy = True
+    EXACT_COUNT_THRESHOLD = 100000
+
+    def count(self, connection, database, table, where=None):
+        count, estimated = super().count(connection, database, table, where)
+        if estimated and count < self.EXACT_COUNT_THRESHOLD:
+            return (self.exact_count(connection, database, table, where), False)
+        return (count, estimated)
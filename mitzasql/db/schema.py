@@ -8,6 +8,8 @@ from collections import OrderedDict
 import mysql.connector.errors as errors
 from mysql.connector import (FieldType, FieldFlag)
 
+from .raw_row import RawRow
+
 # Column types
 int_ctypes = ['int', 'tinyint', 'smallint', 'mediumint', 'bigint', 'bit']
 real_ctypes = ['float', 'double', 'decimal']
@@ -19,6 +21,14 @@ temporal_ctypes = ['date', 'time', 'year', 'datetime', 'timestamp']
 spatial_ctypes = ['point', 'linestring', 'polygon', 'geometry', 'multipoint',
         'multilinestring', 'multipolygon', 'geometrycollection']
 
+# Column types which can't be used in a keyset pagination (seek) predicate
+# because their sort order doesn't match the comparison operators or their
+# values don't survive the round trip through the driver
+unseekable_ctypes = ['float', 'double', 'enum', 'set', 'json'] + spatial_ctypes
+
+# Text columns longer than this are truncated when browsing tables
+max_text_column_length = 256
+
 # Field types
 int_ftypes = [FieldType.TINY, FieldType.SHORT, FieldType.LONG,
         FieldType.LONGLONG, FieldType.INT24, FieldType.BIT]
@@ -161,10 +171,12 @@ class QuerySchema:
         return columns
 
 class TableSchema(QuerySchema):
-    def __init__(self, connection, table_name):
+    def __init__(self, connection, table_name, schema=None):
         self._con = connection
         self._table_name = table_name
-        self.schema = self._table_schema()
+        if schema is None:
+            schema = self._table_schema()
+        self.schema = schema
         self.cursor = None
         self.data = None
 
@@ -178,27 +190,52 @@ class TableSchema(QuerySchema):
     def column_is_spatial(self, type_):
         return type_ in spatial_ctypes
 
+    def column_is_truncated(self, info):
+        return self.column_is_text(info['type']) and info['max_len'] is not None \
+                and info['max_len'] > max_text_column_length
+
+    def column_is_seekable(self, name):
+        '''Returns True if the column can be used to resume a sorted result
+        set using a keyset pagination (seek) predicate'''
+        try:
+            info = self.schema[name]
+        except KeyError:
+            return False
+
+        if info['nullable'] or info['type'] in unseekable_ctypes:
+            return False
+
+        return not self.column_is_truncated(info)
+
+    @property
+    def seek_key(self):
+        '''Returns the columns of the primary key or, if the table doesn't
+        have one, the column of a non nullable unique key. These columns
+        uniquely identify a row and are used for keyset pagination.
+
+        Returns None if the table doesn't have a usable key.
+        '''
+        primary_key = [name for name, info in self.schema.items() if info['key'] == 'PRI']
+        if primary_key:
+            if all(self.column_is_seekable(name) for name in primary_key):
+                return primary_key
+            return None
+
+        for name, info in self.schema.items():
+            if info['key'] == 'UNI' and self.column_is_seekable(name):
+                return [name]
+        return None
+
     def _table_schema(self):
         query = '''
-        SELECT
-            column_name,
-            column_default,
-            is_nullable,
-            data_type,
-            character_maximum_length,
-            numeric_precision,
-            numeric_scale,
-            character_set_name,
-            collation_name,
-            column_key,
-            extra
+        SELECT {0}
         FROM `information_schema`.`columns`
         WHERE
             table_schema = %(db_name)s
             AND
             table_name = %(table_name)s
         ORDER BY ORDINAL_POSITION ASC
-        '''
+        '''.format(column_schema_fields)
         cursor = self._con.query(query, {
             'db_name': self._con.database,
             'table_name': self._table_name
@@ -206,39 +243,62 @@ class TableSchema(QuerySchema):
         data = cursor.fetchall()
         schema = OrderedDict()
         for row in data:
-            column_name, default, nullable, _type, char_max_len, num_precision, \
-                    num_scale, charset, collation, key, extra = row
-
-            if isinstance(_type, bytes):
-                _type = _type.decode('utf-8')
-
-            if nullable == 'YES':
-                nullable = True
-            else:
-                nullable = False
-
-            schema[column_name] = {
-                    'type': _type,
-                    'charset': charset,
-                    'collation': collation,
-                    'default': default,
-                    'nullable': nullable,
-                    'key': key,
-                    'extra': extra
-                    }
-
-            c_len = None
-            if _type in int_ctypes or _type in real_ctypes:
-                if num_precision is not None or num_scale is not None:
-                    # Add 1 character to len to account for any coma that might exist
-                    c_len = int(num_precision or 0) + int(num_scale or 0) + 1
-            elif _type in text_ctypes or _type in binary_ctypes:
-                if char_max_len is not None:
-                    c_len = int(char_max_len)
-
-            schema[column_name]['max_len'] = c_len
+            column_name, info = column_schema(row)
+            schema[column_name] = info
         return schema
 
+# The information_schema.columns fields used by `column_schema()`
+column_schema_fields = '''
+            column_name,
+            column_default,
+            is_nullable,
+            data_type,
+            character_maximum_length,
+            numeric_precision,
+            numeric_scale,
+            character_set_name,
+            collation_name,
+            column_key,
+            extra'''
+
+def column_schema(row):
+    '''Returns the (name, info) tuple of a column from a row holding the
+    `column_schema_fields` of information_schema.columns'''
+    column_name, default, nullable, _type, char_max_len, num_precision, \
+            num_scale, charset, collation, key, extra = row
+
+    if isinstance(_type, bytes):
+        _type = _type.decode('utf-8')
+
+    if isinstance(key, bytes):
+        key = key.decode('utf-8')
+
+    if nullable == 'YES':
+        nullable = True
+    else:
+        nullable = False
+
+    info = {
+            'type': _type,
+            'charset': charset,
+            'collation': collation,
+            'default': default,
+            'nullable': nullable,
+            'key': key,
+            'extra': extra
+            }
+
+    c_len = None
+    if _type in int_ctypes or _type in real_ctypes:
+        if num_precision is not None or num_scale is not None:
+            # Add 1 character to len to account for any coma that might exist
+            c_len = int(num_precision or 0) + int(num_scale or 0) + 1
+    elif _type in text_ctypes or _type in binary_ctypes:
+        if char_max_len is not None:
+            c_len = int(char_max_len)
+
+    info['max_len'] = c_len
+    return (column_name, info)
 
 def auto_detect_column_length(c_index, sample):
     '''Get the max length for the item in column `c_index` in the first
@@ -246,7 +306,8 @@ def auto_detect_column_length(c_index, sample):
     '''
     if len(sample) == 0:
         return max_allowed_col_length
-    column = [str(r[c_index]) for r in sample]
+    column = [str(r.display_value(c_index) if isinstance(r, RawRow) else r[c_index])
+            for r in sample]
     item = max(column, key=len)
     return len(item)
 
@@ -0,0 +1,270 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+import os
+import mmap
+import pickle
+import struct
+import tempfile
+import threading
+from collections.abc import Sequence
+
+from .. import constants
+from .raw_row import RawRow
+from .result_store import ResultStore
+from .page_cache import estimate_size
+
+# Value tags of the row format
+_NULL = 0
+_INT = 1
+_FLOAT = 2
+_STR = 3
+_BYTES = 4
+_BYTEARRAY = 5
+_PICKLE = 6
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+_count = struct.Struct('<H')
+_int = struct.Struct('<q')
+_float = struct.Struct('<d')
+_length = struct.Struct('<I')
+_offset = struct.Struct('<Q')
+
+def encode_row(row):
+    '''Encode a row as: number of values (uint16) followed by each value's
+    tag (1 byte) and payload. Numbers are stored in 8 bytes, strings and
+    bytes are prefixed with their length (uint32), other types are
+    pickled'''
+    parts = [_count.pack(len(row))]
+    for value in row:
+        value_type = type(value)
+        if value is None:
+            parts.append(b'\x00')
+        elif value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+            parts.append(b'\x01')
+            parts.append(_int.pack(value))
+        elif value_type is float:
+            parts.append(b'\x02')
+            parts.append(_float.pack(value))
+        elif value_type in (str, bytes, bytearray):
+            if value_type is str:
+                tag = b'\x03'
+                value = value.encode('utf-8', 'surrogatepass')
+            else:
+                tag = b'\x04' if value_type is bytes else b'\x05'
+            parts.append(tag)
+            parts.append(_length.pack(len(value)))
+            parts.append(value)
+        else:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            parts.append(b'\x06')
+            parts.append(_length.pack(len(value)))
+            parts.append(value)
+    return b''.join(parts)
+
+def decode_row(buffer, offset):
+    '''Decode the row encoded by `encode_row` at `offset`'''
+    count, = _count.unpack_from(buffer, offset)
+    offset += _count.size
+    row = []
+    for i in range(count):
+        tag = buffer[offset]
+        offset += 1
+        if tag == _NULL:
+            row.append(None)
+        elif tag == _INT:
+            row.append(_int.unpack_from(buffer, offset)[0])
+            offset += _int.size
+        elif tag == _FLOAT:
+            row.append(_float.unpack_from(buffer, offset)[0])
+            offset += _float.size
+        else:
+            length, = _length.unpack_from(buffer, offset)
+            offset += _length.size
+            value = buffer[offset:offset + length]
+            offset += length
+            if tag == _STR:
+                value = value.decode('utf-8', 'surrogatepass')
+            elif tag == _BYTES:
+                value = bytes(value)
+            elif tag == _BYTEARRAY:
+                value = bytearray(value)
+            else:
+                value = pickle.loads(value)
+            row.append(value)
+    return tuple(row)
+
+class SpillStore(Sequence):
+    """
+    Result store which keeps the rows in memory, in a ResultStore, until
+    they take more than `memory_limit` bytes. Past that the rows are moved to
+    a file in the cache directory and read back through mmap when accessed,
+    so browsing a huge result doesn't grow the memory use.
+
+    The rows file holds the encoded rows back to back, the index file holds
+    the offset of each row in the rows file. Both files are removed by
+    close(), or right after being created where the OS allows removing
+    open files.
+    """
+    MEMORY_LIMIT = 256 * 1024 * 1024
+    PATH = os.path.join(constants.DEFAULT_CACHE_PATH, 'results')
+
+    def __init__(self, rows=(), memory_limit=None, path=None):
+        self.memory_limit = memory_limit or self.MEMORY_LIMIT
+        self.path = path or self.PATH
+        self._memory = ResultStore()
+        self._memory_size = 0
+        self._length = 0
+        # Set if the rows are RawRow objects
+        self._decoder = None
+        # [file, path, mmap, size] of the rows and of the index once spilled
+        self._data = None
+        self._index = None
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.extend(rows)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def spilled(self):
+        '''True if the rows were moved to disk'''
+        return self._data is not None
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        with self._lock:
+            if index < 0:
+                index += self._length
+            if index < 0 or index >= self._length:
+                raise IndexError('spill store index out of range')
+
+            if not self.spilled:
+                return self._memory[index]
+            row = self._read(index)
+
+        if self._decoder is not None:
+            return RawRow(row, self._decoder)
+        return row
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+    def append(self, row):
+        self.extend([row])
+
+    def extend(self, rows):
+        if not isinstance(rows, list):
+            rows = list(rows)
+
+        with self._lock:
+            if not self.spilled:
+                self._memory.extend(rows)
+                self._decoder = self._memory._decoder
+                self._length = len(self._memory)
+                self._memory_size += estimate_size(rows)
+                if self._memory_size > self.memory_limit:
+                    self._spill()
+                return
+
+            for row in rows:
+                self._write(row)
+            self._length += len(rows)
+
+    def clear(self):
+        self.close()
+        self._memory = ResultStore()
+        self._memory_size = 0
+        self._length = 0
+        self._decoder = None
+
+    def close(self):
+        '''Drop the rows and remove the files'''
+        with self._lock:
+            for spill_file in (self._data, self._index):
+                if spill_file is None:
+                    continue
+
+                file_, path, map_, size = spill_file
+                if map_ is not None:
+                    map_.close()
+                file_.close()
+                if path is not None:
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+            self._data = None
+            self._index = None
+            self._memory = ResultStore()
+            self._length = 0
+
+    def _spill(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._data = self._create_file('rows-')
+        self._index = self._create_file('index-')
+
+        memory = self._memory
+        self._memory = None
+        self._memory_size = 0
+        for row in memory:
+            self._write(row)
+
+    def _create_file(self, prefix):
+        fd, path = tempfile.mkstemp(prefix=prefix, dir=self.path)
+        file_ = os.fdopen(fd, 'w+b')
+        try:
+            # The file goes away with the process, even if it crashes
+            os.unlink(path)
+            path = None
+        except OSError:
+            pass
+        return [file_, path, None, 0]
+
+    def _write(self, row):
+        if isinstance(row, RawRow):
+            self._decoder = row.decoder
+            row = row.raw
+
+        offset = self._data[3]
+        encoded = encode_row(row)
+        self._data[0].write(encoded)
+        self._data[3] += len(encoded)
+
+        self._index[0].write(_offset.pack(offset))
+        self._index[3] += _offset.size
+        self._dirty = True
+
+    def _read(self, index):
+        if self._dirty:
+            self._data[0].flush()
+            self._index[0].flush()
+            self._dirty = False
+
+        index_map = self._map(self._index)
+        offset, = _offset.unpack_from(index_map, index * _offset.size)
+        return decode_row(self._map(self._data), offset)
+
+    def _map(self, spill_file):
+        '''Return the mmap of the file, remapped if the file grew since it
+        was mapped'''
+        file_, path, map_, size = spill_file
+        if map_ is None or len(map_) < size:
+            if map_ is not None:
+                map_.close()
+            map_ = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+            spill_file[2] = map_
+        return map_
@@ -118,11 +118,11 @@ class NodeMixin:
         self.children.append(child)
 
     def get_last_child(self):
-        if not self.has_children():
-            return self
+        node = self
+        while node.has_children():
+            node = node.children[-1]
 
-        child = self.children[-1]
-        return child.get_last_child()
+        return node
 
     def get_first_child(self, type):
         if not self.has_children():
@@ -133,16 +133,12 @@ class NodeMixin:
                 return child
 
     def get_child(self, type):
-        if not self.has_children():
-            return
-
-        for child in self.children:
+        stack = list(reversed(self.children))
+        while stack:
+            child = stack.pop()
             if child.type == type:
                 return child
-            child_ = child.get_child(type)
-            if child_ is None:
-                continue
-            return child_
+            stack.extend(reversed(child.children))
 
     def has_children(self):
         return len(self.children) > 0
@@ -2,20 +2,156 @@
 # Author: Vlad Balmos <vladbalmos@yahoo.com>
 # See LICENSE file
 
-import string
+import re
 from . import tokens as Token
 from . import keywords
 
+_whitespace = re.compile(r'\s+')
+_unquoted_identifier = re.compile(r'[\w$]+')
+_binary_number_ob = re.compile(r'0b[01]+(?![\w$])')
+_hex_number_ox = re.compile(r'0x[0-9a-fA-F]+(?![\w$])')
+_binary_number_b_quote = re.compile(r"[bB]'[01]+'")
+_hex_number_x_quote = re.compile(r"[xX]'[0-9a-fA-F]+'")
+_quoted_identifier = re.compile(r'`[^`]*`?')
+_dash_style_comment = re.compile(r'--(?:\n|[^\S\n][^\n]*\n?)')
+_hash_style_comment = re.compile(r'#[^\n]*\n?')
+
+# Inside a string a quote is escaped by a backslash or by another quote
+_strings = {
+    "'": re.compile(r"'((?:\\'|''|[^'])*)('?)"),
+    '"': re.compile(r'"((?:\\"|""|[^"])*)("?)')
+}
+_string_parts = {
+    "'": re.compile(r"\\'|''|[^']"),
+    '"': re.compile(r'\\"|""|[^"]')
+}
+
+# The kind of the ascii chars, the tokens they can start
+_WHITESPACE = 1
+_DIGIT = 2
+_WORD = 3
+_DOT = 4
+_X = 5
+_B = 6
+_OPERATOR = 7
+_STRING = 8
+_QUOTED_IDENTIFIER = 9
+_VARIABLE = 10
+_HASH = 11
+_PARAM_MARKER = 12
+_PUNCTUATION = 13
+
+_operator_chars = '&>=<!%*+-/:^|~'
+_punctuation = {
+    ',': Token.Comma,
+    ';': Token.Semicolon,
+    '(': Token.Paren,
+    ')': Token.Paren
+}
+
+_char_kinds = {}
+for _code in range(128):
+    _char = chr(_code)
+    if _char.isspace():
+        _char_kinds[_char] = _WHITESPACE
+    elif _char.isdigit():
+        _char_kinds[_char] = _DIGIT
+    elif _char in 'xX':
+        _char_kinds[_char] = _X
+    elif _char in 'bB':
+        _char_kinds[_char] = _B
+    elif _char.isalnum() or _char in '_$':
+        _char_kinds[_char] = _WORD
+    elif _char == '.':
+        _char_kinds[_char] = _DOT
+    elif _char in _operator_chars:
+        _char_kinds[_char] = _OPERATOR
+    elif _char in '\'"':
+        _char_kinds[_char] = _STRING
+    elif _char == '`':
+        _char_kinds[_char] = _QUOTED_IDENTIFIER
+    elif _char == '@':
+        _char_kinds[_char] = _VARIABLE
+    elif _char == '#':
+        _char_kinds[_char] = _HASH
+    elif _char == '?':
+        _char_kinds[_char] = _PARAM_MARKER
+    elif _char in _punctuation:
+        _char_kinds[_char] = _PUNCTUATION
+
+# The tokens most of the text is made of, matched in one go. Whatever they
+# don't match exactly as the char by char parsers would (e.g. 1e5e3, strings
+# with doubled quotes or the tokens starting with non ascii chars) is left to
+# the parsers picked by the kind of the first char
+_identifier = object()
+_token_types = (
+    (Token.Whitespace, r'\s+'),
+    (_identifier, r"(?![xXbB]')[A-Za-z_$][\w$]*"),
+    (Token.Comma, r','),
+    (Token.Paren, r'[()]'),
+    (Token.Dot, r'\.(?=[A-Za-z_$])|\.(?![\w$.])'),
+    (Token.Number.Dec, r'(?:\d+(?:\.\d+(?:[eE]-?\d+)?|\.|[eE]-?\d+)?|'
+        r'\.\d+(?:[eE]-?\d+)?)(?![\w$.])'),
+    (Token.String, r"'(?:\\'|\\(?!')|[^'\\])*'(?!')"),
+    (Token.Operator.Symbol, '(?:{0}|{1})(?!{0})'.format(
+        '[' + re.escape(_operator_chars) + ']',
+        '|'.join(re.escape(operator) for operator in keywords.symbol_operators
+            if len(operator) == 2))),
+    (Token.Semicolon, r';'),
+    (Token.Name, r'`[^`]*`?'),
+    (Token.String, r'"(?:\\"|\\(?!")|[^"\\])*"(?!")'),
+    (Token.Comment, r'/\*(?:/|[\s\S]*?\*/|[\s\S]*)'),
+    (Token.Comment, r'--(?:\n|[^\S\n][^\n]*\n?)'),
+    (Token.Comment, r'#[^\n]*\n?'),
+    (Token.Number.Hex, r"[xX]'[0-9a-fA-F]+'"),
+    (Token.Number.Bit, r"[bB]'[01]+'"),
+    (Token.Number.Hex, r'0x[0-9a-fA-F]+(?![\w$])'),
+    (Token.Number.Bit, r'0b[01]+(?![\w$])'),
+    (Token.ParamMarker, r'\?'),
+)
+_tokens = re.compile('|'.join('(' + pattern + ')'
+    for _, pattern in _token_types))
+_token_types = tuple(ttype for ttype, _ in _token_types)
+
+def _char_kind(char):
+    '''The kind of a non ascii char'''
+    if char.isspace():
+        return _WHITESPACE
+    if char.isdigit():
+        return _DIGIT
+    if char.isalnum():
+        return _WORD
+    return None
+
+_dec_digits = {}
+
+def _dec_digits_pattern(sql):
+    '''Pattern matching the dots and the digits of a decimal number.
+    Besides the decimal digits matched by \\d, str.isdigit() is true for a
+    few more chars (e.g. superscripts), which are added if `sql` has them'''
+    extra = ''
+    if not sql.isascii():
+        extra = ''.join(sorted(char for char in set(sql) if char.isdigit()
+            and not char.isdecimal()))
+
+    pattern = _dec_digits.get(extra)
+    if pattern is None:
+        pattern = re.compile('[.\\d' + re.escape(extra) + ']*')
+        _dec_digits[extra] = pattern
+    return pattern
+
 class Lexer():
     '''
     SQL String tokenizer.
-    Parses a string one char at a time
+    The common tokens are matched by a single regular expression, the rest
+    by the parser picked by the kind of their first char
     '''
 
     def __init__(self, sql):
         self.raw_str = sql
         self.pos = 0
         self.tokens = []
+        self._dec_digits = _dec_digits_pattern(sql).match
 
     def _next_char(self, increment = 1):
         try:
@@ -29,429 +165,120 @@ class Lexer():
     def _looks_like_keyword(self, char):
         return char.isalnum() or char == '_' or char == '$'
 
-    def either(self, *parsers):
-        def either_parser():
-            for parser in parsers:
-                result = parser()
-                if result is not False:
-                    return result
+    def _match(self, pattern, ttype):
+        m = pattern.match(self.raw_str, self.pos)
+        if not m:
             return False
 
-        return either_parser
+        self.pos = m.end()
+        return (ttype, m.group(), m.start())
 
     def parse_dot(self):
-        try:
-            char = self.raw_str[self.pos]
-        except IndexError:
-            return False
-
-        if char == '.':
-            self.pos += 1
-            return self._make_token(Token.Dot, char)
-
-        return False
-
-    def parse_paren(self):
-        try:
-            char = self.raw_str[self.pos]
-        except IndexError:
-            return False
-
-        if char == '(' or char == ')':
+        if self.raw_str.startswith('.', self.pos):
             self.pos += 1
-            return self._make_token(Token.Paren, char)
-
-        return False
-
-    def parse_semicolon(self):
-        try:
-            char = self.raw_str[self.pos]
-        except IndexError:
-            return False
-
-        if char == ';':
-            self.pos += 1
-            return self._make_token(Token.Semicolon, char)
-
-        return False
-
-    def parse_comma(self):
-        try:
-            char = self.raw_str[self.pos]
-        except IndexError:
-            return False
-
-        if char == ',':
-            self.pos += 1
-            return self._make_token(Token.Comma, char)
+            return self._make_token(Token.Dot, '.')
 
         return False
 
     def parse_whitespace(self):
-        space = ''
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if char.isspace():
-                space += char
-                self.pos += 1
-                continue
-
-            break
-
-        if not len(space):
-            return False
-
-        return self._make_token(Token.Whitespace, space)
+        return self._match(_whitespace, Token.Whitespace)
 
     def parse_unquoted_identifier(self):
-        identifier = ''
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if self._looks_like_keyword(char):
-                identifier += char
-                self.pos += 1
-                continue
-
-            break
-
-        if not len(identifier):
+        m = _unquoted_identifier.match(self.raw_str, self.pos)
+        if not m:
             return False
 
-        token = keywords.classify(identifier)
-
-        return self._make_token(token, identifier)
+        identifier = m.group()
+        self.pos = m.end()
+        return (keywords.classify(identifier), identifier, m.start())
 
     def parse_dec_number(self):
         '''
         Returns False if scientific notation is invalid (missing exponent: 10e)
         '''
-        number = ''
+        sql = self.raw_str
+        start = pos = self.pos
         while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
+            pos = self._dec_digits(sql, pos).end()
+            char = sql[pos:pos + 1]
 
-            if char == '.' or char.isdigit():
-                number += char
-                self.pos += 1
+            if char == '-' and pos > start and sql[pos - 1] in 'eE':
+                pos += 1
                 continue
 
-            if number[-1].lower() == 'e' and char == '-':
-                number += char
-                self.pos += 1
-                continue
-
-            if char.lower() == 'e':
-                if not len(number):
-                    break
-
-                if 'e' in number:
-                    break
-
-                if not number[-1].isdigit():
+            if char == 'e' or char == 'E':
+                number = sql[start:pos]
+                if not number or 'e' in number or not number[-1].isdigit():
                     break
 
-                next_char = self._next_char()
+                next_char = sql[pos + 1:pos + 2]
                 if not next_char or (next_char.isdigit() is False and next_char != '-'):
-                    decrement_pos = len(number)
                     if number[0] == '.':
-                        decrement_pos -= 1
-                    self.pos -= decrement_pos
+                        self.pos = start + 1
                     return False
 
-                number += char
-                self.pos += 1
+                pos += 1
                 continue
 
-            if self._looks_like_keyword(char):
-                self.pos -= len(number)
+            if char and self._looks_like_keyword(char):
                 return False
 
             break
 
-        if not len(number):
-            return False
-
-        if number[-1].lower() == 'e':
-            self.pos -= len(number)
-            return False
-
-        if number == '.':
-            self.pos -= 1
+        number = sql[start:pos]
+        if not number or number[-1] in 'eE' or number == '.':
             return False
 
-        return self._make_token(Token.Number.Dec, number)
+        self.pos = pos
+        return (Token.Number.Dec, number, start)
 
     def parse_binary_number_ob(self):
         '''
         Parse binary numbers having the format 0b000
         '''
-        number = ''
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(number):
-                if char == '0':
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if len(number) == 1:
-                if char == 'b':
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if char == '0' or char == '1':
-                number += char
-                self.pos += 1
-                continue
-
-            if self._looks_like_keyword(char):
-                self.pos -= len(number)
-                return False
-            break
-
-
-        if len(number) < 3:
-            self.pos -= len(number)
-            return False
-
-        return self._make_token(Token.Number.Bit, number)
+        return self._match(_binary_number_ob, Token.Number.Bit)
 
     def parse_hex_number_ox(self):
         '''
         Parse hex numbers having the format 0xfff
         '''
-        number = ''
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(number):
-                if char == '0':
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if len(number) == 1:
-                if char == 'x':
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if char in string.hexdigits:
-                number += char
-                self.pos += 1
-                continue
-
-            if self._looks_like_keyword(char):
-                self.pos -= len(number)
-                return False
-
-            break
-
-        if len(number) < 3:
-            self.pos -= len(number)
-            return False
-
-        return self._make_token(Token.Number.Hex, number)
+        return self._match(_hex_number_ox, Token.Number.Hex)
 
     def parse_binary_number_b_quote(self):
         '''
         Parse binary number having the format b'010'
         '''
-        number = ''
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(number):
-                if char.lower() == 'b':
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if len(number) == 1:
-                if char == "'":
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if char == '0' or char == '1':
-                number += char
-                self.pos += 1
-                continue
-
-            if char == "'":
-                number += char
-                self.pos += 1
-                break
-
-            if self._looks_like_keyword(char):
-                self.pos -= len(number)
-                return False
-
-            break
-
-        if len(number) < 3:
-            self.pos -= len(number)
-            return False
-
-        if number[-1] != "'":
-            self.pos -= len(number)
-            return False
-
-        if len(number) == 3 and number.lower() == "b''":
-            self.pos -= len(number)
-            return False
-
-        return self._make_token(Token.Number.Bit, number)
+        return self._match(_binary_number_b_quote, Token.Number.Bit)
 
     def parse_hex_number_x_quote(self):
         '''
         Parse hex number having the format x'fff'
         '''
-        number = ''
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(number):
-                if char.lower() == 'x':
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if len(number) == 1:
-                if char == "'":
-                    number += char
-                    self.pos += 1
-                    continue
-                break
-
-            if char in string.hexdigits:
-                number += char
-                self.pos += 1
-                continue
-
-            if char == "'":
-                number += char
-                self.pos += 1
-                break
-
-            if self._looks_like_keyword(char):
-                self.pos -= len(number)
-                return False
-
-            break
-
-        if len(number) < 3:
-            self.pos -= len(number)
-            return False
-
-        if number[-1] != "'":
-            self.pos -= len(number)
-            return False
-
-        if len(number) == 3 and number.lower() == "x''":
-            self.pos -= len(number)
-            return False
-
-        return self._make_token(Token.Number.Hex, number)
+        return self._match(_hex_number_x_quote, Token.Number.Hex)
 
     def parse_string(self):
-        string_ = ''
-        match_quote = None
-
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if (char == '"' or char == "'") and not match_quote:
-                match_quote = char
-                string_ += char
-                self.pos += 1
-                continue
-
-            if char == '\\' and self._next_char() == match_quote:
-                string_ += char + self._next_char()
-                self.pos += 2
-                continue
-
-            if char == match_quote:
-                if self._next_char() == match_quote:
-                    # Quote is escaped
-                    string_ += char
-                    self.pos += 2
-                    continue
-                string_ += char
-                self.pos += 1
-                break
+        try:
+            quote = self.raw_str[self.pos]
+            pattern = _strings[quote]
+        except (IndexError, KeyError):
+            return False
 
-            string_ += char
-            self.pos += 1
+        m = pattern.match(self.raw_str, self.pos)
+        self.pos = m.end()
+        string_ = m.group()
 
-        if not len(string_):
-            return False
+        double_quote = quote + quote
+        if double_quote in string_:
+            # Quote is escaped by another quote, only one of them is kept
+            body, closing_quote = m.group(1, 2)
+            parts = _string_parts[quote].findall(body)
+            string_ = quote + ''.join(quote if part == double_quote else part
+                    for part in parts) + closing_quote
 
         return self._make_token(Token.String, string_)
 
     def parse_quoted_identifier(self):
-        string_ = ''
-        match_quote = None
-
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if char == '`' and not match_quote:
-                match_quote = char
-                string_ += char
-                self.pos += 1
-                continue
-
-            if char == match_quote:
-                string_ += char
-                self.pos += 1
-                break
-
-            string_ += char
-            self.pos += 1
-
-        if not len(string_):
-            return False
-
-        return self._make_token(Token.Name, string_)
+        return self._match(_quoted_identifier, Token.Name)
 
     def parse_operator(self, base = ''):
         operator = base
@@ -538,256 +365,126 @@ class Lexer():
         return self._make_token(Token.Variable, var)
 
     def parse_c_style_comment(self):
-        comment = ''
-
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(comment):
-                if char == '/':
-                    comment += char
-                    self.pos += 1
-                    continue
-                break
-
-            if len(comment) == 1:
-                if char == '*':
-                    comment += char
-                    self.pos += 1
-                    continue
-                break
-
-            if char == '/' and comment[-1] == '*':
-                comment += char
-                self.pos += 1
-                break
-
-            comment += char
-            self.pos += 1
-
-
-        if len(comment) < 2:
-            self.pos -= len(comment)
+        if not self.raw_str.startswith('/*', self.pos):
             return False
 
-        return self._make_token(Token.Comment, comment)
-
-    def parse_dash_style_comment(self):
-        comment = ''
-
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(comment):
-                if char == '-':
-                    comment += char
-                    self.pos += 1
-                    continue
-                break
+        start = self.pos
+        end = self.raw_str.find('*/', start + 1)
+        if end == -1:
+            self.pos = len(self.raw_str)
+        else:
+            self.pos = end + 2
 
-            if len(comment) == 1:
-                if char == '-':
-                    comment += char
-                    self.pos += 1
-                    continue
-                break
-
-            if len(comment) == 2 and not char.isspace():
-                break
+        return (Token.Comment, self.raw_str[start:self.pos], start)
 
-            if char == '\n':
-                comment += char
-                self.pos += 1
-                break
-
-            comment += char
-            self.pos += 1
-
-        if len(comment) < 3:
-            self.pos -= len(comment)
-            return False
-
-        return self._make_token(Token.Comment, comment)
+    def parse_dash_style_comment(self):
+        return self._match(_dash_style_comment, Token.Comment)
 
     def parse_hash_style_comment(self):
-        comment = ''
-
-        while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                break
-
-            if not len(comment):
-                if char == '#':
-                    comment += char
-                    self.pos += 1
-                    continue
-                break
-
-            if char == '\n':
-                comment += char
-                self.pos += 1
-                break
-
-            comment += char
-            self.pos += 1
-
-        if not len(comment):
-            return False
-
-        return self._make_token(Token.Comment, comment)
-
+        return self._match(_hash_style_comment, Token.Comment)
 
     def tokenize(self):
-        if not len(self.raw_str):
-            return
+        sql = self.raw_str
+        length = len(sql)
+
+        match = _tokens.match
+        token_types = _token_types
+        keyword_type = keywords.token_types.get
+        other = Token.Other
 
         while True:
-            try:
-                char = self.raw_str[self.pos]
-            except IndexError:
-                # return self.tokens
+            pos = self.pos
+            m = match(sql, pos)
+            while m:
+                ttype = token_types[m.lastindex - 1]
+                value = m.group()
+                if ttype is _identifier:
+                    ttype = keyword_type(value.lower(), other)
+                yield (ttype, value, pos)
+                pos = m.end()
+                m = match(sql, pos)
+
+            self.pos = pos
+            if pos >= length:
                 return
 
-            ##########
-            # Literals
-            ##########
+            char = sql[pos]
+            kind = _char_kinds.get(char)
+            if kind is None and not char.isascii():
+                kind = _char_kind(char)
 
-            # parse white space
-            if char.isspace():
+            if kind == _WHITESPACE:
                 result = self.parse_whitespace()
-                if result:
-                    yield result
-                    continue
-
-            if char == ',':
-                result = self.parse_comma()
-                if result:
-                    yield result
-                    continue
-
-            if char == '(' or char == ')':
-                result = self.parse_paren()
-                if result:
-                    yield result
-                    continue
-
-            if char == ';':
-                result = self.parse_semicolon()
-                if result:
-                    yield result
-                    continue
+
+            elif kind == _WORD:
+                result = self.parse_unquoted_identifier()
+
+            elif kind == _PUNCTUATION:
+                self.pos += 1
+                result = (_punctuation[char], char, self.pos - 1)
 
             # parse dec, binary (0b01) and hex (0x1AF) numbers
-            if char.isdigit():
+            elif kind == _DIGIT:
+                result = False
                 if char == '0':
-                    if self._next_char() == 'x':
-                        parser = self.parse_hex_number_ox
-                    elif self._next_char().lower() == 'b':
-                        parser = self.parse_binary_number_ob
+                    next_char = self._next_char()
+                    if next_char == 'x':
+                        result = self.parse_hex_number_ox()
+                    elif next_char == 'b' or next_char == 'B':
+                        result = self.parse_binary_number_ob()
                     else:
-                        parser = self.parse_dec_number
+                        result = self.parse_dec_number()
                 else:
-                    parser = self.parse_dec_number
-
-                parser = self.either(parser,
-                                     self.either(self.parse_dot, self.parse_unquoted_identifier))
-                result = parser()
-                if result:
-                    yield result
-                    continue
-
-            # parse hexadecimal X'01af' numbers
-            if char.lower() == 'x' and self._next_char() == "'":
-                parser = self.either(self.parse_hex_number_x_quote, self.parse_unquoted_identifier)
-                result = parser()
-                if result:
-                    yield result
-                    continue
-
-            # parse binary b'01' numbers
-            if char.lower() == 'b' and self._next_char() == "'":
-                parser = self.either(self.parse_binary_number_b_quote, self.parse_unquoted_identifier)
-                result = parser()
-                if result:
-                    yield result
-                    continue
+                    result = self.parse_dec_number()
+
+                result = (result or self.parse_dot() or
+                        self.parse_unquoted_identifier())
+
+            # parse hexadecimal X'01af' and binary b'01' numbers
+            elif kind == _X or kind == _B:
+                result = False
+                if self._next_char() == "'":
+                    if kind == _X:
+                        result = self.parse_hex_number_x_quote()
+                    else:
+                        result = self.parse_binary_number_b_quote()
+                result = result or self.parse_unquoted_identifier()
 
             # parse floating numbers starting with dot (.) or a single dot
-            if char == '.':
-                parser = self.either(self.parse_dec_number, self.parse_dot)
-                result = parser()
-                if result:
-                    yield result
-                    continue
-
-            # parse /* c style comments */
-            if char == '/' and self._next_char() == '*':
-                result = self.parse_c_style_comment()
-                if result:
-                    yield result
-                    continue
-
-            # parse -- comments
-            if char == '-' and self._next_char() == '-':
-                parser = self.either(self.parse_dash_style_comment, self.parse_operator)
-                result = parser()
-                if result:
-                    yield result
-                    continue
-
-            # parse operators
-            if char in '&>=<!%*+-/:^|~':
-                result = self.parse_operator()
-                if result:
-                    yield result
-                    continue
-
-            # parse strings
-            if char == '"' or char == "'":
+            elif kind == _DOT:
+                result = self.parse_dec_number() or self.parse_dot()
+
+            elif kind == _OPERATOR:
+                result = False
+                next_char = self._next_char()
+                if char == '/' and next_char == '*':
+                    result = self.parse_c_style_comment()
+                elif char == '-' and next_char == '-':
+                    result = self.parse_dash_style_comment()
+                result = result or self.parse_operator()
+
+            elif kind == _STRING:
                 result = self.parse_string()
-                if result:
-                    yield result
-                    continue
 
-            # parse quoted identifier
-            if char == '`':
+            elif kind == _QUOTED_IDENTIFIER:
                 result = self.parse_quoted_identifier()
-                if result:
-                    yield result
-                    continue
 
-            # parse variables
-            if char == '@':
+            elif kind == _VARIABLE:
                 result = self.parse_variable()
-                if result:
-                    yield result
-                    continue
 
-            # parse #hash style comment
-            if char == '#':
+            elif kind == _HASH:
                 result = self.parse_hash_style_comment()
-                if result:
-                    yield result
-                    continue
-
-            # parse unquoted identifier
-            if self._looks_like_keyword(char):
-                result = self.parse_unquoted_identifier()
-                if result:
-                    yield result
-                    continue
 
-            if char == '?':
+            elif kind == _PARAM_MARKER:
                 self.pos += 1
-                yield self._make_token(Token.ParamMarker, char)
+                result = self._make_token(Token.ParamMarker, char)
+
+            else:
+                result = False
+
+            if result:
+                yield result
+                continue
 
             # we shouldn't be here, the syntax is wrong so we skip this character
             self.pos += 1
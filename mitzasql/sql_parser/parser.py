@@ -5,6 +5,7 @@
 from .lexer import Lexer
 from .state import State
 from . import parser_factory
+from . import tokens as Token
 from mitzasql.utils import dfs
 
 last_parsed_node = None
@@ -30,3 +31,23 @@ def parse(raw_sql):
 def get_last_parsed_node():
     return last_parsed_node
 
+
+def split_statements(raw_sql):
+    '''Split the SQL into the text of each statement. A statement ends
+    after its semicolon and the whitespace and comments which follow it, so
+    the last statement is the one the end of the SQL belongs to'''
+    statements = []
+    start = 0
+    after_semicolon = False
+    for ttype, value, pos in Lexer(raw_sql).tokenize():
+        if ttype == Token.Whitespace or ttype == Token.Comment:
+            continue
+
+        if after_semicolon:
+            statements.append(raw_sql[start:pos])
+            start = pos
+        after_semicolon = ttype == Token.Semicolon
+
+    if start < len(raw_sql) or not statements:
+        statements.append(raw_sql[start:])
+    return statements
@@ -253,6 +253,8 @@ class ExpressionParser(Parser):
 
         while self.state and not self.state.is_closed_paren():
             self.state.next()
+            if self.state.is_closed_paren():
+                break
             argument = self.parse_expr()
             expr.add_child(argument)
 
@@ -266,6 +268,10 @@ class ExpressionParser(Parser):
         if not self.state or self.state.is_comma():
             return
 
+        # The literals of value lists, none of the checks below match them
+        if self.state.is_literal():
+            return self.accept(ast.Expression, self.state.value, 'literal')
+
         tvalue = self.state.lcase_value
 
         if self.state.is_reserved():
@@ -335,61 +341,85 @@ class ExpressionParser(Parser):
         return self.accept(ast.Expression, self.state.value, 'unknown')
 
     def parse_simple_expr(self):
-        expr = None
+        # The operators of simple_expr || simple_expr || ... waiting for
+        # their right operand
+        operators = []
 
-        while expr is None and self.state:
-            expr = self.parse_simple_expr_term()
-            if expr is None:
-                self.state.next()
+        while True:
+            expr = None
 
-        if expr is None:
-            return expr
+            while expr is None and self.state:
+                expr = self.parse_simple_expr_term()
+                if expr is None:
+                    self.state.next()
 
-        tvalue = self.state.lcase_value
+            if expr is None:
+                break
 
-        if self.state.is_operator('||'):
-            op = self.accept(ast.Op, tvalue)
-            op.add_child(expr)
-            op.add_child(self.parse_simple_expr())
-            return op
+            tvalue = self.state.lcase_value
 
-        if self.state.is_reserved():
-            if tvalue == 'collate':
+            if self.state.is_operator('||'):
                 op = self.accept(ast.Op, tvalue)
                 op.add_child(expr)
-                if not (self.state.is_other() or self.state.is_literal()):
-                    return op
-                op.add_child(self.accept(ast.Expression, self.state.value, 'collation'))
-                return op
+                operators.append(op)
+                continue
+
+            if self.state.is_reserved():
+                if tvalue == 'collate':
+                    op = self.accept(ast.Op, tvalue)
+                    op.add_child(expr)
+                    expr = op
+                    if self.state.is_other() or self.state.is_literal():
+                        op.add_child(self.accept(ast.Expression, self.state.value, 'collation'))
+
+            break
+
+        while operators:
+            op = operators.pop()
+            op.add_child(expr)
+            expr = op
 
         return expr
 
     def parse_bit_expr(self, prev_operator=None):
-        lexpr = self.parse_simple_expr()
-        if not self.state.is_bit_expr_operator():
-            if prev_operator:
-                prev_operator.add_child(lexpr)
-                return prev_operator
-            return lexpr
+        # Operators which bind weaker than the one after them, waiting for
+        # the expression on their right
+        operators = []
+
+        while True:
+            lexpr = self.parse_simple_expr()
+            if not self.state.is_bit_expr_operator():
+                if prev_operator:
+                    prev_operator.add_child(lexpr)
+                    expr = prev_operator
+                else:
+                    expr = lexpr
+                break
 
-        if lexpr is None:
-            return
+            if lexpr is None:
+                expr = None
+                break
 
-        tvalue = self.state.lcase_value
-        operator = self.accept(ast.Op, tvalue)
+            tvalue = self.state.lcase_value
+            operator = self.accept(ast.Op, tvalue)
+
+            if not prev_operator:
+                operator.add_child(lexpr)
+            elif prev_operator.has_precedance(operator):
+                prev_operator.add_child(lexpr)
+                operator.add_child(prev_operator)
+            else:
+                operator.add_child(lexpr)
+                operators.append(prev_operator)
 
-        if not prev_operator:
-            operator.add_child(lexpr)
-            return self.parse_bit_expr(operator)
+            prev_operator = operator
 
-        if prev_operator.has_precedance(operator):
-            prev_operator.add_child(lexpr)
-            operator.add_child(prev_operator)
-            return self.parse_bit_expr(operator)
+        while operators:
+            operator = operators.pop()
+            operator.add_child(expr)
+            expr = operator
 
-        operator.add_child(lexpr)
-        prev_operator.add_child(self.parse_bit_expr(operator))
-        return prev_operator
+        return expr
 
     def parse_predicate(self):
         lexpr = self.parse_bit_expr()
@@ -477,9 +507,15 @@ class ExpressionParser(Parser):
         if lexpr is None:
             lexpr = self.parse_predicate()
 
-        if not self.state.is_bool_primary_operator() or lexpr is None:
-            return lexpr
+        if lexpr is None:
+            return
 
+        while self.state.is_bool_primary_operator():
+            lexpr = self.parse_bool_primary_operator(lexpr)
+
+        return lexpr
+
+    def parse_bool_primary_operator(self, lexpr):
         tvalue = self.state.lcase_value
 
         operator = self.accept(ast.Op, tvalue)
@@ -508,9 +544,6 @@ class ExpressionParser(Parser):
 
             operator.add_child(predicate)
 
-        if self.state.is_bool_primary_operator():
-            return self.parse_boolean_primary(operator)
-
         return operator
 
     def parse_expr_term(self, lexpr=None):
@@ -545,32 +578,45 @@ class ExpressionParser(Parser):
         return operator
 
     def parse_expr(self, prev_operator=None):
-        lexpr = self.parse_expr_term()
-        if not self.state.is_expression_operator() or self.state.is_operator('not') or self.state.is_operator('!'):
-            if prev_operator:
+        # Operators which bind weaker than the one after them, waiting for
+        # the expression on their right
+        operators = []
+
+        while True:
+            lexpr = self.parse_expr_term()
+            if not self.state.is_expression_operator() or self.state.is_operator('not') or self.state.is_operator('!'):
+                if prev_operator:
+                    prev_operator.add_child(lexpr)
+                    expr = prev_operator
+                else:
+                    expr = lexpr
+                break
+
+            tvalue = self.state.lcase_value
+
+            operator = self.accept(ast.Op, self.state.lcase_value)
+
+            if tvalue == 'is':
+                expr = self.parse_expr_term(lexpr)
+                break
+
+            if not prev_operator:
+                operator.add_child(lexpr)
+            elif prev_operator.has_precedance(operator):
                 prev_operator.add_child(lexpr)
-                return prev_operator
-            return lexpr
-
-        tvalue = self.state.lcase_value
+                operator.add_child(prev_operator)
+            else:
+                operator.add_child(lexpr)
+                operators.append(prev_operator)
 
-        operator = self.accept(ast.Op, self.state.lcase_value)
+            prev_operator = operator
 
-        if tvalue == 'is':
-            return self.parse_expr_term(lexpr)
-
-        if not prev_operator:
-            operator.add_child(lexpr)
-            return self.parse_expr(operator)
-
-        if prev_operator.has_precedance(operator):
-            prev_operator.add_child(lexpr)
-            operator.add_child(prev_operator)
-            return self.parse_expr(operator)
+        while operators:
+            operator = operators.pop()
+            operator.add_child(expr)
+            expr = operator
 
-        operator.add_child(lexpr)
-        prev_operator.add_child(self.parse_expr(operator))
-        return prev_operator
+        return expr
 
     def run(self):
         return self.parse_expr()
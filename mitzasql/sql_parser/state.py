@@ -2,48 +2,78 @@
 # Author: Vlad Balmos <vladbalmos@yahoo.com>
 # See LICENSE file
 
-from collections import deque
+from array import array
 from . import ast
 from . import tokens as Token
 
+_skippable = Token.Whitespace.bit | Token.Comment.bit
+_delimiter = Token.Punctuation.bit | Token.Paren.bit
+
 class State:
     '''
     Models the current parser state.
     Also contains helper methods for lookahead and for determining
-    current and future node types
+    current and future node types.
+
+    The tokens are read once into parallel arrays (type ids, values,
+    lowercase values and positions) and the state is the index of the
+    current token. Looking ahead saves the index on enter and restores it
+    on exit:
+
+        with state as future_state:
+            future_state.next()
     '''
-    def __init__(self, tokens, future=False, prev_state_lookahead=None):
-        self._tokens = tokens
-        self.lookahead_tokens = deque()
-        self.prev_state_lookahead = prev_state_lookahead
-        self._future_state = None
-        self._is_future = future
+    def __init__(self, tokens):
+        self._type_ids = array('H')
+        self._values = []
+        self._positions = array('Q')
+
+        for ttype, value, pos in tokens:
+            self._type_ids.append(ttype.id)
+            self._values.append(value)
+            self._positions.append(pos)
+
+        self._lcase_values = [value.lower() for value in self._values]
+        self._masks = [Token.types[type_id].mask for type_id in self._type_ids]
+        self._length = len(self._values)
+        self._saved_indexes = []
+        self._index = -1
         self.type = None
         self.value = None
         self.lcase_value = None
         self.pos = None
+        self.mask = 0
 
-        if not future:
-            self.next()
+        self.next()
 
     def __bool__(self):
         return self.type is not None
 
     def __enter__(self):
-        self._future_state = State(self._tokens, future=True, prev_state_lookahead=self.lookahead_tokens.copy())
-        return self._future_state
+        self._saved_indexes.append(self._index)
+        return self
 
     def __exit__(self, type, value, traceback):
-        if self._future_state is not None:
-            self.lookahead_tokens.extend(self._future_state.lookahead_tokens)
-        self._future_state = None
+        self._move(self._saved_indexes.pop())
+
+    def _move(self, index):
+        self._index = index
+        if index < self._length:
+            self.type = Token.types[self._type_ids[index]]
+            self.value = self._values[index]
+            self.lcase_value = self._lcase_values[index]
+            self.pos = self._positions[index]
+            self.mask = self._masks[index]
+        else:
+            self.type = self.value = self.lcase_value = self.pos = None
+            self.mask = 0
 
     def token_is(self, type, value=None, lowercase=True, equal_type=False):
         if equal_type:
-            if self.type != type:
+            if self.type is not type:
                 return False
         else:
-            if self.type not in type:
+            if not self.mask & type.bit:
                 return False
 
         if value is None:
@@ -80,7 +110,7 @@ class State:
         return self.token_is(Token.Reserved, label, lowercase, equal_type=True)
 
     def is_skippable(self):
-        return self.token_is(Token.Whitespace) or self.token_is(Token.Comment)
+        return self.mask & _skippable != 0
 
     def is_dot(self):
         return self.token_is(Token.Dot)
@@ -104,7 +134,7 @@ class State:
         return self.token_is(Token.Operator, label)
 
     def is_delimiter(self):
-        return self.token_is(Token.Punctuation) or self.token_is(Token.Paren)
+        return self.mask & _delimiter != 0
 
     def is_identifier(self):
         if not self:
@@ -223,51 +253,15 @@ class State:
         while self and self.is_skippable():
             self.next()
 
-    def update(self, token):
-        self.type, self.value, self.pos = token or (None, None, None)
-        if self:
-            self.lcase_value = self.value.lower()
-        else:
-            self.lcase_value = None
-
-    def next_in_lookahead_queue(self, skip_whitespace):
-        if skip_whitespace is False:
-            self.update(self.lookahead_tokens.popleft())
-            return
-
-        while len(self.lookahead_tokens):
-            self.update(self.lookahead_tokens.popleft())
-            if self.is_skippable():
-                if not len(self.lookahead_tokens):
-                    return self.next(skip_whitespace)
-                continue
-            break
-
     def next(self, skip_whitespace=True):
-        if self._is_future and self.prev_state_lookahead and len(self.prev_state_lookahead):
-            if skip_whitespace is False:
-                self.update(self.prev_state_lookahead.popleft())
-                return
-
-            while len(self.prev_state_lookahead):
-                self.update(self.prev_state_lookahead.popleft())
-                if self.is_skippable():
-                    continue
-                break
-            return
-
-        if len(self.lookahead_tokens) and not self._is_future:
-            self.next_in_lookahead_queue(skip_whitespace)
-            return
-
-        try:
-            token = next(self._tokens)
-        except StopIteration:
-            token = (None, None, None)
-
-        self.update(token)
-        if self._is_future:
-            self.lookahead_tokens.append(token)
-
+        index = self._index + 1
         if skip_whitespace:
-            self.skip_whitespace()
+            masks = self._masks
+            length = self._length
+            while index < length and masks[index] & _skippable:
+                index += 1
+
+        if index > self._length:
+            index = self._length
+
+        self._move(index)
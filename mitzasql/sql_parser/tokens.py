@@ -18,7 +18,15 @@
 ## by Georg Brandl.
 ## http://pygments.org/
 
+# Token types by id
+types = []
+
 class _TokenType(tuple):
+    """
+    Every token type has an integer id, a bit made from the id and a mask
+    with the bits of the type and of its parents: `b` is a subtype of `a`
+    if `b.mask & a.bit`
+    """
     parent = None
 
     def __contains__(self, item):
@@ -28,14 +36,24 @@ class _TokenType(tuple):
         new = _TokenType(self + (name,))
         setattr(self, name, new)
         new.parent = self
+        new._set_id()
         return new
 
+    def _set_id(self):
+        self.id = len(types)
+        self.bit = 1 << self.id
+        self.mask = self.bit
+        if self.parent is not None:
+            self.mask |= self.parent.mask
+        types.append(self)
+
     def __repr__(self):
         # self can be False only if its the `root` i.e. Token itself
         return 'Token' + ('.' if self else '') + '.'.join(self)
 
 
 Token = _TokenType()
+Token._set_id()
 
 # Punctuation tokens
 Punctuation = Token.Punctuation
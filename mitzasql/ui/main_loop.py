@@ -17,3 +17,12 @@ def refresh():
     if os.getenv('TEST_MODE') == '1' or not mutable['loop']:
         return
     mutable['loop'].draw_screen()
+
+def call_soon(callback, *args):
+    '''Run the callback on the next main loop iteration, after the screen is
+    redrawn. Returns False if there is no main loop to schedule it on
+    '''
+    if os.getenv('TEST_MODE') == '1' or not mutable['loop']:
+        return False
+    mutable['loop'].set_alarm_in(0, lambda loop, user_data: callback(*args))
+    return True
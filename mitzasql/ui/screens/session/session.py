@@ -3,9 +3,11 @@
 # See LICENSE file
 
 import urwid
+import mysql.connector.errors as errors
 
 from ....state_machine import StateMachine
 from ....db.connection import Connection
+from ....db.executor import executor_instance
 from ....db.model import (DBTablesModel, TriggerModel, ProcedureModel, TableInfoModel, ViewInfoModel)
 from ..screen import Screen
 from ...widgets.db_view import DBView
@@ -44,6 +46,7 @@ class Session(Screen):
         self._last_table = None
         self._last_query = None
         self._last_primary_view = None
+        self._query_view = None
         self._state_machine = self._init_state_machine()
         self._state_machine.set_initial_state(states.STATE_INITIAL)
         self._widgets_factory = WidgetsFactory(self._state_machine)
@@ -139,22 +142,24 @@ class Session(Screen):
                 return
 
             if object_type == 'TRIGGER':
-                model = TriggerModel(self._connection, self._connection.database, row[0])
+                model_cls = TriggerModel
+                widget_cls = TriggerWidget
+            else:
+                model_cls = ProcedureModel
+                widget_cls = ProcedureWidget
+
+            def show_info(model):
+                emitter.toggle_loading_status(False)
                 if model.last_error is not None:
                     self.view.show_error(model.last_error)
                     return
-                widget = TriggerWidget(model)
+                widget = widget_cls(model)
                 self.view.show_big_popup(widget)
-                return
 
-            if object_type == 'FUNCTION' or object_type == 'PROCEDURE':
-                model = ProcedureModel(self._connection, self._connection.database, row[0])
-                if model.last_error is not None:
-                    self.view.show_error(model.last_error)
-                    return
-                widget = ProcedureWidget(model)
-                self.view.show_big_popup(widget)
-                return
+            emitter.toggle_loading_status(True)
+            executor_instance.submit(model_cls, self._connection,
+                    self._connection.database, row[0], callback=show_info,
+                    key=self._connection)
 
         urwid.connect_signal(self.focused_widget, self.focused_widget.SIGNAL_ACTION_SELECT_TABLE, on_select)
         self.focused_widget.select_handler_bound = True
@@ -172,14 +177,17 @@ class Session(Screen):
             def on_change_table(emitter):
                 database = self._connection.database
                 model = DBTablesModel(self._connection, database)
-                if model.last_error is not None:
-                    self.view.show_error(model.last_error)
-                    return
-                widget = TableChangerWidget(model)
-                urwid.connect_signal(widget, widget.SIGNAL_CHANGE_TABLE,
-                        self.switch_table)
-                self.view.show_table_changer(widget)
-                return
+
+                def show_table_changer(*args):
+                    if model.last_error is not None:
+                        self.view.show_error(model.last_error)
+                        return
+                    widget = TableChangerWidget(model)
+                    urwid.connect_signal(widget, widget.SIGNAL_CHANGE_TABLE,
+                            self.switch_table)
+                    self.view.show_table_changer(widget)
+
+                self._when_loaded(model, show_table_changer)
 
             urwid.connect_signal(self.focused_widget,
                     self.focused_widget.SIGNAL_ACTION_CHANGE_TABLE,
@@ -201,27 +209,31 @@ class Session(Screen):
         if not hasattr(self.focused_widget, 'info_handler_bound'):
             def on_info(emitter, action):
                 table_name = emitter.model.table_name
+                database = self._connection.database
 
-                result = TableInfoModel.is_view(self._connection,
-                        self._connection.database, table_name)
+                def load_info():
+                    result = TableInfoModel.is_view(self._connection,
+                            database, table_name)
+                    if result is not False:
+                        return result
+                    return TableInfoModel(self._connection, database,
+                            table_name)
 
-                if result is not False:
-                    viewInfoModel = result
-                    if viewInfoModel.last_error is not None:
-                        self.view.show_error(viewInfoModel.last_error)
-                        return
-                    widget = ViewInfoWidget(viewInfoModel)
-                    self.view.show_big_popup(widget)
-                    return
-                else:
-                    model = TableInfoModel(self._connection,
-                            self._connection.database, table_name)
+                def show_info(model):
+                    emitter.toggle_loading_status(False)
                     if model.last_error is not None:
                         self.view.show_error(model.last_error)
                         return
-                    widget = TableInfoWidget(model)
+
+                    if isinstance(model, ViewInfoModel):
+                        widget = ViewInfoWidget(model)
+                    else:
+                        widget = TableInfoWidget(model)
                     self.view.show_big_popup(widget)
-                    return
+
+                emitter.toggle_loading_status(True)
+                executor_instance.submit(load_info, callback=show_info,
+                        key=self._connection)
 
             urwid.connect_signal(self.focused_widget,
                     self.focused_widget.SIGNAL_ACTION_INFO, on_info)
@@ -230,9 +242,33 @@ class Session(Screen):
     def show_query_table(self, emitter, query):
         if not isinstance(emitter, QueryView):
             self.view.show_loading_dialog()
+        else:
+            emitter.toggle_loading_status(True)
+
+        def lease():
+            try:
+                return (self._connection.fresh, None)
+            except errors.Error as e:
+                return (None, e)
+
+        def leased(result):
+            connection, error = result
+            if error is not None:
+                if isinstance(emitter, QueryView):
+                    emitter.toggle_loading_status(False)
+                self.view.show_error(error)
+                return
+            self._show_query_view(emitter, query, connection)
 
+        # Lease the connection of the new query view once the last one
+        # returned its own, so they don't both hold a slot of the pool
+        closed_connection = self._close_query_view()
+        executor_instance.submit(lease, callback=leased, key=closed_connection)
+
+    def _show_query_view(self, emitter, query, connection):
         self.focused_widget = self._widgets_factory.create('query_view', query,
-                self._connection.fresh, cache=False)
+                connection, cache=False)
+        self._query_view = self.focused_widget
 
         self._bind_help_handler(self.focused_widget)
         self._bind_log_handler(self.focused_widget)
@@ -242,13 +278,18 @@ class Session(Screen):
         self.focused_widget.set_model_error_handler(self.handle_model_error)
 
         # If query cursor did not return rows, show info message
-        model = self.focused_widget.model
-        if not model.last_error and not model.has_rows:
+        view = self.focused_widget
+        def show_affected_rows(*args):
+            model = view.model
+            if model.last_error or model.has_rows or model.cancelled:
+                return
+
             def go_back():
                 self._state_machine.change_state('back', emitter, force_refresh=True)
 
             self.view.show_info(u'Affected rows: {0}'.format(model.affected_rows), on_close=go_back)
-            return
+
+        self._when_loaded(view.model, show_affected_rows)
 
         if hasattr(self.focused_widget, 'select_handler_bound'):
             return
@@ -263,7 +304,33 @@ class Session(Screen):
                 self.focused_widget.SIGNAL_ACTION_SELECT_ROW, on_select)
         self.focused_widget.select_handler_bound = True
 
+    def _close_query_view(self):
+        '''Return the connection of the last query view to the pool, after
+        the queries it already sent to the executor ran. Returns the
+        connection (the executor key of the jobs closing it) or None'''
+        if self._query_view is None:
+            return None
+
+        model = self._query_view.model
+        executor_instance.submit(model.close, key=model.connection)
+        self._query_view = None
+        return model.connection
+
+    def _when_loaded(self, model, callback):
+        '''Call `callback` once the model's data is loaded'''
+        if not model.loading:
+            callback(model)
+            return
+
+        def on_load(model):
+            urwid.disconnect_signal(model, model.SIGNAL_LOAD, on_load)
+            callback(model)
+
+        urwid.connect_signal(model, model.SIGNAL_LOAD, on_load)
+
     def goto_prev_view(self, *args, **kwargs):
+        self._close_query_view()
+
         if isinstance(self._last_primary_view, DBView):
             self._state_machine.change_state('show_db_view', self, **kwargs)
             return
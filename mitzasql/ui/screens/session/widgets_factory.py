@@ -55,7 +55,7 @@ class WidgetsFactory(BaseWidgetsFactory):
         return view
 
     def create_query_view(self, query, connection):
-        model = QueryModel(connection, query)
+        model = QueryModel(connection, query, streaming=True)
         view = QueryView(model, connection)
         self._connect_signal(view, view.SIGNAL_ACTION_QUIT,
                 self.change_fsm_state, user_args=['quit'])
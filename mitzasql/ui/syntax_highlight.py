@@ -4,9 +4,11 @@
 
 from pygments.lexers import MySqlLexer
 from pygments.token import Punctuation, Whitespace, Error, Text, Comment, \
-        Operator, Keyword, Name, String, Number, Generic, Literal
+        Operator, Keyword, Name, String, Number, Generic, Literal, _TokenType
 from pygments.formatter import Formatter
 import pygments
+from operator import ne
+from itertools import islice
 
 class UrwidSqlFormatter(Formatter):
     '''
@@ -70,3 +72,140 @@ def highlight(text):
     pygments.highlight(text, lexer, formatter, writer)
 
     return writer.data
+
+ROOT_STATE = ('root',)
+
+def lex_line(line, state=ROOT_STATE):
+    '''Lex `line` starting in the lexer `state` (the state stack).
+
+    Returns the (token type, value) pairs and the state the line ends in.
+    This is pygments' RegexLexer loop, which doesn't expose the state'''
+    tokendefs = lexer._tokens
+    stack = list(state)
+    statetokens = tokendefs[stack[-1]]
+    tokens = []
+    pos = 0
+    while True:
+        for rexmatch, action, new_state in statetokens:
+            m = rexmatch(line, pos)
+            if not m:
+                continue
+
+            if action is not None:
+                if type(action) is _TokenType:
+                    tokens.append((action, m.group()))
+                else:
+                    tokens.extend((ttype, value) for _pos, ttype, value in
+                            action(lexer, m))
+            pos = m.end()
+
+            if new_state is not None:
+                if isinstance(new_state, tuple):
+                    for new in new_state:
+                        if new == '#pop':
+                            if len(stack) > 1:
+                                stack.pop()
+                        elif new == '#push':
+                            stack.append(stack[-1])
+                        else:
+                            stack.append(new)
+                elif isinstance(new_state, int):
+                    if abs(new_state) >= len(stack):
+                        del stack[1:]
+                    else:
+                        del stack[new_state:]
+                elif new_state == '#push':
+                    stack.append(stack[-1])
+                statetokens = tokendefs[stack[-1]]
+            break
+        else:
+            if pos >= len(line):
+                break
+
+            if line[pos] == '\n':
+                stack = ['root']
+                statetokens = tokendefs['root']
+                tokens.append((Whitespace, '\n'))
+            else:
+                tokens.append((Error, line[pos]))
+            pos += 1
+    return tokens, tuple(stack)
+
+class LineHighlighter:
+    """
+    Highlights the text line by line and caches each line's markup along
+    with the lexer state the line starts and ends in.
+
+    After an edit only the lines from the first changed line up to the first
+    unchanged line which starts in the same state as before are lexed again,
+    so the cost of highlighting doesn't depend on the size of the text.
+    """
+    def __init__(self):
+        # The text, start state, end state and markup of every line
+        self._texts = []
+        self._starts = []
+        self._ends = []
+        self._markups = []
+
+    def highlight(self, text):
+        '''The markup of each line of `text`, without the line ending.
+        The markup of the lines which weren't lexed again is the same object
+        as the one returned by the previous call'''
+        new = text.split('\n')
+        old = self._texts
+        limit = min(len(old), len(new))
+
+        changed = list(map(ne, old, new))
+        first = changed.index(True) if True in changed else limit
+
+        # The last line is lexed without a line ending, it has to be lexed
+        # again if lines were added after it or it became the last line
+        if first == limit and first and len(old) != len(new):
+            first -= 1
+
+        # Lines at the end which weren't changed
+        changed = list(islice(map(ne, reversed(old), reversed(new)),
+            limit - first))
+        same = changed.index(True) if True in changed else len(changed)
+
+        texts = new[0:first]
+        starts = self._starts[0:first]
+        ends = self._ends[0:first]
+        markups = self._markups[0:first]
+
+        state = ends[-1] if ends else ROOT_STATE
+        shift = len(new) - len(old)
+        for index in range(first, len(new)):
+            old_index = index - shift
+            if index >= len(new) - same and self._starts[old_index] == state:
+                texts.extend(new[index:])
+                starts.extend(self._starts[old_index:])
+                ends.extend(self._ends[old_index:])
+                markups.extend(self._markups[old_index:])
+                break
+
+            line = new[index]
+            is_last = index == len(new) - 1
+            tokens, end = lex_line(line if is_last else line + '\n', state)
+            starts.append(state)
+            ends.append(end)
+            markups.append(self._markup(tokens))
+            texts.append(line)
+            state = end
+
+        self._texts = texts
+        self._starts = starts
+        self._ends = ends
+        self._markups = markups
+        return markups
+
+    def _markup(self, tokens):
+        markup = []
+        style = formatter.colorscheme
+        for ttype, value in tokens:
+            if value.endswith('\n'):
+                value = value[0:-1]
+            if not value:
+                continue
+            markup.append((style.get(ttype, 'sql:default'), value))
+        return markup
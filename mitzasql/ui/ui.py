@@ -14,6 +14,7 @@ from . import theme
 from . import main_loop as shared_main_loop
 from .builder import Builder
 from ..logger import logger
+from ..db.executor import executor_instance
 
 top_most_widget = None
 palette = theme.get_palette()
@@ -151,10 +152,14 @@ def start_loop(macro_file=None):
     # in order to avoid circular reference in widgets when
     # importing the ui to refresh the screen
     shared_main_loop.mutable['loop'] = main_loop
+
+    # Run the database queries on a worker thread from now on
+    executor_instance.start(main_loop)
     old_signal_keys = None
     try:
         old_signal_keys = main_loop.screen.tty_signal_keys(intr='undefined')
         main_loop.run()
     finally:
+        executor_instance.stop()
         if old_signal_keys:
             main_loop.screen.tty_signal_keys(*old_signal_keys)
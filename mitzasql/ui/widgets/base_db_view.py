@@ -19,6 +19,7 @@ class BaseDBView(urwid.Frame):
     SIGNAL_ACTION_RUN_QUERY = 'query_editor'
     SIGNAL_ACTION_QUERY_LOG = 'query_log'
     SIGNAL_ACTION_REFRESH = 'refresh'
+    SIGNAL_ACTION_CANCEL = 'cancel'
     SIGNAL_ACTION_QUIT = 'quit'
     SIGNAL_MODEL_ERROR = 'model_error'
     SIGNALS = [SIGNAL_ACTION_EXIT, SIGNAL_ACTION_RUN_QUERY, SIGNAL_MODEL_ERROR]
@@ -44,6 +45,7 @@ class BaseDBView(urwid.Frame):
                ('F2', u'F2 Query Editor'),
                ('F4', u'F4 Log', self.SIGNAL_ACTION_QUERY_LOG),
                ('F5', u'F5 Refresh', self.SIGNAL_ACTION_REFRESH),
+               ('F8', u'F8 Cancel', self.SIGNAL_ACTION_CANCEL),
                ('F10', u'F10 Quit', self.SIGNAL_ACTION_QUIT)
                ]
         default_actions.extend(actions)
@@ -61,12 +63,19 @@ class BaseDBView(urwid.Frame):
         urwid.register_signal(self.__class__, signals)
         urwid.connect_signal(self, self.SIGNAL_ACTION_REFRESH,
                 self.refresh_model)
+        urwid.connect_signal(self, self.SIGNAL_ACTION_CANCEL,
+                self.cancel_query)
         self._connect_model_signals()
         self._update_breadcrumbs()
 
+        if self._model.loading:
+            self.toggle_loading_status(True)
+
     def _connect_model_signals(self):
         urwid.connect_signal(self._model, self._model.SIGNAL_ERROR,
                 self.emit_model_error)
+        urwid.connect_signal(self._model, self._model.SIGNAL_CANCEL,
+                self.show_query_cancelled)
         urwid.connect_signal(self._model, self._model.SIGNAL_PRE_LOAD,
                 self.toggle_loading_status, user_args=[True])
         urwid.connect_signal(self._model, self._model.SIGNAL_NEW_DATA,
@@ -83,11 +92,15 @@ class BaseDBView(urwid.Frame):
                 self.toggle_loading_status, user_args=[False])
         urwid.disconnect_signal(self._model, self._model.SIGNAL_ERROR,
                 self.emit_model_error)
+        urwid.disconnect_signal(self._model, self._model.SIGNAL_CANCEL,
+                self.show_query_cancelled)
 
     def __del__(self):
         self._disconnect_model_signals()
         urwid.disconnect_signal(self, self.SIGNAL_ACTION_REFRESH,
                 self.refresh_model)
+        urwid.disconnect_signal(self, self.SIGNAL_ACTION_CANCEL,
+                self.cancel_query)
         self._disconnect_model_signals()
         self._model = None
         self._connection = None
@@ -113,6 +126,12 @@ class BaseDBView(urwid.Frame):
     def refresh_model(self, emitter, action):
         self._model.reload()
 
+    def cancel_query(self, emitter, action):
+        self._model.cancel()
+
+    def show_query_cancelled(self, model):
+        self._footer.show_message(u'Query cancelled')
+
     def _make_header(self):
         header = urwid.AttrMap(urwid.Text('', wrap='clip'), 'session_header')
         return header
@@ -184,3 +184,55 @@ class SearchCmdProcessor:
             self._last_search_result = (self._max_search_pos + 1, self._last_search_result[1])
             return self.search_prev()
 
+
+class ServerSearchCmdProcessor:
+    '''Search executed by the model on the database server.
+
+    `search_callback(keyword, pos=0, reverse=False, callback=None)` reports
+    the (index, row) of the match, or None, to `callback` once the server
+    replies. The search wraps around the first/last row.
+    '''
+    def __init__(self, search_callback):
+        self._last_keyword = None
+        self._last_search_result = None
+        self._search_callback = search_callback
+
+    def search(self, keyword):
+        if keyword is None or len(keyword) == 0:
+            return
+        self._last_keyword = keyword
+        self._last_search_result = None
+
+        def found(result):
+            self._last_search_result = result
+            if result is None:
+                self._emit_error(u'Nothing found')
+
+        self._search_callback(keyword, callback=found)
+
+    def search_next(self):
+        self._search_from_last_result(reverse=False)
+
+    def search_prev(self):
+        self._search_from_last_result(reverse=True)
+
+    def _search_from_last_result(self, reverse):
+        if self._last_keyword is None or self._last_search_result is None:
+            return
+        index, row = self._last_search_result
+        keyword = self._last_keyword
+
+        def wrapped(result):
+            if result is not None:
+                self._last_search_result = result
+
+        def found(result):
+            if result is not None:
+                self._last_search_result = result
+                return
+            # Continue from the first row or from the last one
+            self._search_callback(keyword, pos=None if reverse else 0,
+                    reverse=reverse, callback=wrapped)
+
+        self._search_callback(keyword, pos=index if reverse else index + 1,
+                reverse=reverse, callback=found)
@@ -49,7 +49,9 @@ class DBTablesView(BaseDBView):
         self._command_processor = CommandProcessor(self)
         self._table_widget_cls = Table
         super().__init__(model, connection)
-        self._command_processor.cmd_args_suggestions['resize'] = [c['name'] for c in self._model.columns]
+        self._set_cmd_args_suggestions()
+        urwid.connect_signal(self._model, self._model.SIGNAL_LOAD,
+                self._set_cmd_args_suggestions)
         self.SIGNALS.append(self.SIGNAL_ACTION_SELECT_TABLE)
         self._connect_table_signals()
 
@@ -59,13 +61,18 @@ class DBTablesView(BaseDBView):
                 self._model.reload()
             return
         self._model.database = database
-        self._model.reload()
+        self._model.reload(cached=True)
         self._update_breadcrumbs()
 
     def __del__(self):
         self._disconnect_table_signals()
+        urwid.disconnect_signal(self._model, self._model.SIGNAL_LOAD,
+                self._set_cmd_args_suggestions)
         super().__del__()
 
+    def _set_cmd_args_suggestions(self, *args):
+        self._command_processor.cmd_args_suggestions['resize'] = [c['name'] for c in self._model.columns]
+
     def _connect_table_signals(self):
         urwid.connect_signal(self._table, self._table.SIGNAL_ROW_SELECTED,
                 self.select_table)
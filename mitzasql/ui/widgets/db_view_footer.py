@@ -48,7 +48,11 @@ class DBViewFooter(urwid.WidgetPlaceholder):
             self._clear_error_timer.cancel()
 
     def show_command_error(self, emitter, error_message, *args):
-        self.toggle_message_bar(True, message=error_message, is_error=True)
+        self.show_message(error_message, is_error=True)
+
+    def show_message(self, message, is_error=False):
+        '''Show a message which is cleared after a second'''
+        self.toggle_message_bar(True, message=message, is_error=is_error)
 
         self._cancel_clear_error_timer()
         def clear_message():
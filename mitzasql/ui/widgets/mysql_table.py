@@ -7,30 +7,39 @@ from .table import Table
 from ...db.model import TableModel as MysqlTableModel
 
 class MysqlTable(Table):
+    # Read the next pages ahead when fewer rows are left to scroll
+    PREFETCH_THRESHOLD = 150
+    # Load the neighbouring pages of a window when fewer rows are left to
+    # scroll
+    WINDOW_THRESHOLD = 50
+
     def __init__(self, model):
         if not isinstance(model, MysqlTableModel):
             raise TypeError("Wrong model type")
         super().__init__(model)
 
-        urwid.connect_signal(model, model.SIGNAL_NEW_DATA, self.render_more)
-
-    def __del__(self):
-        urwid.disconnect_signal(self._model, self._model.SIGNAL_NEW_DATA, self.render_more)
-        super().__del__()
-
-    def render_more(self, model, data, data_length):
-        for row in data:
-            self._body.add_row(row)
-
     def _scroll_rows(self):
-        if self._model.loaded_rowcount < len(self._model):
-            remaining_rows_to_scroll = (self._model.loaded_rowcount - 1) - self._focused_row_index
-
-            if remaining_rows_to_scroll > 0 and remaining_rows_to_scroll < 50:
-                self._model.load_next_set()
-            elif remaining_rows_to_scroll < 0:
-                self._model.load_more(self._focused_row_index)
-
-        if self._focused_row_index <= (self._model.loaded_rowcount - 1):
-            return super()._scroll_rows()
-
+        index = self._focused_row_index
+        rowcount = len(self._model)
+
+        if index < rowcount and self._model.row(index) is None:
+            # Load only the page of the focused row
+            self._model.load_rows(index)
+        elif index < self._model.loaded_rowcount:
+            if self._model.loaded_rowcount < rowcount:
+                remaining_rows_to_scroll = (self._model.loaded_rowcount - 1) - index
+
+                if remaining_rows_to_scroll < self.PREFETCH_THRESHOLD:
+                    self._model.prefetch()
+
+                if remaining_rows_to_scroll < 50 and not self._model.prefetching:
+                    self._model.load_next_set()
+        else:
+            for neighbour in (index + self.WINDOW_THRESHOLD,
+                    index - self.WINDOW_THRESHOLD):
+                if (0 <= neighbour < rowcount and
+                        self._model.row(neighbour) is None):
+                    self._model.load_rows(neighbour)
+                    break
+
+        return super()._scroll_rows()
@@ -5,11 +5,13 @@
 import urwid
 
 from .emacs_edit import EmacsEdit
-from ..syntax_highlight import highlight
+from ..syntax_highlight import LineHighlighter
 from ...logger import logger
 from .. import clipboard
 
 class QueryEditor(EmacsEdit):
+    # Lines rendered together in a block
+    BLOCK_LINES = 64
     SIGNAL_LOADING_SUGGESTIONS = 'loading_suggestions'
     SIGNAL_SHOW_SUGGESTIONS = 'show_suggestions'
     SIGNAL_HIDE_SUGGESTIONS = 'hide_suggestions'
@@ -20,7 +22,16 @@ class QueryEditor(EmacsEdit):
         self._suggestion_index = -1
         self._suggestions_found = False
         self._last_autocomplete_text_pos = None
+        self._loading_suggestions = False
         self._start_autocomplete_markers = [' ', '\t', '.', '(', '`', '*']
+        self._highlighter = LineHighlighter()
+        # (markup, text layout, canvas) of the lines, keyed by the id of the
+        # line's markup
+        self._lines = {}
+        # The blocks of BLOCK_LINES lines, see _render_lines()
+        self._blocks = []
+        self._canvas = None
+        self._canvas_key = None
         urwid.register_signal(self.__class__, [self.SIGNAL_LOADING_SUGGESTIONS, self.SIGNAL_SHOW_SUGGESTIONS, self.SIGNAL_HIDE_SUGGESTIONS])
 
     def _should_autocomplete(self, key):
@@ -52,12 +63,31 @@ class QueryEditor(EmacsEdit):
         raise RuntimeError(f'Invalid autocomplete key {key}')
 
     def _autocomplete(self, direction):
+        if self._loading_suggestions:
+            return
+
         if not self._last_autocomplete_text_pos:
             self._last_autocomplete_text_pos = self.edit_pos
             self._suggestion_index = -1
 
+        text = self.edit_text
+        pos = self._last_autocomplete_text_pos
+
+        def loaded(suggestions):
+            self._loading_suggestions = False
+
+            # The text was edited while the suggestions were loading
+            if text != self.edit_text or pos != self._last_autocomplete_text_pos:
+                urwid.emit_signal(self, self.SIGNAL_HIDE_SUGGESTIONS, self)
+                return
+
+            self._apply_suggestion(direction, suggestions)
+
+        self._loading_suggestions = True
         urwid.emit_signal(self, self.SIGNAL_LOADING_SUGGESTIONS, self)
-        suggestions = self._autocomplete_engine.get_suggestions(self.edit_text, self._last_autocomplete_text_pos)
+        self._autocomplete_engine.request_suggestions(text, pos, loaded)
+
+    def _apply_suggestion(self, direction, suggestions):
         if not suggestions:
             self._suggestions_found = False
             return
@@ -142,12 +172,102 @@ class QueryEditor(EmacsEdit):
         (maxcol,) = size
         self._shift_view_to_cursor = bool(focus)
 
-        text = highlight(self.edit_text)
-        if not len(text):
-            text = u''
+        key = (self.edit_text, maxcol)
+        if key != self._canvas_key:
+            self._canvas = self._render_lines(maxcol)
+            self._canvas_key = key
 
-        canv = urwid.Text(text).render((maxcol,))
+        canv = self._canvas
         if focus:
             canv = urwid.CompositeCanvas(canv)
             canv.cursor = self.get_cursor_coords((maxcol,))
         return canv
+
+    def _render_lines(self, maxcol):
+        '''Render the highlighted lines in blocks of BLOCK_LINES lines. Only
+        the blocks with changed lines and only the changed lines are rendered
+        again'''
+        if self._canvas_key is None or self._canvas_key[1] != maxcol:
+            self._lines = {}
+            self._blocks = []
+
+        markups = self._highlighter.highlight(self.edit_text)
+        blocks = []
+        for start in range(0, len(markups), self.BLOCK_LINES):
+            block_markups = markups[start:start + self.BLOCK_LINES]
+            key = tuple(map(id, block_markups))
+            index = len(blocks)
+            block = self._blocks[index] if index < len(self._blocks) else None
+            if block is None or block[0] != key:
+                block = self._render_block(key, block_markups, maxcol)
+            blocks.append(block)
+        self._blocks = blocks
+
+        if len(self._lines) > 2 * len(markups):
+            self._lines = {id(line[0]): line for block in blocks
+                    for line in block[1]}
+
+        return urwid.CanvasCombine([(block[2], None, False) for block in
+            blocks])
+
+    def _render_block(self, key, markups, maxcol):
+        '''Returns the block as (key, lines, canvas, row of each line).
+        The block is rendered as a single text canvas, made of the rows of
+        its lines'''
+        lines = []
+        texts = []
+        attrs = []
+        charsets = []
+        rows = []
+        for markup in markups:
+            line = self._lines.get(id(markup))
+            if line is None or line[0] is not markup:
+                line = self._render_line(markup, maxcol)
+                self._lines[id(markup)] = line
+            lines.append(line)
+            rows.append(len(texts))
+            for text, attr, charset in line[3]:
+                texts.append(text)
+                attrs.append(attr)
+                charsets.append(charset)
+
+        canvas = urwid.TextCanvas(texts, attrs, charsets, maxcol=maxcol,
+                check_width=False)
+        return (key, lines, canvas, rows)
+
+    def _render_line(self, markup, maxcol):
+        '''Returns the line as (markup, text, layout, rows) where each row
+        is (text, attributes, character sets) as kept by urwid.TextCanvas'''
+        text, attr = urwid.util.decompose_tagmarkup(markup or u'')
+        layout = self.layout.layout(text, maxcol, self.align, self.wrap)
+        canvas = urwid.canvas.apply_text_layout(text, attr, layout, maxcol)
+
+        rows = []
+        for row in canvas.content():
+            rows.append((b''.join(segment for _a, _cs, segment in row),
+                [(a, len(segment)) for a, _cs, segment in row],
+                [(cs, len(segment)) for _a, cs, segment in row]))
+        return (markup, text, layout, rows)
+
+    def position_coords(self, maxcol, pos):
+        '''Find the coordinates in the layout of the cursor's line instead
+        of laying out the whole text'''
+        if self.caption or self._canvas_key != (self.edit_text, maxcol):
+            return super().position_coords(maxcol, pos)
+
+        text = self.edit_text
+        line_index = text.count('\n', 0, pos)
+        line_pos = pos - text.rfind('\n', 0, pos) - 1
+
+        block_index, index = divmod(line_index, self.BLOCK_LINES)
+        y = 0
+        for block in self._blocks[0:block_index]:
+            y += block[2].rows()
+        block = self._blocks[block_index]
+        markup, line_text, layout, rows = block[1][index]
+        x, line_y = urwid.text_layout.calc_coords(line_text, layout,
+                line_pos)
+        if x >= maxcol:
+            # Edit shifts the line in order to show the cursor
+            return super().position_coords(maxcol, pos)
+        return x, y + block[3][index] + line_y
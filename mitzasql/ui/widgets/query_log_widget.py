@@ -7,27 +7,109 @@ import urwid
 
 from .info_widget import InfoWidget
 
+class LazyWalker(urwid.ListWalker):
+    '''List walker which creates the widgets of the items only when they are
+    displayed'''
+    def __init__(self, items, make_widget):
+        self._items = items
+        self._make_widget = make_widget
+        self._widgets = {}
+        self.focus = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def _get(self, position):
+        if position < 0 or position >= len(self._items):
+            return (None, None)
+
+        widget = self._widgets.get(position)
+        if widget is None:
+            widget = self._make_widget(self._items[position])
+            self._widgets[position] = widget
+        return (widget, position)
+
+    def get_focus(self):
+        return self._get(self.focus)
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position):
+        return self._get(position + 1)
+
+    def get_prev(self, position):
+        return self._get(position - 1)
+
 class QueryLogWidget(InfoWidget):
+    '''Shows the last queries or, after pressing tab, the statistics of the
+    queries grouped by digest'''
     def __init__(self, connection):
-        contents = self._create_log(connection.QUERY_LOG)
-        super().__init__(contents)
-        self.focus_position = len(connection.QUERY_LOG) * 2
+        self._log = connection.QUERY_LOG
+        self._showing_stats = False
+        super().__init__(self._create_log())
+        self.focus_position = len(self.body) - 1
 
     @property
     def name(self):
         return u'Query Log'
 
-    def _create_log(self, log):
-        contents = []
-        for entry in log:
-            date, query, params, duration = entry
-            date = date.strftime('%a %H:%M:%S')
-            duration = '{:.3f}'.format(duration)
-            log_entry = '{0}: {1}\nParams: {2}\nDuration: {3}s'.format(date,
-                    query, params, duration)
+    def keypress(self, size, key):
+        if key == 'tab':
+            self._toggle_stats()
+            return
+
+        return super().keypress(size, key)
+
+    def _toggle_stats(self):
+        self._showing_stats = not self._showing_stats
+        if self._showing_stats:
+            self.body = self._create_stats()
+            self.focus_position = 0
+        else:
+            self.body = self._create_log()
+            self.focus_position = len(self.body) - 1
+
+    def _create_log(self):
+        entries = list(self._log)
+        header = ('Last {0} queries (at most {1} are kept). Press tab to show '
+                'the statistics per query.').format(len(entries),
+                        self._log.max_size)
+        return LazyWalker([header] + entries + [''], self._make_log_entry)
+
+    def _make_log_entry(self, entry):
+        if isinstance(entry, str):
+            return self._make_text(entry)
+
+        date, query, params, duration = entry
+        date = date.strftime('%a %H:%M:%S')
+        duration = '{:.3f}'.format(duration)
+        log_entry = '{0}: {1}\nParams: {2}\nDuration: {3}s'.format(date,
+                query, params, duration)
+
+        return urwid.Pile([urwid.AttrMap(urwid.Text(log_entry), 'default'),
+            urwid.Divider('-')])
+
+    def _make_text(self, text):
+        if not text:
+            return urwid.Text('')
+        return urwid.Pile([urwid.Text(text), urwid.Divider('-')])
+
+    def _create_stats(self):
+        header = ('Queries grouped by digest, slowest first. Press tab to '
+                'show the query log.')
+        return LazyWalker([header] + self._log.stats() + [''],
+                self._make_stats_entry)
+
+    def _make_stats_entry(self, stats):
+        if isinstance(stats, str):
+            return self._make_text(stats)
 
-            contents.append(urwid.AttrMap(urwid.Text(log_entry), 'default'))
-            contents.append(urwid.Divider('-'))
+        entry = ('{0}\nCount: {1}  Total: {2:.3f}s  Mean: {3:.3f}s  '
+                'p50: {4:.3f}s  p95: {5:.3f}s  Max: {6:.3f}s').format(
+                        stats.digest, stats.count, stats.total, stats.mean,
+                        stats.p50, stats.p95, stats.max)
 
-        contents.append(urwid.Text(''))
-        return contents
+        return urwid.Pile([urwid.AttrMap(urwid.Text(entry), 'default'),
+            urwid.Divider('-')])
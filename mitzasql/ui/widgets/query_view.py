@@ -4,6 +4,7 @@
 
 import urwid
 
+from .. import main_loop as shared_main_loop
 from .base_db_view import BaseDBView
 from .table import Table
 from .cmd_proc import (BaseCmdProcessor, SearchCmdProcessor, CommandError)
@@ -37,8 +38,11 @@ class QueryView(BaseDBView):
     def __init__(self, model, connection):
         self._command_processor = CommandProcessor(self)
         self._table_widget_cls = Table
+        self._next_batch_scheduled = False
         super().__init__(model, connection)
-        self._command_processor.cmd_args_suggestions['resize'] = [c['name'] for c in self._model.columns]
+        self._set_cmd_args_suggestions()
+        urwid.connect_signal(self._model, self._model.SIGNAL_LOAD,
+                self._set_cmd_args_suggestions)
         if connection.database is None:
             database = ''
         else:
@@ -46,6 +50,9 @@ class QueryView(BaseDBView):
         self.SIGNALS.append(self.SIGNAL_ACTION_SELECT_ROW)
         self._connect_table_signals()
 
+    def _set_cmd_args_suggestions(self, *args):
+        self._command_processor.cmd_args_suggestions['resize'] = [c['name'] for c in self._model.columns]
+
     def _connect_table_signals(self):
         urwid.connect_signal(self._table, self._table.SIGNAL_ROW_SELECTED,
                 self.select_row)
@@ -54,6 +61,19 @@ class QueryView(BaseDBView):
         urwid.disconnect_signal(self._table, self._table.SIGNAL_ROW_SELECTED,
                 self.select_row)
 
+    def render(self, size, focus=False):
+        # Fetch the rest of a streamed result set one batch per screen
+        # update, only while the view is displayed
+        if self._model.streaming and not self._next_batch_scheduled:
+            self._next_batch_scheduled = shared_main_loop.call_soon(self._fetch_next_batch)
+        return super().render(size, focus)
+
+    def _fetch_next_batch(self):
+        self._next_batch_scheduled = False
+        if self._model is None:
+            return
+        self._model.fetch_next_batch()
+
     def select_row(self, emitter, row):
         urwid.emit_signal(self, self.SIGNAL_ACTION_SELECT_ROW, self, row)
 
@@ -0,0 +1,165 @@
+# Copyright (c) 2021 Vlad Balmos <vladbalmos@yahoo.com>
+# Author: Vlad Balmos <vladbalmos@yahoo.com>
+# See LICENSE file
+
+'''
+Format the table rows as single lines of text markup.
+
+A formatter is compiled for every column when the columns (or their widths)
+are set: the conversion to text, the alignment, the truncation and the
+separator are decided once instead of for every cell.
+'''
+
+from ...db.raw_row import RawRow
+
+SEPARATOR = chr(124)
+MORE = chr(187)
+NULL = u'(NULL)'
+
+NULL_ATTR = 'tcell_null_unfocused'
+NULL_FOCUSED_ATTR = 'tcell_null_focused'
+HEADER_SEPARATOR_ATTR = 'theader_sep'
+
+def _text(value):
+    if type(value) is not str:
+        value = str(value)
+    return value.replace('\n', '\\n')
+
+def _binary(value):
+    if not isinstance(value, str):
+        try:
+            value = value.decode(encoding='utf8')
+        except:
+            return value.hex()
+    return value.replace('\n', '\\n')
+
+def _spatial(value):
+    if isinstance(value, str):
+        return value.replace('\n', '\\n')
+    if isinstance(value, bytearray):
+        return value.hex()
+    return str(value)
+
+def _converter(column_info):
+    '''The function which converts the values of the column to text'''
+    if column_info['is_binary'] is True:
+        return _binary
+    if column_info['is_int'] is True or column_info['is_real'] is True:
+        return str
+    if column_info['is_text'] is True:
+        return _text
+    if column_info['is_spatial'] is True:
+        return _spatial
+    return str
+
+def _is_numeric(column_info):
+    return column_info['is_int'] is True or column_info['is_real'] is True
+
+def fit(text, width, align='left'):
+    '''Pad `text` to `width` or truncate it, marking the truncation'''
+    if len(text) > width:
+        return text[0:width - 1] + MORE
+    if align == 'right':
+        return text.rjust(width)
+    return text.ljust(width)
+
+def compile_cell_formatter(column_info, width, separator):
+    '''Returns a function which formats the values of the column as cells of
+    `width` characters, the separator included'''
+    convert = _converter(column_info)
+    content_width = width - 1 if separator else width
+    separator = SEPARATOR if separator else ''
+    pad = str.rjust if _is_numeric(column_info) else str.ljust
+
+    def format_cell(value):
+        text = convert(value)
+        if len(text) > content_width:
+            return text[0:content_width - 1] + MORE + separator
+        return pad(text, content_width) + separator
+
+    return format_cell
+
+class RowFormatter:
+    """
+    Formats the rows as a line of text markup: the cells are separated by a
+    space and the NULL values are highlighted.
+    """
+    def __init__(self, columns, cell_sizes):
+        self.set_columns(columns, cell_sizes)
+
+    def set_columns(self, columns, cell_sizes):
+        self._columns = columns
+        self.cell_sizes = cell_sizes
+        self._cells = [None] * len(columns)
+        self._nulls = [None] * len(columns)
+        for index in range(len(columns)):
+            self._compile(index)
+
+    def set_width(self, index, width):
+        self.cell_sizes[index] = width
+        self._compile(index)
+
+    def _compile(self, index):
+        column_info = self._columns[index]
+        width = self.cell_sizes[index]
+        separator = index < len(self._columns) - 1
+
+        self._cells[index] = compile_cell_formatter(column_info, width,
+                separator)
+
+        align = 'right' if _is_numeric(column_info) else 'left'
+        null = fit(NULL, width - 1 if separator else width, align)
+        self._nulls[index] = (null, SEPARATOR if separator else '')
+
+    def format(self, row, first=0, last=None):
+        '''The markup of the `first` to `last` columns of the row'''
+        if last is None:
+            last = len(self._columns) - 1
+        last = min(last, len(row) - 1)
+
+        is_raw = isinstance(row, RawRow)
+        cells = self._cells
+        markup = []
+        text = []
+        for index in range(first, last + 1):
+            if is_raw:
+                value = row.display_value(index)
+            else:
+                value = row[index]
+
+            if value is None:
+                if text:
+                    markup.append(''.join(text))
+                    text = []
+                null, separator = self._nulls[index]
+                markup.append((NULL_ATTR, null))
+                text.append(separator)
+            else:
+                text.append(cells[index](value))
+
+            if index < last:
+                text.append(' ')
+
+        if text:
+            markup.append(''.join(text))
+        return markup
+
+    def format_header(self, first=0, last=None):
+        '''The markup of the names of the `first` to `last` columns'''
+        if last is None:
+            last = len(self._columns) - 1
+
+        markup = []
+        for index in range(first, last + 1):
+            column_info = self._columns[index]
+            separator = index < len(self._columns) - 1
+            width = self.cell_sizes[index]
+            align = 'right' if _is_numeric(column_info) else 'left'
+
+            markup.append(fit(column_info['name'],
+                width - 1 if separator else width, align))
+            if separator:
+                markup.append((HEADER_SEPARATOR_ATTR, SEPARATOR))
+            if index < last:
+                markup.append(' ')
+        return markup
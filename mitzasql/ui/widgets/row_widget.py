@@ -5,9 +5,12 @@
 import urwid
 
 from .info_widget import InfoWidget
+from ...db.raw_row import RawRow
 
 class RowWidget(InfoWidget):
     def __init__(self, row, columns):
+        if isinstance(row, RawRow):
+            row = row.display()
         self._row = row;
         self._columns = columns
         contents = self._create_contents()
@@ -7,9 +7,11 @@ import hashlib
 import urwid
 import time
 import sys
+from collections import OrderedDict
 
 from .. import utils
 from ...logger import logger
+from .row_format import (RowFormatter, NULL_ATTR, NULL_FOCUSED_ATTR)
 
 class InputProcessor():
     '''
@@ -124,106 +126,15 @@ class InputProcessor():
             self._clear_pending_command()
             return ('scroll', 'up', sys.maxsize)
 
-class TCell(urwid.Text):
-    def __init__(self, content, width, separator=True, align='left', separator_attr=None):
-        self.separator = separator
-        self._content = content
-        self._align = align
-        self._width = width
-        self._separator_attr = separator_attr
-
-        content = self._format_content()
-        super().__init__(content, 'left', 'clip')
-
-    def _format_content(self):
-        content_attr = None
-        if not isinstance(self._content, tuple):
-            content = str(self._content)
-        else:
-            content_attr = self._content[0]
-            content = str(self._content[1])
-
-        if self.separator is True:
-            content_max_len = self._width - 1
-        else:
-            content_max_len = self._width
-
-        if len(content) > content_max_len:
-            content = content[0:content_max_len - 1]
-            content += chr(187)
-        else:
-            if self._align == 'left':
-                content = content.ljust(content_max_len)
-            else:
-                content = content.rjust(content_max_len)
-
-        if content_attr is not None:
-            content = (content_attr, content)
-
-        if self.separator is True:
-            if self._separator_attr is not None:
-                sep = (self._separator_attr, chr(124))
-            else:
-                sep = chr(124)
-            if isinstance(content, list):
-                content.append(sep)
-            else:
-                content = [content, sep]
-        return content
-
-    def resize(self, width):
-        self._width = width
-        content = self._format_content()
-        self.set_text(content)
-
-class TCellText(TCell):
-    def __init__(self, content, width, separator=True):
-        if isinstance(content, set):
-            content = str(content)
-        content = content.replace("\n", "\\n")
-        super().__init__(content, width, separator)
-
-class TCellNumber(TCell):
-    def __init__(self, content, width, separator=True):
-        super().__init__(content, width, separator, align='right')
-
-class TCellNull(TCell):
-    def __init__(self, width, column_info, separator=True):
-        if column_info['is_int'] is True or column_info['is_real'] is True:
-            align = 'right'
-        else:
-            align = 'left'
-        content = ('tcell_null_unfocused', u'(NULL)')
-        super().__init__(content, width, separator, align=align)
-
-class TCellBinary(TCell):
-    def __init__(self, content, width, separator=True):
-        if not isinstance(content, str):
-            try:
-                content = content.decode(encoding='utf8')
-            except:
-                content = content.hex();
-
-        if isinstance(content, str):
-            content = content.replace("\n", "\\n")
-        super().__init__(content, width, separator)
-
-class TCellSpatial(TCell):
-    def __init__(self, content, width, separator=True):
-        if isinstance(content, str):
-            content = content.replace("\n", "\\n")
-        elif isinstance(content, bytearray):
-            content = content.hex();
-        super().__init__(content, width, separator)
-
-
-class TRow(urwid.Columns):
+class TRow(urwid.Text):
+    '''A table row rendered as a single line of text markup (see
+    row_format.RowFormatter)'''
     MIN_COL_LENGTH = 3
     MAX_COL_LENGTH = 80
 
-    def __init__(self, cols, selectable=True):
+    def __init__(self, markup, selectable=True):
         self._selectable = selectable
-        super().__init__(cols, dividechars=1)
+        super().__init__(markup, wrap='clip')
 
     def selectable(self):
         return self._selectable
@@ -231,41 +142,18 @@ class TRow(urwid.Columns):
     def keypress(self, size, key):
         return key
 
-    def resize(self, col_index, increment):
-        cell, options = self.contents[col_index]
-
-        width = int(options[1]) + increment
-        if width < self.MIN_COL_LENGTH or width > self.MAX_COL_LENGTH:
-            return
-        cell.resize(width)
-
-        options = self.options('given', width, False)
-        self.contents[col_index] = (cell, options)
-        return width
-
-    def render(self, size, focus=False):
-        for col in self.contents:
-            if not isinstance(col[0], TCellNull):
-                continue
-            text, attr = col[0].get_text()
-            if focus is True:
-                attr = 'tcell_null_focused'
-            else:
-                attr = 'tcell_null_unfocused'
-
-            if col[0].separator is True:
-                text = [(attr, text[0:-1]), text[-1:]]
-            else:
-                text = (attr, text)
-            col[0].set_text(text)
-        return super().render(size, focus)
-
 class THeader(TRow):
     def __init__(self, columns):
-        self.cell_sizes = []
         self._cols_hash = self._get_cols_hash(columns)
-        cols = self._create_cols(columns)
-        super().__init__(cols, False)
+        self._formatter = RowFormatter(columns,
+                [info['max_len'] for info in columns])
+        # The first and last column which are shown
+        self._window = (0, len(columns) - 1)
+        super().__init__(self._formatter.format_header(*self._window), False)
+
+    @property
+    def cell_sizes(self):
+        return self._formatter.cell_sizes
 
     def _get_cols_hash(self, columns):
         serialized = pickle.dumps(columns)
@@ -274,72 +162,148 @@ class THeader(TRow):
         hsh = m.digest()
         return hsh
 
-    def _create_cols(self, columns):
-        cols = []
-        index = 0
-        columns_count = len(columns)
-
-        for info in columns:
-            name = info['name']
-            size = info['max_len']
-            self.cell_sizes.append(size)
-
-            if index < columns_count - 1:
-                separator = True
-            else:
-                separator = False
-
-            if info['is_int'] is True or info['is_real'] is True:
-                align = 'right'
-            else:
-                align = 'left'
-
-            cell = TCell(name, size, separator, align=align, separator_attr='theader_sep')
-            cols.append((size, cell))
-            index += 1
-        return cols
-
     def refresh(self, columns):
         cols_hash = self._get_cols_hash(columns)
         if cols_hash == self._cols_hash:
             return
         self._cols_hash = cols_hash
-        self.cell_sizes = []
-        self.contents.clear()
-        cols = self._create_cols(columns)
-        for width, widget in cols:
-            col_size = self.options(width_type='given', width_amount=width)
-            self.contents.append((widget, col_size))
+        self._formatter.set_columns(columns,
+                [info['max_len'] for info in columns])
+        self.set_column_window(0, len(columns) - 1)
+
+    def set_column_window(self, first, last):
+        '''Show only the columns from `first` to `last`'''
+        self._window = (first, last)
+        self.set_text(self._formatter.format_header(first, last))
 
     def resize(self, col_index, increment):
-        width = super().resize(col_index, increment)
-        if width is not None:
-            self.cell_sizes[col_index] = width
+        '''Change the width of the column. The header is redrawn by
+        set_column_window()'''
+        width = self.cell_sizes[col_index] + increment
+        if width < self.MIN_COL_LENGTH or width > self.MAX_COL_LENGTH:
+            return
+        self._formatter.set_width(col_index, width)
         return width
 
+class ModelRowsWalker(urwid.ListWalker):
+    """
+    List walker which reads the rows from the model and builds their widgets
+    only when the list box asks for them, i.e. for the rows in view. The
+    last MAX_WIDGETS built widgets are kept in an LRU cache, so the cost of
+    rendering, resizing and scrolling the table doesn't depend on the number
+    of loaded rows.
+
+    The rows which are not loaded yet are shown as blank placeholders until
+    the model loads them.
+    """
+    MAX_WIDGETS = 256
+
+    def __init__(self, model, make_row, make_placeholder):
+        self._model = model
+        self._make_row = make_row
+        self._make_placeholder = make_placeholder
+        self._widgets = OrderedDict()
+        self._placeholders = set()
+        self.focus = 0
+
+    def __len__(self):
+        return len(self._model)
+
+    def __iter__(self):
+        return iter(list(self._widgets.values()))
+
+    def clear(self):
+        self.focus = 0
+        self.rebuild()
+
+    def rebuild(self):
+        '''Drop the built widgets, e.g. when the visible columns change'''
+        self._widgets = OrderedDict()
+        self._placeholders = set()
+        self._modified()
+
+    def refresh(self):
+        '''Rebuild the placeholders of the rows loaded in the meantime and
+        drop the widgets of the rows the model no longer holds'''
+        for index in list(self._widgets):
+            loaded = self._model.row(index) is not None
+            if loaded == (index in self._placeholders):
+                del self._widgets[index]
+                self._placeholders.discard(index)
+        self._modified()
+
+    def get_focus(self):
+        if not len(self._model):
+            return (None, None)
+        return self._widget(min(self.focus, len(self._model) - 1))
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position):
+        return self._widget(position + 1)
+
+    def get_prev(self, position):
+        return self._widget(position - 1)
+
+    def _widget(self, index):
+        if index < 0 or index >= len(self._model):
+            return (None, None)
+
+        widget = self._widgets.get(index)
+        if widget is not None:
+            self._widgets.move_to_end(index)
+            return (widget, index)
+
+        row = self._model.row(index)
+        if row is None:
+            widget = self._make_placeholder()
+            self._placeholders.add(index)
+        else:
+            widget = self._make_row(row)
+
+        self._widgets[index] = widget
+        while len(self._widgets) > self.MAX_WIDGETS:
+            evicted, _widget = self._widgets.popitem(last=False)
+            self._placeholders.discard(evicted)
+        return (widget, index)
+
 class TBody(urwid.ListBox):
     KEYPRESS = 'keypress'
 
-    def __init__(self, columns_list, cell_sizes, rows=[]):
+    def __init__(self, columns_list, cell_sizes, model):
+        '''The rows are read from `model` as they are displayed (see
+        ModelRowsWalker)'''
         self._columns_list = columns_list
-        self._cell_sizes = cell_sizes
+        self._formatter = RowFormatter(columns_list, cell_sizes)
+        # The first and last column which have cells, None for all
+        self._col_window = None
 
         urwid.register_signal(self.__class__, self.KEYPRESS)
-        super().__init__(urwid.SimpleFocusListWalker(rows))
+        super().__init__(ModelRowsWalker(model, self.make_row,
+            self.make_placeholder_row))
 
     def set_columns(self, columns_list, cell_sizes):
         self._columns_list = columns_list
-        self._cell_sizes = cell_sizes
+        self._formatter.set_columns(columns_list, cell_sizes)
+        self._col_window = None
+
+    def set_column_window(self, first, last):
+        '''Build only the cells of the columns from `first` to `last`'''
+        self._col_window = (first, last)
+        self.body.rebuild()
 
     def update_col_width(self, col_index, width):
-        self._cell_sizes[col_index] = width
+        self._formatter.set_width(col_index, width)
+        self.body.rebuild()
 
     def clear(self):
         self.body.clear()
 
-    def add_row(self, row_data):
-        row = self.make_row(row_data)
-        self.body.append(row)
+    def refresh_rows(self):
+        '''Show the rows loaded by the model in the meantime'''
+        self.body.refresh()
 
     def __iter__(self):
         for row in self.body:
@@ -351,39 +315,16 @@ class TBody(urwid.ListBox):
         return row.original_widget
 
     def make_row(self, columns):
-        cols = []
-        index = 0
-        columns_count = len(columns)
-
-        for index, value in enumerate(columns):
-            column_info = self._columns_list[index]
-            cell_size = self._cell_sizes[index]
-
-            if index < columns_count - 1:
-                separator = True
-            else:
-                separator = False
-
-            cell = self._make_cell(value, cell_size, separator, column_info)
-
-            cols.append((cell_size, cell))
-        row = urwid.AttrMap(TRow(cols), 'default', focus_map='trow_focused')
-        return row
-
-    def _make_cell(self, value, size, separator, column_info):
-        if value is None:
-            cell = TCellNull(size, column_info, separator)
-        elif column_info['is_binary'] is True:
-            cell = TCellBinary(value, size, separator)
-        elif column_info['is_int'] is True or column_info['is_real'] is True:
-            cell = TCellNumber(value, size, separator)
-        elif column_info['is_text'] is True:
-            cell = TCellText(value, size, separator)
-        elif column_info['is_spatial'] is True:
-            cell = TCellSpatial(value, size, separator)
-        else:
-            cell = TCell(value, size, separator)
-        return cell
+        first, last = self._col_window or (0, None)
+        markup = self._formatter.format(columns, first, last)
+        return urwid.AttrMap(TRow(markup), 'default', focus_map={
+            None: 'trow_focused',
+            NULL_ATTR: NULL_FOCUSED_ATTR
+            })
+
+    def make_placeholder_row(self):
+        '''Blank row shown while the row is loading'''
+        return self.make_row([''] * len(self._columns_list))
 
     def keypress(self, size, key):
         '''Emit a signal with the key and size to be handled in the parent
@@ -397,6 +338,25 @@ class TBody(urwid.ListBox):
             return
         return key
 
+def column_window(cell_sizes, focus, width):
+    '''Returns the first and the last of the columns shown in `width`
+    screen columns: the focused column, as many columns as fit to its left
+    and then as many as fit to its right. The columns are separated by one
+    space'''
+    focus = max(0, min(focus, len(cell_sizes) - 1))
+    first = last = focus
+    used = cell_sizes[focus]
+
+    while first > 0 and used + 1 + cell_sizes[first - 1] <= width:
+        first -= 1
+        used += 1 + cell_sizes[first]
+
+    while last < len(cell_sizes) - 1 and used + 1 + cell_sizes[last + 1] <= width:
+        last += 1
+        used += 1 + cell_sizes[last]
+
+    return (first, last)
+
 class Table(urwid.Frame):
     SIGNAL_ROW_SELECTED = 'selected'
     SIGNAL_COLUMN_RESIZED = 'column_resized'
@@ -409,12 +369,17 @@ class Table(urwid.Frame):
         self._body = self.make_body()
         self._footer = urwid.Text('')
         self._widget_size = None
+        self._width = None
+        # The first and last column which have cells
+        self._col_window = None
         self._visible_columns = 0
         self._focused_row_index = 0
         self._focused_col_index = 0
         self._input_processor = InputProcessor()
 
         urwid.connect_signal(model, model.SIGNAL_LOAD, self.refresh)
+        urwid.connect_signal(model, model.SIGNAL_NEW_DATA, self.render_more)
+        urwid.connect_signal(model, model.SIGNAL_ROWCOUNT, self.update_rowcount)
 
         super().__init__(self._body,
                 urwid.AttrMap(self._header, 'theader'),
@@ -424,6 +389,8 @@ class Table(urwid.Frame):
 
     def __del__(self):
         urwid.disconnect_signal(self._model, self._model.SIGNAL_LOAD, self.refresh)
+        urwid.disconnect_signal(self._model, self._model.SIGNAL_NEW_DATA, self.render_more)
+        urwid.disconnect_signal(self._model, self._model.SIGNAL_ROWCOUNT, self.update_rowcount)
         urwid.disconnect_signal(self._body, self._body.KEYPRESS, self.on_body_keypress)
         self._body.clear()
 
@@ -435,19 +402,34 @@ class Table(urwid.Frame):
         self._focused_row_index = row_index
         self._scroll_rows()
 
+    def render(self, size, focus=False):
+        if size[0] != self._width or self._col_window is None:
+            self._width = size[0]
+            self._scroll_columns()
+        return super().render(size, focus)
+
     def refresh(self, model):
         self._visible_columns = 0
+        self._col_window = None
         self._focused_row_index = 0
         self._focused_col_index = 0
         self._rowcount = len(self._model)
         utils.orig_w(self._header).refresh(self._model.columns)
         self._body.clear()
         self._body.set_columns(self._model.columns, utils.orig_w(self._header).cell_sizes)
-        for row in self._model:
-            self._body.add_row(row)
         self._update_footer()
         self._scroll_rows()
 
+    def render_more(self, model, data, data_length):
+        self._body.refresh_rows()
+        self._rowcount = len(self._model)
+        self._update_footer()
+
+    def update_rowcount(self, model):
+        self._rowcount = len(self._model)
+        self._body.refresh_rows()
+        self._update_footer()
+
     def resize_col(self, col_index, increment=1):
         width = self._header.original_widget.resize(col_index, increment)
 
@@ -456,9 +438,9 @@ class Table(urwid.Frame):
 
         self._body.update_col_width(col_index, width)
 
-        for row in self._body.body:
-            trow = row.original_widget
-            trow.resize(col_index, increment)
+        # Rebuild the cells with the new width
+        self._col_window = None
+        self._scroll_columns()
 
         urwid.emit_signal(self, self.SIGNAL_COLUMN_RESIZED, self, col_index, width)
 
@@ -494,11 +476,9 @@ class Table(urwid.Frame):
 
     def make_body(self):
         body = TBody(columns_list=self._model.columns,
-                cell_sizes=self._header.cell_sizes)
+                cell_sizes=self._header.cell_sizes, model=self._model)
 
         urwid.connect_signal(body, body.KEYPRESS, self.on_body_keypress)
-        for row in self._model:
-            body.add_row(row)
         return body
 
     def on_body_keypress(self, emitter, size, key):
@@ -507,14 +487,13 @@ class Table(urwid.Frame):
         if not self._rowcount:
             return
 
-        self._detect_visible_columns_count()
-
         row, index = self._body.body.get_focus()
         self._focused_row_index = index
 
-        if key == 'enter':
-            urwid.emit_signal(self, self.SIGNAL_ROW_SELECTED, self,
-                    self._model[index])
+        if key == 'enter' and not self._model.loading:
+            row = self._model.row(index)
+            if row is not None:
+                urwid.emit_signal(self, self.SIGNAL_ROW_SELECTED, self, row)
 
         direction, offset, *command  = self._input_processor.process_key(key)
 
@@ -549,19 +528,16 @@ class Table(urwid.Frame):
 
         row_index = self._focused_row_index
 
+        # Rows are still being received
+        if self._model.streaming:
+            rowcount = '{0}+'.format(rowcount)
+        elif self._model.rowcount_estimated:
+            rowcount = '~{0}'.format(rowcount)
+
         status = u'[{0}/{1}:{2}]'.format(row_index + 1, rowcount, cols_count)
 
         self._footer.original_widget.set_text(status)
 
-    def _detect_visible_columns_count(self):
-        focused_row = self._body.focused_row
-        column_widths = focused_row.column_widths(self._widget_size)
-        visible_columns = 0
-        for width in column_widths:
-            if width > 0:
-                visible_columns += 1
-        self._visible_columns = visible_columns
-
     def _scroll_down(self, offset):
         self._increment_row_index(offset)
         self._scroll_rows()
@@ -588,14 +564,26 @@ class Table(urwid.Frame):
         self._scroll_columns()
 
     def _scroll_columns(self):
-        for row in self._body.body:
-            row.original_widget.focus_position = self._focused_col_index
-        self._header.original_widget.focus_position = self._focused_col_index
+        '''Shift the window of visible columns in order to show the focused
+        column. Only the cells of the visible columns are built, in the
+        header and in the rows on screen'''
+        header = self._header.original_widget
+        if self._width is None or not len(header.cell_sizes):
+            return
+
+        window = column_window(header.cell_sizes, self._focused_col_index,
+                self._width)
+        if window != self._col_window:
+            self._col_window = window
+            header.set_column_window(*window)
+            self._body.set_column_window(*window)
+
+        first, last = window
+        self._visible_columns = last - first + 1
 
     def _scroll_rows(self):
         if self._focused_row_index >= len(self._model):
             return
         self._body.set_focus(self._focused_row_index)
-        # Enforce the column focus because sometimes it resets to 0 and screws up
-        # the rendering
+        # Keep the window of visible columns in sync with the focused column
         self._scroll_columns()
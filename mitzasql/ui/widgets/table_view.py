@@ -9,12 +9,14 @@ from .mysql_table import MysqlTable
 from ...table_filter_parser import Parser
 from ...logger import logger
 
-from mitzasql.ui.widgets.cmd_proc import (BaseCmdProcessor, CommandError)
+from mitzasql.ui.widgets.cmd_proc import (BaseCmdProcessor,
+        ServerSearchCmdProcessor, CommandError)
 
-class CommandProcessor(BaseCmdProcessor):
+class CommandProcessor(BaseCmdProcessor, ServerSearchCmdProcessor):
     def __init__(self, table_view):
         self._table_view = table_view
         BaseCmdProcessor.__init__(self)
+        ServerSearchCmdProcessor.__init__(self, self._table_view.search_rows)
 
         self._colon_cmds.extend([
                 ('r', 'resize', self._resize_table),
@@ -39,8 +41,13 @@ class CommandProcessor(BaseCmdProcessor):
                 ])
 
         self._cmd_strings = {
+                '/': self.search,
                 ':': self.colon_handler
                 }
+        self._cmd_keys = {
+                'n': self.search_next,
+                'N': self.search_prev
+                }
 
     def _resize_table(self, *args):
         if not len(args):
@@ -92,6 +99,8 @@ class TableView(BaseDBView):
                 ]
         super().__init__(model, connection, actions)
         self._set_cmd_args_suggestions()
+        urwid.connect_signal(self._model, self._model.SIGNAL_LOAD,
+                self._set_cmd_args_suggestions)
         self.SIGNALS.extend([self.SIGNAL_ACTION_SELECT_ROW,
             self.SIGNAL_ACTION_INFO, self.SIGNAL_ACTION_CHANGE_TABLE])
         self._connect_table_signals()
@@ -104,14 +113,13 @@ class TableView(BaseDBView):
 
         self._model.database = connection.database
         self._model.table_name = table
-        self._model.reload()
-        self._set_cmd_args_suggestions()
+        self._model.reload(cached=True)
         self._update_breadcrumbs()
 
     def refresh_model(self, emitter, action):
         self._model.reload(reset_limit=False, reset_order=False, reset_where=False)
 
-    def _set_cmd_args_suggestions(self):
+    def _set_cmd_args_suggestions(self, *args):
         cmd_args_suggestions = [c['name'] for c in self._model.columns]
         self._command_processor.cmd_args_suggestions['eq'] = cmd_args_suggestions
         self._command_processor.cmd_args_suggestions['neq'] = cmd_args_suggestions
@@ -135,6 +143,8 @@ class TableView(BaseDBView):
 
     def __del__(self):
         self._disconnect_table_signals()
+        urwid.disconnect_signal(self._model, self._model.SIGNAL_LOAD,
+                self._set_cmd_args_suggestions)
         super().__del__()
 
     def _connect_table_signals(self):
@@ -162,6 +172,15 @@ class TableView(BaseDBView):
             raise CommandError(u'Invalid column width!')
         self._table.resize_col(col_index, value)
 
+    def search_rows(self, keyword, pos=0, reverse=False, callback=None):
+        def found(result):
+            if result is not None:
+                self._table.focus_row(result[0])
+            if callback is not None:
+                callback(result)
+
+        self._model.search(keyword, pos=pos, reverse=reverse, callback=found)
+
     def sort(self, column, direction):
         if column not in [c['name'] for c in self._model.columns]:
             raise CommandError(u'Column not found!')
@@ -242,8 +261,6 @@ class TableView(BaseDBView):
             where = "`{0}` NOT BETWEEN '{1}' AND '{2}'".format(column, values[0], values[1])
 
         self._model.filter(where)
-        if self._model.last_error:
-            self._model.clear_filter()
 
     def _escape_filter_value(self, value, column):
         for c in self._model.columns:
@@ -16,10 +16,11 @@ def walk_ast(root, callback):
     if not root:
         return
 
-    callback(root)
-
-    for child in root.children:
-        walk_ast(child, callback)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        callback(node)
+        stack.extend(reversed(node.children))
 
 
 def dfs(root, padding_left=0):
@@ -29,8 +30,8 @@ def dfs(root, padding_left=0):
     if padding_left == 0:
         print('\n')
 
-    print(''.rjust(padding_left, ' ') + str(root))
-
-    for child in root.children:
-        dfs(child, padding_left + 5)
-
+    stack = [(root, padding_left)]
+    while stack:
+        node, padding_left = stack.pop()
+        print(''.rjust(padding_left, ' ') + str(node))
+        stack.extend((child, padding_left + 5) for child in reversed(node.children))
@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime
+
+from mitzasql.autocomplete.engine import (SQLAutocompleteEngine, prefix_range)
+from mitzasql.db.query_log import (QueryLog, WordUsage, words)
+
+class Connection:
+    QUERY_LOG = QueryLog()
+    WORD_USAGE = WordUsage()
+
+class Model:
+    database = None
+    columns = []
+
+    def __init__(self, connection=None):
+        self.connection = connection
+
+def test_prefix_range_of_sorted_items():
+    items = ['actor', 'film', 'film_actor', 'film_text', 'films']
+    assert prefix_range(items, 'film') == (1, 5)
+    assert prefix_range(items, 'film_') == (2, 4)
+    assert prefix_range(items, 'x') == (5, 5)
+    assert prefix_range(items, '') == (0, 5)
+
+def test_word_usage_counts_the_words_used_by_the_statements():
+    assert words("SELECT `Film`.title FROM film WHERE id = 'x'") == \
+            {'select', 'film', 'title', 'from', 'where', 'id'}
+
+    usage = WordUsage()
+    usage.MAX_STATEMENTS = 2
+    for i in range(3):
+        usage.add('SELECT * FROM film WHERE id = {0}'.format(i))
+    usage.add('SELECT * FROM actor')
+    assert usage.usage()['film'] == 3
+    assert usage.usage()['select'] == 4
+
+    usage.add('SHOW TABLES')
+    assert 'film' not in usage.usage()
+    assert usage.usage()['actor'] == 1
+
+def test_suggestions_are_ranked_by_context_usage_and_name():
+    engine = SQLAutocompleteEngine(Model())
+    assert engine._compile([['film', 'film_actor'], ['film_text', 'films']],
+            'film') == ['film', 'film_actor', 'film_text', 'films']
+
+    connection = Connection()
+    connection.WORD_USAGE.clear()
+    for i in range(2):
+        connection.WORD_USAGE.add('SELECT * FROM films')
+    connection.WORD_USAGE.add('SELECT * FROM film_text')
+
+    engine = SQLAutocompleteEngine(Model(connection))
+    assert engine._compile([['film', 'film_actor'], ['film_text', 'films']],
+            'FILM') == ['film', 'film_actor', 'films', 'film_text']
+    assert engine._compile([['film'], ['film', 'films']], 'film') == \
+            ['film', 'films']
+
+    candidates = ['t{0:06}'.format(i) for i in range(100000)]
+    suggestions = engine._compile([candidates], 't')
+    assert suggestions == candidates[0:engine.MAX_SUGGESTIONS]
+
+def test_internal_queries_do_not_change_the_ranking():
+    connection = Connection()
+    connection.WORD_USAGE.clear()
+    connection.WORD_USAGE.add('SELECT * FROM films')
+    engine = SQLAutocompleteEngine(Model(connection))
+    candidates = [['film', 'film_actor', 'film_text', 'films']]
+    ranking = engine._compile(list(candidates), 'film')
+    assert ranking == ['films', 'film', 'film_actor', 'film_text']
+
+    # The queries run by the application are logged, but are not the user's
+    for i in range(10):
+        connection.QUERY_LOG.append((datetime.now(),
+            'SELECT COUNT(*) FROM film_actor', None, 0.1))
+        connection.QUERY_LOG.append((datetime.now(),
+            'SELECT table_name FROM information_schema.columns '
+            "WHERE table_name = 'film_text'", None, 0.1))
+    assert engine._compile(list(candidates), 'film') == ranking
+
+def test_keywords_are_suggested_by_prefix():
+    engine = SQLAutocompleteEngine(Model())
+    suggestions, prefix = engine.get_suggestions('SEL', 3)
+    assert prefix == 'SEL'
+    assert suggestions == ['select']
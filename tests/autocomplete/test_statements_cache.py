@@ -0,0 +1,37 @@
+from mitzasql.autocomplete.engine import SQLAutocompleteEngine
+
+class Model:
+    database = None
+    connection = None
+    columns = []
+
+script = '''SELECT * FROM orders AS o;
+UPDATE customers SET name = 'x' WHERE id = 1;
+'''
+
+def test_only_the_cursor_statement_is_parsed_again():
+    engine = SQLAutocompleteEngine(Model())
+    text = script + 'SELECT * FROM '
+    engine.get_suggestions(text, len(text))
+    parsed = dict(engine._parsed_statements)
+    assert list(parsed) == ['SELECT * FROM orders AS o;\n',
+            "UPDATE customers SET name = 'x' WHERE id = 1;\n"]
+
+    text += 'cust'
+    engine.get_suggestions(text, len(text))
+    for statement, result in engine._parsed_statements.items():
+        assert result is parsed[statement]
+
+    pool = engine._pool
+    assert pool['tables'] == ['customers', 'o', 'orders']
+    assert pool['aliases'] == [{'o': 'orders'}]
+
+def test_changed_statements_are_parsed_again():
+    engine = SQLAutocompleteEngine(Model())
+    text = script + 'SELECT * FROM '
+    engine.get_suggestions(text, len(text))
+
+    text = text.replace('orders AS o', 'products AS p')
+    engine.get_suggestions(text, len(text))
+    assert engine._pool['tables'] == ['customers', 'p', 'products']
+    assert engine._pool['aliases'] == [{'p': 'products'}]
@@ -0,0 +1,145 @@
+import time
+import threading
+import pytest
+
+from mitzasql.db.connection import Connection
+from mitzasql.db.catalog import (SchemaCatalog, NameIndex)
+from mitzasql.db.executor import executor_instance
+from mitzasql.db.model import (TableModel, DBTablesModel, QueryModel, is_ddl)
+from .connection_fixture import sakila_connection
+from .test_executor import FakeLoop
+
+class Cursor:
+    description = ()
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+class CatalogConnection:
+    '''Serves the schema of a database from memory and records the catalog
+    queries. The columns of all the tables are served once `ready` is set'''
+    def __init__(self, tables, queries=None, ready=None):
+        self.tables = tables
+        self.queries = [] if queries is None else queries
+        self.ready = ready
+
+    def spare(self):
+        return CatalogConnection(self.tables, self.queries, self.ready)
+
+    def close(self):
+        pass
+
+    def query(self, query, params=None):
+        if query == 'SHOW DATABASES':
+            return Cursor([('shop',)])
+        if 'INFORMATION_SCHEMA.ROUTINES' in query:
+            self.queries.append('objects')
+            return Cursor([(table, 0, 0, None, None, 'InnoDB', '', 'BASE TABLE')
+                for table in self.tables])
+
+        table = params.get('table_name')
+        self.queries.append(('columns', table))
+        if table is None and self.ready is not None:
+            self.ready.wait(5)
+        return Cursor([(name, 'id', None, 'NO', 'int', None, 10, 0, None,
+            None, 'PRI', '') for name in self.tables if table in (None, name)])
+
+def test_name_index_finds_names_by_prefix():
+    index = NameIndex(['film', 'Film_actor', 'actor', 'film_text', 'category'])
+    assert index.find('FILM') == ['film', 'Film_actor', 'film_text']
+    assert index.find('x') == []
+    assert index.find() == index.names
+    assert index.get('FILM_ACTOR') == 'Film_actor'
+    assert 'Actor' in index
+
+def test_ddl_statements_are_detected():
+    assert is_ddl('CREATE TABLE t (id INT)')
+    assert is_ddl(b'  alter table t add column c int')
+    assert is_ddl(None)
+    assert not is_ddl('INSERT INTO t VALUES (1)')
+    assert not is_ddl('')
+
+def test_catalog_is_shared_by_the_session(sakila_connection):
+    catalog = SchemaCatalog.get(sakila_connection)
+    assert SchemaCatalog.get(sakila_connection.fresh) is catalog
+
+def test_catalog_serves_the_objects_from_memory(sakila_connection):
+    catalog = SchemaCatalog.get(sakila_connection)
+    catalog.invalidate()
+    assert 'actor' in catalog.tables(sakila_connection, 'SAKILA')
+
+    Connection.QUERY_LOG.clear()
+    assert 'film_in_stock' in catalog.routines(sakila_connection, 'sakila').names
+    assert 'ins_film' in catalog.triggers(sakila_connection, 'sakila').names
+    assert catalog.columns(sakila_connection, 'sakila', 'ACTOR')[0] == 'actor_id'
+    assert 'sakila' in catalog.databases(sakila_connection)
+    model = TableModel(sakila_connection, 'actor')
+    assert model._table_schema.seek_key == ['actor_id']
+    model = DBTablesModel(sakila_connection, 'sakila')
+    assert len(model) >= 35
+
+    queries = [entry[1] for entry in Connection.QUERY_LOG]
+    assert not any('information_schema' in query.lower() for query in queries)
+
+def test_catalog_is_invalidated_by_ddl(sakila_connection):
+    catalog = SchemaCatalog.get(sakila_connection)
+    sakila_connection.query('DROP TABLE IF EXISTS catalog_test')
+    assert 'catalog_test' not in catalog.tables(sakila_connection, 'sakila')
+
+    QueryModel(sakila_connection, 'CREATE TABLE catalog_test (id INT)')
+    assert 'catalog_test' in catalog.tables(sakila_connection, 'sakila')
+
+    QueryModel(sakila_connection, 'DROP TABLE catalog_test')
+    assert 'catalog_test' not in catalog.tables(sakila_connection, 'sakila')
+
+def test_reloading_table_refreshes_its_columns(sakila_connection):
+    sakila_connection.query('DROP TABLE IF EXISTS catalog_test')
+    sakila_connection.query('CREATE TABLE catalog_test (id INT)')
+    model = TableModel(sakila_connection, 'catalog_test')
+    assert len(model.columns) == 1
+
+    sakila_connection.query('ALTER TABLE catalog_test ADD COLUMN name TEXT')
+    model.reload()
+    assert len(model.columns) == 2
+    sakila_connection.query('DROP TABLE catalog_test')
+
+def test_catalog_loads_the_columns_of_the_requested_table_first():
+    ready = threading.Event()
+    connection = CatalogConnection(['actor', 'film'], ready=ready)
+    catalog = SchemaCatalog()
+    executor_instance.start(FakeLoop())
+    try:
+        assert catalog.columns(connection, 'shop', 'film') == ['id']
+        assert ('columns', 'film') in connection.queries
+        assert not catalog.database(connection, 'shop').columns_loaded
+
+        ready.set()
+        start = time.time()
+        while (not catalog.database(connection, 'shop').columns_loaded and
+                time.time() - start < 5):
+            time.sleep(0.01)
+    finally:
+        ready.set()
+        executor_instance.stop()
+
+    assert connection.queries.count(('columns', None)) == 1
+    del connection.queries[:]
+    assert catalog.columns(connection, 'shop', 'actor') == ['id']
+    assert connection.queries == []
+
+def test_catalog_miss_reloads_only_the_objects_and_the_table():
+    connection = CatalogConnection(['actor'])
+    catalog = SchemaCatalog()
+    assert catalog.columns(connection, 'shop', 'actor') == ['id']
+    assert catalog.database(connection, 'shop').columns_loaded
+
+    connection.tables.append('film')
+    del connection.queries[:]
+    catalog.database(connection, 'shop').objects_loaded_at -= \
+            SchemaCatalog.MISS_RELOAD_INTERVAL + 1
+    assert catalog.table_schema(connection, 'shop', 'film') is not None
+    assert connection.queries == ['objects', ('columns', 'film')]
+    assert 'film' in catalog.tables(connection, 'shop')
@@ -0,0 +1,162 @@
+import os
+import time
+import threading
+import pytest
+
+import mysql.connector.errors as errors
+from mysql.connector import errorcode
+from mitzasql.db.connection import (Connection, ConnectionPool)
+
+db_host = os.getenv('DB_HOST', 'tcp://localhost')
+db_port = os.getenv('DB_PORT', '3306')
+db_username = os.getenv('DB_USER', 'root')
+db_password = os.getenv('DB_PASS', '')
+
+@pytest.fixture
+def con_data():
+    return {
+            'host': db_host,
+            'port': db_port,
+            'username': db_username,
+            'password': db_password,
+            'database': 'sakila'
+            }
+
+@pytest.fixture
+def pool(con_data):
+    pool = ConnectionPool(con_data, max_size=2)
+    yield pool
+    pool.close()
+
+def test_pool_reuses_released_connections(pool):
+    con = pool.acquire('sakila')
+    pool.release(con)
+    assert pool.size == 1
+    assert pool.idle_size == 1
+
+    assert pool.acquire('sakila') is con
+    assert pool.size == 1
+    assert pool.idle_size == 0
+
+def test_pool_resets_the_session_state_on_lease(pool):
+    con = pool.acquire('sakila')
+    cursor = con.cursor(buffered=True)
+    cursor.execute('SET @leased = 1')
+    cursor.execute('USE mysql')
+    pool.release(con)
+
+    con = pool.acquire('sakila')
+    cursor = con.cursor(buffered=True)
+    cursor.execute('SELECT @leased, DATABASE()')
+    assert cursor.fetchall() == [(None, 'sakila')]
+
+def test_pool_enforces_max_size(pool, monkeypatch):
+    monkeypatch.setattr(ConnectionPool, 'LEASE_TIMEOUT', 0.1)
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(errors.PoolError):
+        pool.acquire()
+
+def test_pool_evicts_idle_connections(con_data):
+    pool = ConnectionPool(con_data, max_size=2, max_idle_time=0.1)
+    con = pool.acquire()
+    pool.release(con)
+    time.sleep(0.2)
+
+    assert pool.acquire() is not con
+    assert pool.size == 1
+    pool.close()
+
+def test_pool_closes_connections_with_unread_results(pool):
+    con = pool.acquire('sakila')
+    cursor = con.cursor(buffered=False)
+    cursor.execute('SELECT * FROM film')
+    cursor.fetchone()
+    pool.release(con)
+
+    assert pool.size == 0
+    assert con.is_connected() is False
+
+def test_fresh_connections_share_the_pool(con_data):
+    con, error = Connection.factory(con_data, 'pool test')
+    assert error is None
+    fresh = con.fresh
+    assert fresh.pool is con.pool
+    assert con.pool.size == 2
+
+    fresh.close()
+    assert con.pool.idle_size == 1
+
+    fresh = con.fresh
+    assert con.pool.size == 2
+    assert con.pool.idle_size == 0
+    ConnectionPool.close_all()
+
+def test_cancel_interrupts_the_running_query(pool, con_data):
+    connection = Connection(con_data, pool=pool)
+    connection_id = connection.con.connection_id
+    result = []
+
+    def run():
+        try:
+            connection.query('SELECT COUNT(*) FROM film a, film b, film c')
+        except errors.Error as e:
+            result.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.5)
+    assert connection.cancel() is True
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert result[0].errno == errorcode.ER_QUERY_INTERRUPTED
+
+    # The session survives the cancelled query
+    cursor = connection.query('SELECT 1')
+    assert cursor.fetchall() == [(1,)]
+    assert connection.con.connection_id == connection_id
+    connection.close()
+
+def test_pool_fails_at_once_when_not_waiting(pool, monkeypatch):
+    monkeypatch.setattr(ConnectionPool, 'LEASE_TIMEOUT', 5)
+    # Both slots are taken
+    pool._size = pool.max_size
+
+    start = time.time()
+    with pytest.raises(errors.PoolError):
+        pool.acquire(wait=False)
+    assert time.time() - start < 1
+
+def test_pool_closes_expired_connections_without_the_lock(pool):
+    closed = []
+
+    class ExpiredConnection:
+        def close(self):
+            closed.append(pool._lock._is_owned())
+
+    pool._size = 1
+    pool._idle.append((ExpiredConnection(), time.time() - pool.max_idle_time - 1))
+
+    assert pool._lease() == (None, None)
+    assert closed == [False]
+    assert pool.size == 1
+    assert pool.idle_size == 0
+
+def test_pools_are_keyed_by_the_server_and_user(con_data):
+    con_data = dict(con_data, password='secret')
+    socket_data = dict(con_data, host='unix:///tmp/mysql.sock')
+    tcp_pool = ConnectionPool.get(con_data, 'pool test')
+    socket_pool = ConnectionPool.get(socket_data, 'pool test')
+    assert tcp_pool is not socket_pool
+    assert ConnectionPool.get(dict(con_data), 'pool test') is tcp_pool
+
+    for key in ConnectionPool._pools:
+        assert 'secret' not in key
+
+    # Changing the password of the session replaces its pool
+    changed_pool = ConnectionPool.get(dict(con_data, password='changed'),
+            'pool test')
+    assert changed_pool is not tcp_pool
+    assert tcp_pool.closed
+    ConnectionPool.close_all()
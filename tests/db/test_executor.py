@@ -0,0 +1,153 @@
+import os
+import threading
+import pytest
+
+import urwid
+from mitzasql.db.executor import Executor
+
+class FakeLoop:
+    '''Implements the part of urwid.MainLoop used by the executor'''
+    def __init__(self):
+        self._callback = None
+        self._read_fd = None
+
+    def watch_pipe(self, callback):
+        self._read_fd, write_fd = os.pipe()
+        self._callback = callback
+        return write_fd
+
+    def remove_watch_pipe(self, write_fd):
+        os.close(self._read_fd)
+
+    def run_once(self):
+        '''Wait for the worker to write to the pipe and dispatch the results'''
+        data = os.read(self._read_fd, 1024)
+        self._callback(data)
+
+class Emitter:
+    signals = ['done']
+
+    def __init__(self):
+        urwid.register_signal(self.__class__, self.signals)
+
+@pytest.fixture
+def loop():
+    return FakeLoop()
+
+@pytest.fixture
+def executor(loop):
+    executor = Executor()
+    executor.start(loop)
+    yield executor
+    executor.stop()
+
+def test_executor_runs_jobs_synchronously_without_main_loop():
+    executor = Executor()
+    results = []
+    executor.submit(lambda a, b: a + b, 1, 2, callback=results.append)
+    assert results == [3]
+
+def test_executor_runs_jobs_on_worker_thread(executor, loop):
+    main_thread = threading.current_thread()
+    threads = []
+    results = []
+
+    def job():
+        threads.append(threading.current_thread())
+        return 'result'
+
+    def callback(result):
+        threads.append(threading.current_thread())
+        results.append(result)
+
+    executor.submit(job, callback=callback)
+    assert results == []
+
+    loop.run_once()
+    assert results == ['result']
+    assert threads[0] is not main_thread
+    assert threads[1] is main_thread
+
+def test_executor_emits_signals_on_main_thread(executor, loop):
+    emitter = Emitter()
+    events = []
+
+    def on_done(emitter, value):
+        events.append((threading.current_thread(), value))
+
+    urwid.connect_signal(emitter, 'done', on_done)
+
+    def job():
+        executor.emit_signal(emitter, 'done', emitter, 1)
+        return 2
+
+    executor.submit(job, callback=lambda result: events.append(result))
+
+    while len(events) < 2:
+        loop.run_once()
+
+    assert events[0] == (threading.current_thread(), 1)
+    assert events[1] == 2
+
+def test_executor_runs_background_jobs_while_a_job_is_running(executor, loop):
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def job():
+        started.set()
+        release.wait(5)
+        return 'job'
+
+    def background_job():
+        started.wait(5)
+        return 'background'
+
+    executor.submit(job, callback=results.append)
+    executor.submit_background(background_job, callback=results.append)
+
+    loop.run_once()
+    assert results == ['background']
+
+    release.set()
+    loop.run_once()
+    assert results == ['background', 'job']
+
+def test_executor_calls_the_callback_of_a_failed_job(executor, loop):
+    results = []
+
+    def job():
+        raise ValueError('bug')
+
+    executor.submit(job, callback=results.append)
+    executor.submit(lambda: 'next', callback=results.append)
+    while len(results) < 2:
+        loop.run_once()
+    assert results == [None, 'next']
+
+def test_executor_runs_jobs_of_different_keys_in_parallel(executor, loop):
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow_job():
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    def job(value):
+        started.wait(5)
+        return value
+
+    executor.submit(slow_job, callback=results.append, key='query')
+    executor.submit(job, 'queued', callback=results.append, key='query')
+    executor.submit(job, 'table', callback=results.append, key='table')
+
+    loop.run_once()
+    assert results == ['table']
+
+    release.set()
+    while len(results) < 3:
+        loop.run_once()
+    # The jobs of a key run in order
+    assert results == ['table', 'slow', 'queued']
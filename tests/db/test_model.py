@@ -1,6 +1,9 @@
 import pytest
 
-from mitzasql.db.model import Model
+import urwid
+from mitzasql.db.model import Model, MysqlModel, QueryModel
+from mitzasql.db.spill_store import SpillStore
+from mitzasql.db.query_log import WordUsage
 
 
 @pytest.fixture
@@ -61,3 +64,105 @@ def test_model_search_returns_none_in_reverse(basic_dataset, basic_columns):
     model = Model(basic_dataset, basic_columns)
     result = model.search('8', 1, pos=1, reverse=True)
     assert result is None
+
+def test_model_searches_all_columns(basic_dataset, basic_columns):
+    model = Model(basic_dataset, basic_columns)
+    result = model.search('9', None)
+    assert result == (2, (7, 8, 9))
+
+class Connection:
+    '''Records the queries interrupted by the models'''
+    def __init__(self):
+        self.con = self
+        self.connection_id = 7
+        self.killed = []
+
+    def cancel(self, connection_id=None):
+        self.killed.append(connection_id)
+        return True
+
+class JobModel(MysqlModel):
+    def __init__(self, connection, job=None):
+        self.job = job
+        super().__init__(connection)
+
+    def _query_db(self):
+        if self.job is not None:
+            self.job()
+
+def test_model_cancel_interrupts_the_connection_running_its_job():
+    connection = Connection()
+    result = []
+
+    def job():
+        result.append(model.cancel())
+
+    model = JobModel(connection)
+    # The connection was leased again since the model was created
+    connection.connection_id = 9
+    model.job = job
+    model.reload()
+    assert result == [True]
+    assert connection.killed == [9]
+    assert model.cancel() is False
+
+def test_model_cancel_does_not_interrupt_the_jobs_of_other_models():
+    connection = Connection()
+    waiting = JobModel(connection)
+    result = []
+
+    def job():
+        # The job of `waiting` is queued behind this one
+        waiting.loading = True
+        result.append(waiting.cancel())
+
+    JobModel(connection, job)
+    assert result == [True]
+    assert connection.killed == []
+
+def test_model_reports_the_error_of_a_failed_job():
+    def job():
+        raise ValueError('bug')
+
+    errors = []
+    model = JobModel(Connection())
+    urwid.connect_signal(model, model.SIGNAL_ERROR,
+            lambda emitter, error: errors.append(error))
+    model.job = job
+    model.reload()
+    assert model.loading is False
+    assert isinstance(model.last_error, ValueError)
+    assert errors == [model.last_error]
+    assert len(model) == 0
+
+class Cursor:
+    with_rows = False
+    rowcount = 1
+    statement = 'UPDATE film SET rental_rate = 1'
+
+class QueryConnection(Connection):
+    '''Runs every statement as an UPDATE'''
+    WORD_USAGE = WordUsage()
+    session_name = 'model test'
+
+    def query(self, query, params=None, multi=False, buffered=True):
+        return [Cursor() for statement in query.split(';')]
+
+def test_query_model_removes_the_rows_it_replaces(monkeypatch):
+    closed = []
+
+    class Store(SpillStore):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr('mitzasql.db.model.SpillStore', Store)
+    model = QueryModel(QueryConnection(), 'UPDATE film; UPDATE film')
+    # Only the result of the last statement is kept
+    assert len(closed) == 1
+    data = model.data
+
+    model.reload()
+    assert closed[-1] is data
+    assert model.data is not data
+    assert model.affected_rows == 1
@@ -0,0 +1,62 @@
+import time
+import pytest
+
+from mitzasql.db.connection import Connection
+from mitzasql.db.model import TableModel
+from mitzasql.db.page_cache import (PageCache, CachedCursor, estimate_size)
+from .connection_fixture import sakila_connection
+
+def test_cache_evicts_least_recently_used_entries():
+    rows = [(1, 'a' * 100)]
+    size = estimate_size(rows)
+    cache = PageCache(max_size=size * 2)
+
+    cache.put(('s', 'db', 'a'), rows)
+    cache.put(('s', 'db', 'b'), rows)
+    assert cache.get(('s', 'db', 'a')) == rows
+
+    cache.put(('s', 'db', 'c'), rows)
+    assert cache.get(('s', 'db', 'b')) is None
+    assert cache.get(('s', 'db', 'a')) == rows
+    assert cache.get(('s', 'db', 'c')) == rows
+    assert cache.size <= size * 2
+
+def test_cache_entries_expire():
+    cache = PageCache(ttl=0.01)
+    cache.put(('s', 'db', 'a'), [(1,)])
+    time.sleep(0.02)
+    assert cache.get(('s', 'db', 'a')) is None
+    assert len(cache) == 0
+
+def test_cache_invalidates_by_key_prefix():
+    cache = PageCache()
+    cache.put(('s', 'db', 'a', 'rows'), [(1,)])
+    cache.put(('s', 'db', 'b', 'rows'), [(1,)])
+    cache.put(('t', 'db', 'a', 'rows'), [(1,)])
+
+    cache.invalidate('s', 'db', 'a')
+    assert ('s', 'db', 'a', 'rows') not in cache
+    assert ('s', 'db', 'b', 'rows') in cache
+
+    cache.invalidate('s')
+    assert len(cache) == 1
+
+def test_cached_cursor_returns_copies():
+    cursor = CachedCursor([(1,), (2,)], [('id', 3)])
+    rows = cursor.fetchall()
+    rows.append((3,))
+    assert cursor.fetchall() == [(1,), (2,)]
+    assert cursor.rowcount == 2
+
+def test_model_serves_seen_pages_from_cache(sakila_connection):
+    model = TableModel(sakila_connection, 'film')
+    model.sort('title', 'desc')
+    model.sort('title', 'asc')
+
+    Connection.QUERY_LOG.clear()
+    model.sort('title', 'desc')
+    assert len(Connection.QUERY_LOG) == 0
+    assert len(model) == 1000
+
+    model.reload(reset_limit=False, reset_order=False, reset_where=False)
+    assert len(Connection.QUERY_LOG) > 0
@@ -0,0 +1,69 @@
+import pytest
+from datetime import datetime
+
+from mitzasql.db.query_log import (QueryLog, digest)
+
+def test_digest_replaces_literals():
+    query = "select * from actor where first_name = 'Nick' and actor_id > 10"
+    assert digest(query) == 'SELECT * FROM actor WHERE first_name = ? AND actor_id > ?'
+
+def test_digest_ignores_whitespace_comments_and_case():
+    assert digest('select  *\nfrom actor -- all\n where actor_id = 1') == \
+            digest('SELECT * FROM actor WHERE actor_id = -20')
+
+def test_digest_collapses_lists():
+    assert digest('SELECT * FROM actor WHERE actor_id IN (1, 2, 3)') == \
+            'SELECT * FROM actor WHERE actor_id IN (...)'
+    assert digest("INSERT INTO t (a, b) VALUES (1, 'a'), (2, 'b')") == \
+            'INSERT INTO t (a, b) VALUES (...)'
+
+def test_digest_replaces_param_placeholders():
+    assert digest('SELECT COUNT(*) FROM t WHERE a = %(a)s AND b = %s') == \
+            'SELECT COUNT(*) FROM t WHERE a = ? AND b = ?'
+
+def test_log_keeps_the_last_entries():
+    log = QueryLog(max_size=3)
+    for i in range(10):
+        log.append((datetime.now(), 'SELECT {0}'.format(i), None, 0.1))
+
+    assert len(log) == 3
+    assert [entry[1] for entry in log] == ['SELECT 7', 'SELECT 8', 'SELECT 9']
+
+def test_log_aggregates_durations_per_digest():
+    log = QueryLog(max_size=2)
+    for i in range(1, 101):
+        log.append((datetime.now(), 'SELECT * FROM t WHERE id = {0}'.format(i),
+            None, i / 100))
+    log.append((datetime.now(), 'SHOW DATABASES', None, 0.5))
+
+    stats = log.stats()
+    assert [s.digest for s in stats] == ['SELECT * FROM t WHERE id = ?', 'SHOW DATABASES']
+    assert stats[0].count == 100
+    assert stats[0].total == pytest.approx(50.5)
+    assert stats[0].mean == pytest.approx(0.505)
+    assert stats[0].p50 == pytest.approx(0.5)
+    assert stats[0].p95 == pytest.approx(0.95)
+    assert stats[0].max == pytest.approx(1)
+
+def test_log_normalizes_only_the_start_of_long_queries():
+    log = QueryLog()
+    log.MAX_DIGEST_LENGTH = 40
+    for i in range(3):
+        values = ', '.join('({0}, {1})'.format(i, j) for j in range(1000))
+        log.append((datetime.now(), 'INSERT INTO t (a, b) VALUES ' + values,
+            None, 0.1))
+
+    stats = log.stats()
+    assert [s.digest for s in stats] == ['INSERT INTO t (a, b) VALUES (...), (?, ...']
+    assert stats[0].count == 3
+
+def test_clear_drops_the_cached_digests():
+    log = QueryLog()
+    log.append((datetime.now(), 'SELECT 1', None, 0.1))
+    assert len(log._digests) == 1
+    assert 'SELECT 1' not in log._digests
+
+    log.clear()
+    assert len(log) == 0
+    assert log.stats() == []
+    assert len(log._digests) == 0
@@ -1,10 +1,14 @@
 import os
+import time
 import pytest
 
 import urwid
 import mysql.connector.errors as errors
+from mysql.connector import errorcode
 from mitzasql.db.model import QueryModel
+from mitzasql.db.executor import executor_instance
 from .connection_fixture import sakila_connection
+from .test_executor import FakeLoop
 
 def test_model_fetches_data(sakila_connection):
     query = 'SELECT address_id, address, location FROM address LIMIT 10'
@@ -16,7 +20,118 @@ def test_model_fetches_data(sakila_connection):
     assert 'address' in [c['name'] for c in model.columns]
     assert 'location' in [c['name'] for c in model.columns]
 
+def test_model_counts_the_words_of_the_statement(sakila_connection):
+    sakila_connection.WORD_USAGE.clear()
+    QueryModel(sakila_connection, 'SELECT * FROM film_text LIMIT 1')
+    QueryModel(sakila_connection, 'SELECT * FROM no_such_table')
+    usage = sakila_connection.WORD_USAGE.usage()
+    assert usage['film_text'] == 1
+    assert 'no_such_table' not in usage
+
 def test_model_sets_last_error_when_query_is_invalid(sakila_connection):
     query = 'SELECT unknown_column, address, location FROM address LIMIT 10'
     model = QueryModel(sakila_connection, query)
     assert isinstance(model.last_error, errors.ProgrammingError)
+
+def test_streaming_model_fetches_rows_in_batches(sakila_connection):
+    query = 'SELECT film_id, title FROM film ORDER BY film_id'
+    model = QueryModel(sakila_connection, query, streaming=True)
+    assert model.last_error is None
+    assert model.has_rows is True
+    assert model.streaming is True
+    assert len(model) == QueryModel.STREAM_BATCH_SIZE
+
+    batches = []
+    def on_new_data(model, data, data_length):
+        batches.append(data_length)
+    urwid.connect_signal(model, model.SIGNAL_NEW_DATA, on_new_data)
+
+    while model.streaming:
+        model.fetch_next_batch()
+
+    assert len(model) == 1000
+    assert sum(batches) == 1000 - QueryModel.STREAM_BATCH_SIZE
+    assert [row[0] for row in model] == list(range(1, 1001))
+
+def test_streaming_model_discards_unread_rows_on_reload(sakila_connection):
+    query = 'SELECT film_id, title FROM film ORDER BY film_id'
+    model = QueryModel(sakila_connection, query, streaming=True)
+    assert model.streaming is True
+
+    model.query = 'SELECT actor_id FROM actor LIMIT 10'
+    model.reload()
+    assert model.last_error is None
+    assert model.streaming is False
+    assert len(model) == 10
+
+def test_streaming_model_runs_the_statements_following_a_result_set(sakila_connection):
+    query = 'SELECT film_id FROM film; SELECT actor_id FROM actor LIMIT 10'
+    model = QueryModel(sakila_connection, query, streaming=True)
+    assert model.streaming is True
+
+    loaded = []
+    urwid.connect_signal(model, model.SIGNAL_LOAD, lambda model: loaded.append(True))
+
+    while model.streaming:
+        model.fetch_next_batch()
+
+    assert model.last_error is None
+    assert loaded == [True]
+    assert len(model) == 10
+
+def test_cancelled_model_does_not_emit_error(sakila_connection):
+    loop = FakeLoop()
+    executor_instance.start(loop)
+    events = []
+    try:
+        query = 'SELECT COUNT(*) FROM film a, film b, film c'
+        model = QueryModel(sakila_connection, query)
+        urwid.connect_signal(model, model.SIGNAL_ERROR,
+                lambda *args: events.append('error'))
+        urwid.connect_signal(model, model.SIGNAL_CANCEL,
+                lambda *args: events.append('cancel'))
+
+        time.sleep(0.5)
+        assert model.cancel() is True
+        while model.loading:
+            loop.run_once()
+    finally:
+        executor_instance.stop()
+
+    assert events == ['cancel']
+    assert model.cancelled is True
+    assert model.last_error.errno == errorcode.ER_QUERY_INTERRUPTED
+
+def test_cancel_does_not_interrupt_the_query_of_another_model(sakila_connection):
+    loop = FakeLoop()
+    executor_instance.start(loop)
+    try:
+        query = 'SELECT COUNT(*), SLEEP(1) FROM film LIMIT 1'
+        running = QueryModel(sakila_connection, query)
+        time.sleep(0.2)
+        # Waits for the query of the first model
+        waiting = QueryModel(sakila_connection, 'SELECT 1')
+        assert waiting.cancel() is True
+        while running.loading or waiting.loading:
+            loop.run_once()
+    finally:
+        executor_instance.stop()
+
+    assert running.last_error is None
+    assert running.cancelled is False
+    assert waiting.cancelled is True
+
+def test_cancel_stops_streaming_between_batches(sakila_connection):
+    query = 'SELECT film_id FROM film'
+    model = QueryModel(sakila_connection, query, streaming=True)
+    assert model.streaming is True
+
+    cancelled = []
+    urwid.connect_signal(model, model.SIGNAL_CANCEL,
+            lambda model: cancelled.append(True))
+
+    assert model.cancel() is True
+    assert cancelled == [True]
+    assert model.cancelled is True
+    assert model.streaming is False
+    assert len(model) == QueryModel.STREAM_BATCH_SIZE
@@ -0,0 +1,57 @@
+import datetime
+from decimal import Decimal
+
+from mysql.connector import (FieldType, FieldFlag)
+from mitzasql.db.raw_row import (RowDecoder, RawRow)
+from mitzasql.db.model import TableModel
+from .connection_fixture import sakila_connection
+
+def column(name, field_type, flags=0):
+    return (name, field_type, None, None, None, None, 1, flags)
+
+description = [
+        column('id', FieldType.LONG),
+        column('created', FieldType.DATETIME),
+        column('price', FieldType.NEWDECIMAL),
+        column('duration', FieldType.TIME),
+        column('active', FieldType.BIT),
+        column('data', FieldType.BLOB, FieldFlag.BLOB | FieldFlag.BINARY),
+        column('name', FieldType.VAR_STRING),
+        column('tags', FieldType.STRING, FieldFlag.SET),
+        column('deleted', FieldType.DATETIME)
+        ]
+
+raw = (bytearray(b'12'), bytearray(b'2006-02-15 04:34:33'),
+        bytearray(b'4.99'), bytearray(b'838:59:59'), bytearray(b'\x01'),
+        bytearray(b'\xff\x00'), bytearray('héllo'.encode('utf-8')),
+        bytearray(b'a,b'), None)
+
+def test_raw_row_decodes_values_for_display():
+    row = RawRow(raw, RowDecoder(description))
+    assert row.display() == ['12', '2006-02-15 04:34:33', '4.99',
+            '838:59:59', 1, bytearray(b'\xff\x00'), 'héllo', 'a,b', None]
+    assert row.display_value(6) == 'héllo'
+
+def test_raw_row_converts_values_to_python_types():
+    row = RawRow(raw, RowDecoder(description))
+    assert row[0] == 12
+    assert row[1] == datetime.datetime(2006, 2, 15, 4, 34, 33)
+    assert row[2] == Decimal('4.99')
+    assert row[3] == datetime.timedelta(hours=838, minutes=59, seconds=59)
+    assert row[4] == 1
+    assert row[5] == b'\xff\x00'
+    assert row[7] == {'a', 'b'}
+    assert row[-1] is None
+    assert row[0:2] == (12, datetime.datetime(2006, 2, 15, 4, 34, 33))
+    assert row == tuple(row)
+
+def test_table_model_fetches_raw_rows(sakila_connection):
+    model = TableModel(sakila_connection, 'payment')
+    row = model.data[0]
+    assert isinstance(row, RawRow)
+    assert row[0] == 1
+    assert isinstance(row[4], Decimal)
+    assert row.display()[4] == str(row[4])
+
+    model.load_next_set()
+    assert [row[0] for row in model.data] == list(range(1, 201))
@@ -0,0 +1,60 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from mysql.connector import FieldType
+from mitzasql.db.result_store import ResultStore
+from mitzasql.db.raw_row import (RowDecoder, RawRow)
+
+rows = [
+        (1, 'first', 1.5, Decimal('4.99'), b'\x00\x01', None),
+        (2, None, None, None, None, datetime.date(2021, 1, 1)),
+        (None, 'third', 3.0, Decimal('0.99'), b'', datetime.date(2021, 1, 2)),
+        (2 ** 64, 'ünicode', -1.0, None, b'\xff', None)
+        ]
+
+def test_store_returns_the_stored_rows():
+    store = ResultStore(rows)
+    assert len(store) == 4
+    assert list(store) == rows
+    assert store[0] == rows[0]
+    assert store[-1] == rows[-1]
+    assert store[1:3] == rows[1:3]
+
+    with pytest.raises(IndexError):
+        store[4]
+
+def test_store_keeps_columns_in_compact_form():
+    store = ResultStore(rows[0:3])
+    kinds = [column.kind for column in store._columns]
+    assert kinds == ['int', 'str', 'float', 'object', 'bytes', 'object']
+
+    # Unsigned BIGINT past the signed range
+    store.append(rows[3])
+    assert store._columns[0].kind == 'object'
+    assert list(store) == rows
+
+def test_store_extends_and_clears():
+    store = ResultStore()
+    assert len(store) == 0
+    store.extend(rows)
+    store.extend(rows)
+    assert len(store) == 8
+    assert store[5] == rows[1]
+
+    store.clear()
+    assert len(store) == 0
+    assert list(store) == []
+
+def test_store_returns_raw_rows():
+    description = [('id', FieldType.LONG, None, None, None, None, 0, 0)]
+    decoder = RowDecoder(description)
+    store = ResultStore([RawRow((bytearray(b'1'),), decoder),
+        RawRow((None,), decoder)])
+
+    row = store[0]
+    assert isinstance(row, RawRow)
+    assert row[0] == 1
+    assert row.display() == ['1']
+    assert store[1][0] is None
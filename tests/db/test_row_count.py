@@ -0,0 +1,54 @@
+import os
+import pytest
+
+from mitzasql.db.connection import Connection
+from mitzasql.db.model import TableModel
+from mitzasql.db.page_cache import page_cache_instance
+from mitzasql.db.row_count import (ExactCount, EstimatedCount, LazyExactCount)
+from .connection_fixture import sakila_connection
+
+def count_queries():
+    return len([q for d, q, p, t in Connection.QUERY_LOG if 'COUNT(*)' in q])
+
+def test_exact_count(sakila_connection):
+    strategy = ExactCount()
+    assert strategy.count(sakila_connection, 'sakila', 'film') == (1000, False)
+    assert strategy.count(sakila_connection, 'sakila', 'film',
+            'film_id <= 10') == (10, False)
+
+def test_estimated_count(sakila_connection):
+    strategy = EstimatedCount()
+    count, estimated = strategy.count(sakila_connection, 'sakila', 'film')
+    assert estimated is True
+    assert count > 0
+
+    count, estimated = strategy.count(sakila_connection, 'sakila', 'film',
+            'film_id <= 10')
+    assert estimated is True
+    assert count > 0
+
+def test_estimated_count_falls_back_to_exact_count_for_views(sakila_connection):
+    strategy = EstimatedCount()
+    count, estimated = strategy.count(sakila_connection, 'sakila', 'actor_info')
+    assert (count, estimated) == (200, False)
+
+def test_lazy_count_swaps_in_the_exact_count(sakila_connection):
+    strategy = LazyExactCount()
+    strategy.EXACT_COUNT_THRESHOLD = 0
+    page_cache_instance.clear()
+    model = TableModel(sakila_connection, 'film', count_strategy=strategy)
+
+    # Without a main loop the exact count runs right after the estimate
+    assert model.rowcount_estimated is False
+    assert len(model) == 1000
+
+def test_model_does_not_recount_when_sorting(sakila_connection):
+    model = TableModel(sakila_connection, 'film', count_strategy=ExactCount())
+    Connection.QUERY_LOG.clear()
+
+    model.sort('title', 'desc')
+    assert count_queries() == 0
+    assert len(model) == 1000
+
+    model.reload(reset_limit=False, reset_order=False, reset_where=False)
+    assert count_queries() == 1
@@ -0,0 +1,66 @@
+import os
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from mysql.connector import FieldType
+from mitzasql.db.spill_store import (SpillStore, encode_row, decode_row)
+from mitzasql.db.raw_row import (RowDecoder, RawRow)
+
+rows = [
+        (1, 'first', 1.5, Decimal('4.99'), b'\x00\x01', None),
+        (2, None, None, None, bytearray(b'ab'), datetime.date(2021, 1, 1)),
+        (None, 'third', 3.0, Decimal('0.99'), b'', datetime.date(2021, 1, 2)),
+        (2 ** 64, 'ünicode', -1.0, None, b'\xff', None)
+        ]
+
+def test_encoded_rows_decode_to_the_same_values():
+    for row in rows:
+        assert decode_row(encode_row(row), 0) == row
+
+def test_store_keeps_small_results_in_memory(tmp_path):
+    store = SpillStore(rows, path=str(tmp_path))
+    assert not store.spilled
+    assert list(store) == rows
+    assert os.listdir(tmp_path) == []
+
+def test_store_spills_rows_past_the_memory_limit(tmp_path):
+    store = SpillStore(rows, memory_limit=100, path=str(tmp_path))
+    assert store.spilled
+    assert len(store) == 4
+    assert list(store) == rows
+    assert store[-1] == rows[-1]
+    assert store[1:3] == rows[1:3]
+
+    with pytest.raises(IndexError):
+        store[4]
+
+    # Rows appended after the spill are readable right away
+    store.extend(rows)
+    assert len(store) == 8
+    assert store[5] == rows[1]
+    store.append(rows[0])
+    assert store[8] == rows[0]
+
+    store.close()
+    assert len(store) == 0
+    assert os.listdir(tmp_path) == []
+
+def test_store_returns_raw_rows_after_spilling(tmp_path):
+    description = [('id', FieldType.LONG, None, None, None, None, 0, 0)]
+    decoder = RowDecoder(description)
+    raw = [RawRow((bytearray(str(i).encode()),), decoder) for i in range(100)]
+    store = SpillStore(raw, memory_limit=1024, path=str(tmp_path))
+    assert store.spilled
+
+    row = store[42]
+    assert isinstance(row, RawRow)
+    assert row[0] == 42
+    assert row.display() == ['42']
+
+    store.clear()
+    assert len(store) == 0
+    store.append(raw[0])
+    assert not store.spilled
+    assert store[0][0] == 0
@@ -1,6 +1,7 @@
 import os
 import pytest
 
+import urwid
 import mysql.connector.errors as errors
 from mitzasql.db.model import TableModel
 from .connection_fixture import sakila_connection
@@ -123,3 +124,107 @@ counter INT NULL,
     assert model.last_error is None
 
 
+def test_model_pages_using_the_primary_key(sakila_connection):
+    model = TableModel(sakila_connection, table)
+    model.load_next_set()
+
+    assert model.loaded_rowcount == 200
+    assert [row[0] for row in model.data] == list(range(1, 201))
+
+def test_model_pages_sorted_rows_without_duplicates(sakila_connection):
+    model = TableModel(sakila_connection, table)
+    model.sort('first_name', 'desc')
+    model.load_next_set()
+
+    ids = [row[0] for row in model.data]
+    first_names = [row[1] for row in model.data]
+    assert len(ids) == 200
+    assert len(set(ids)) == 200
+    assert first_names == sorted(first_names, reverse=True)
+
+def test_model_pages_using_offset_when_table_has_no_key(sakila_connection):
+    sakila_connection.query('''
+CREATE TABLE IF NOT EXISTS `table_without_key` (
+counter INT NULL
+)
+    ''')
+    sakila_connection.query('TRUNCATE TABLE `table_without_key`')
+    values = ','.join(['({0})'.format(i) for i in range(0, 150)])
+    sakila_connection.query('INSERT INTO `table_without_key` VALUES {0}'.format(values))
+
+    model = TableModel(sakila_connection, 'table_without_key')
+    assert model._seek_order() is None
+
+    model.load_next_set()
+    assert model.last_error is None
+    assert model.loaded_rowcount == 150
+
+def test_model_prefetches_next_pages(sakila_connection):
+    model = TableModel(sakila_connection, 'film', prefetch_depth=2)
+    new_data = []
+
+    def new_data_handler(emitter, data, data_length):
+        new_data.append(data_length)
+
+    urwid.connect_signal(model, model.SIGNAL_NEW_DATA, new_data_handler)
+
+    assert model.prefetch() is True
+    assert model.prefetching is False
+    assert new_data == [200]
+    assert model.loaded_rowcount == 300
+
+    model.load_next_set()
+    ids = [row[0] for row in model.data]
+    assert ids == list(range(1, 401))
+
+def test_model_prefetches_full_pages_after_loading_the_last_page(sakila_connection):
+    model = TableModel(sakila_connection, 'customer', prefetch_depth=2)
+    assert len(model) == 599
+
+    # The last page is read backwards with a shorter limit
+    assert model.load_rows(598) is True
+    assert model.row(598)[0] == 599
+    assert model._limit == model.PAGINATION_LIMIT
+
+    new_data = []
+    urwid.connect_signal(model, model.SIGNAL_NEW_DATA,
+            lambda emitter, data, data_length: new_data.append(data_length))
+    assert model.prefetch() is True
+    assert new_data == [200]
+    assert len(model) == 599
+    assert model.rowcount_estimated is False
+
+def test_model_searches_rows_on_the_server(sakila_connection):
+    model = TableModel(sakila_connection, table)
+    results = []
+
+    model.search('thora', callback=results.append)
+    index, row = results[-1]
+    assert index == 199
+    assert row[0] == 200
+    # The rows in between are not loaded
+    assert model.loaded_rowcount == 100
+
+    model.search('thora', pos=index + 1, callback=results.append)
+    assert results[-1] is None
+
+    model.search('thora', pos=None, reverse=True, callback=results.append)
+    assert results[-1][0] == 199
+
+    model.search('non existent actor', callback=results.append)
+    assert results[-1] is None
+
+def test_model_loads_rows_without_loading_the_rows_before(sakila_connection):
+    model = TableModel(sakila_connection, 'film')
+    assert len(model) == 1000
+
+    assert model.load_rows(950) is True
+    assert model.row(950)[0] == 951
+    assert model.row(500) is None
+    assert model.loaded_rowcount == 100
+
+    # The pages next to a loaded page are read using the keyset
+    model.load_rows(850)
+    ids = [model.row(i)[0] for i in range(800, 1000)]
+    assert ids == list(range(801, 1001))
+    assert model.load_rows(850) is False
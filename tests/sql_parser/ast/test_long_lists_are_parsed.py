@@ -0,0 +1,44 @@
+import pytest
+from mitzasql.sql_parser.parser import parse
+from mitzasql.utils import walk_ast
+
+def test_huge_in_list_is_parsed():
+    ids = ', '.join(str(i) for i in range(20000))
+    ast = parse('SELECT * FROM t WHERE id IN ({0})'.format(ids))[0]
+
+    where = ast.get_child('where').children[0]
+    assert where.value == 'IN'
+    assert len(where.children[1].children) == 20000
+    assert where.children[1].children[-1].value == '19999'
+
+def test_multi_row_insert_is_parsed():
+    values = ', '.join("({0}, NOW())".format(i) for i in range(5000))
+    ast = parse('INSERT INTO t (id, created_at) VALUES {0}'.format(values))[0]
+
+    values = ast.get_child('values')
+    assert len(values.children) == 5000
+    row = values.children[-1]
+    assert row.children[0].value == '4999'
+    assert row.children[1].type == 'function'
+    assert row.children[1].value == 'NOW'
+
+def test_long_chain_of_conditions_is_parsed():
+    conditions = ' OR '.join('id = {0}'.format(i) for i in range(5000))
+    ast = parse('SELECT * FROM t WHERE {0} AND a = 1'.format(conditions))[0]
+
+    nodes = []
+    walk_ast(ast, nodes.append)
+    assert len([node for node in nodes if node.value == 'or']) == 4999
+    assert ast.get_child('where').get_last_child().value == '1'
+
+def test_function_without_arguments_ends_at_the_closing_paren():
+    ast = parse('UPDATE t SET a = NOW(), b = 2 WHERE id = 10')[0]
+
+    assert len(ast.get_child('assignment_list').children) == 2
+    function = ast.get_child('assignment_list').children[0].children[1]
+    assert function.type == 'function'
+    assert len(function.children) == 0
+
+    where = ast.get_child('where').children[0]
+    assert where.value == '='
+    assert where.children[1].value == '10'
@@ -0,0 +1,48 @@
+import pytest
+import mitzasql.sql_parser.tokens as Token
+from mitzasql.sql_parser.lexer import Lexer
+from mitzasql.sql_parser.parser import parse
+from mitzasql.sql_parser.state import State
+
+def test_token_subtypes_are_matched_by_mask():
+    assert Token.Keyword.Reserved.mask & Token.Keyword.bit
+    assert Token.Number.Dec.mask & Token.Literal.bit
+    assert not Token.Keyword.mask & Token.Keyword.Reserved.bit
+    assert not Token.Name.mask & Token.Keyword.bit
+
+def test_state_skips_whitespace_and_comments():
+    state = State(Lexer('  SELECT /* all */ count (1)').tokenize())
+    assert state.is_reserved('select')
+    state.next()
+    assert state.is_function() and state.value == 'count'
+    assert not state.is_function_call()
+    state.next(skip_whitespace=False)
+    assert state.is_skippable()
+    state.next()
+    assert state.is_open_paren()
+    assert state.pos == 25
+
+def test_lookahead_restores_the_state():
+    state = State(Lexer('a . b, c').tokenize())
+    with state as future_state:
+        future_state.next()
+        with future_state as nested_state:
+            nested_state.next()
+            assert nested_state.value == 'b'
+        assert future_state.is_dot()
+    assert state.value == 'a'
+    assert state.is_identifier()
+
+    for i in range(5):
+        state.next()
+    assert not state
+    assert state.value is None and state.pos is None
+    state.next()
+    assert not state
+
+def test_identifier_with_whitespace_around_the_dot_is_parsed():
+    ast = parse('SELECT count (1), t . col FROM t')[0]
+    column = ast.get_child('columns').children[2].children[0]
+    assert column.type == 'identifier'
+    assert column.value == 't'
+    assert column.children[0].value == 'col'
@@ -0,0 +1,28 @@
+import pytest
+from mitzasql.sql_parser.parser import (parse, split_statements)
+
+def test_statements_are_split():
+    raw_sql = '''SELECT 1; -- first
+    UPDATE t SET a = ';' /* ; */ WHERE id = 1;;
+    DELETE FROM t'''
+
+    statements = split_statements(raw_sql)
+    assert statements == [
+            'SELECT 1; -- first\n    ',
+            "UPDATE t SET a = ';' /* ; */ WHERE id = 1;",
+            ';\n    ',
+            'DELETE FROM t'
+            ]
+    assert ''.join(statements) == raw_sql
+
+    # The whitespace after the last semicolon belongs to the last statement
+    assert split_statements('SELECT 1; ') == ['SELECT 1; ']
+    assert split_statements('') == ['']
+
+def test_split_statements_parse_as_the_whole_text():
+    raw_sql = 'SELECT a FROM t1 AS x; UPDATE t2 SET b = 1; DELETE FROM t3'
+
+    whole = parse(raw_sql)
+    split = [ast for statement in split_statements(raw_sql) for ast in
+            parse(statement)]
+    assert [ast.type for ast in split] == [ast.type for ast in whole]
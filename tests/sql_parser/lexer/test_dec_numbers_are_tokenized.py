@@ -25,3 +25,7 @@ def test_decimal_numbers_are_tokenized():
     assert token_is_parsed((Token.Number.Dec, '.203'), tokens)
     assert not token_is_parsed((Token.Number.Dec, '1e20e30'), tokens)
     assert not token_is_parsed((Token.Number.Dec, '120a30'), tokens)
+
+def test_zero_at_the_end_is_tokenized():
+    tokens = list(Lexer('id = 0').tokenize())
+    assert token_is_parsed((Token.Number.Dec, '0'), tokens)
@@ -0,0 +1,16 @@
+import pytest
+import mitzasql.sql_parser.tokens as Token
+from mitzasql.sql_parser import keywords
+
+def test_keywords_are_classified():
+    assert keywords.classify('SELECT') == Token.Keyword.Reserved
+    assert keywords.classify('Engine') == Token.Keyword
+    assert keywords.classify('concat') == Token.Function
+    assert keywords.classify('null') == Token.Null
+    assert keywords.classify('xor') == Token.Operator
+    assert keywords.classify('customer_id') == Token.Other
+
+def test_first_keyword_dict_has_precedence():
+    assert keywords.classify('mod') == Token.Operator
+    assert keywords.classify('char') == Token.Keyword.Reserved
+    assert keywords.classify('year') == Token.Keyword
@@ -31,3 +31,9 @@ def test_parens_are_tokenized():
 
     assert open_parens_count == 3
     assert closed_parens_count == 2
+
+def test_param_marker_is_tokenized():
+    raw = 'id IN (?)'
+    tokens = list(Lexer(raw).tokenize())
+    assert token_is_parsed((Token.ParamMarker, '?'), tokens)
+    assert token_is_parsed((Token.Paren, ')'), tokens)
@@ -0,0 +1,42 @@
+import pytest
+import mitzasql.sql_parser.tokens as Token
+from mitzasql.sql_parser.lexer import Lexer
+
+def test_token_positions_are_tracked():
+    raw = "SELECT @a := 'it\\'s', 1e5e3 FROM `t` WHERE x <=> .5 # end"
+    tokens = [token for token in Lexer(raw).tokenize() if token[0] != Token.Whitespace]
+    assert tokens == [
+        (Token.Keyword.Reserved, 'SELECT', 0),
+        (Token.Variable, '@a', 7),
+        (Token.Operator.Symbol, ':=', 10),
+        (Token.String, "'it\\'s'", 13),
+        (Token.Comma, ',', 20),
+        (Token.Number.Dec, '1e5', 22),
+        (Token.Other, 'e3', 25),
+        (Token.Keyword.Reserved, 'FROM', 28),
+        (Token.Name, '`t`', 33),
+        (Token.Keyword.Reserved, 'WHERE', 37),
+        (Token.Other, 'x', 43),
+        (Token.Operator.Symbol, '<=>', 45),
+        (Token.Number.Dec, '.5', 49),
+        (Token.Comment, '# end', 52),
+    ]
+
+def test_non_ascii_text_is_tokenized():
+    raw = 'SELECT ²3, 1.5, numǎr FROM t'
+    tokens = list(Lexer(raw).tokenize())
+    assert tokens == [
+        (Token.Keyword.Reserved, 'SELECT', 0),
+        (Token.Whitespace, ' ', 6),
+        (Token.Number.Dec, '²3', 7),
+        (Token.Comma, ',', 9),
+        (Token.Whitespace, ' ', 10),
+        (Token.Number.Dec, '1.5', 11),
+        (Token.Comma, ',', 14),
+        (Token.Whitespace, ' ', 15),
+        (Token.Other, 'numǎr', 16),
+        (Token.Whitespace, ' ', 21),
+        (Token.Keyword.Reserved, 'FROM', 22),
+        (Token.Whitespace, ' ', 26),
+        (Token.Other, 't', 27),
+    ]
@@ -0,0 +1,54 @@
+import urwid
+
+from mitzasql.ui.syntax_highlight import (highlight, LineHighlighter)
+from mitzasql.ui.widgets.query_editor import QueryEditor
+
+text = '''SELECT id, name
+FROM users /* the active
+users only */ WHERE active = 1;
+UPDATE users SET name = 'multi
+line' WHERE id = 2;'''
+
+def styled_chars(markup):
+    return [(attr, char) for attr, value in markup for char in value
+            if char != '\n']
+
+def test_line_highlighter_matches_the_highlight_of_the_whole_text():
+    highlighter = LineHighlighter()
+    lines = highlighter.highlight(text)
+    assert len(lines) == 5
+    assert ([char for line in lines for char in styled_chars(line)] ==
+            styled_chars(highlight(text)))
+
+def test_line_highlighter_lexes_again_only_the_changed_lines():
+    highlighter = LineHighlighter()
+    lines = highlighter.highlight(text)
+
+    edited = highlighter.highlight(text.replace('SELECT id', 'SELECT uid'))
+    assert edited[0] is not lines[0]
+    assert all(edited[i] is lines[i] for i in range(1, 5))
+
+    # Closing the comment earlier changes the state the next lines start in
+    lines = highlighter.highlight(text)
+    edited = highlighter.highlight(text.replace('the active', 'the */ active'))
+    assert edited[0] is lines[0]
+    assert edited[2] is not lines[2]
+    assert lines[2][0][0] == 'sql:comment.multiline'
+    assert edited[2][0][0] != 'sql:comment.multiline'
+
+def test_editor_renders_the_highlighted_text():
+    editor = QueryEditor(None)
+    editor.set_edit_text(text * 30)
+    editor.set_edit_pos(len(text) * 20 + 8)
+    size = (20,)
+
+    canvas = editor.render(size, focus=True)
+    expected = urwid.Text(highlight(text * 30)).render(size)
+    assert list(canvas.content()) == list(expected.content())
+    assert canvas.cursor == urwid.Edit.position_coords(editor, 20,
+            editor.edit_pos)
+
+    editor.insert_text('x')
+    canvas = editor.render(size, focus=True)
+    expected = urwid.Text(highlight(editor.edit_text)).render(size)
+    assert list(canvas.content()) == list(expected.content())
@@ -0,0 +1,106 @@
+import urwid
+
+from mitzasql.db.model import Model
+from mitzasql.ui.widgets.table import (Table, TBody, ModelRowsWalker,
+        column_window)
+from mitzasql.ui.widgets.row_format import (RowFormatter, NULL_ATTR)
+
+columns = [
+        {
+        'name': 'id',
+        'max_len': 5,
+        'is_int': True,
+        'is_real': False,
+        'is_binary': False,
+        'is_text': False,
+        'is_spatial': False
+        },
+        {
+        'name': 'name',
+        'max_len': 10,
+        'is_int': False,
+        'is_real': False,
+        'is_binary': False,
+        'is_text': True,
+        'is_spatial': False
+        }
+        ]
+
+class SparseModel(Model):
+    '''Model which loads every other row until `loaded` is set'''
+    loaded = False
+
+    def row(self, index):
+        if index % 2 and not self.loaded:
+            return None
+        return super().row(index)
+
+def test_model_backed_body_builds_only_the_displayed_rows():
+    model = Model([(i, 'row {0}'.format(i)) for i in range(10000)], columns)
+    body = TBody(columns, [5, 10], model=model)
+    assert isinstance(body.body, ModelRowsWalker)
+
+    body.set_focus(5000)
+    canvas = body.render((20, 5), focus=True)
+    assert b'5000| row 5000' in b''.join(canvas.text)
+    assert len(body.body._widgets) < 20
+
+def test_model_backed_body_keeps_the_last_built_rows():
+    model = Model([(i, 'row {0}'.format(i)) for i in range(10000)], columns)
+    body = TBody(columns, [5, 10], model=model)
+    for position in range(0, 10000, 20):
+        body.set_focus(position)
+        body.render((20, 5), focus=True)
+
+    assert len(body.body._widgets) == ModelRowsWalker.MAX_WIDGETS
+    assert 9980 in body.body._widgets
+
+def test_model_backed_body_replaces_placeholders_with_loaded_rows():
+    model = SparseModel([(i, 'row {0}'.format(i)) for i in range(10)], columns)
+    body = TBody(columns, [5, 10], model=model)
+    canvas = body.render((20, 3))
+    assert canvas.text[1].decode().strip() == '|'
+
+    model.loaded = True
+    body.refresh_rows()
+    canvas = body.render((20, 3))
+    assert canvas.text[1].decode().startswith('   1| row 1')
+
+def test_column_window_shows_the_focused_column():
+    sizes = [5, 10, 5, 20, 5]
+    assert column_window(sizes, 0, 30) == (0, 2)
+    assert column_window(sizes, 3, 30) == (2, 3)
+    assert column_window(sizes, 4, 30) == (3, 4)
+    assert column_window(sizes, 3, 10) == (3, 3)
+
+def test_table_builds_only_the_visible_cells_of_wide_tables():
+    wide_columns = [dict(columns[0], name='c{0}'.format(i)) for i in range(300)]
+    model = Model([tuple(range(300)) for i in range(100)], wide_columns)
+    table = Table(model)
+    size = (30, 10)
+    table.render(size, focus=True)
+
+    header = table._header.original_widget
+    assert header.text.split() == ['c0|', 'c1|', 'c2|', 'c3|', 'c4|']
+    assert table._body.focused_row.text.split() == ['0|', '1|', '2|', '3|',
+            '4|']
+
+    table.keypress(size, '$')
+    canvas = table.render(size, focus=True)
+    assert canvas.text[0].decode().rstrip().endswith('c299')
+    assert canvas.text[1].decode().rstrip().endswith('299')
+    assert table._body.focused_row.text.split() == ['295|', '296|', '297|',
+            '298|', '299']
+
+def test_row_formatter_formats_the_cells_of_each_column():
+    formatter = RowFormatter(columns, [5, 10])
+    assert formatter.format((1, 'row 1')) == ['   1| row 1     ']
+    assert formatter.format((None, 'a\nb')) == [(NULL_ATTR, '(NU»'),
+            '| a\\nb      ']
+    assert formatter.format((12, 'a long row name')) == ['  12| a long ro»']
+    assert formatter.format((1, 'row 1'), 1, 1) == ['row 1     ']
+
+    formatter.set_width(1, 3)
+    assert formatter.format((1, 'row 1')) == ['   1| ro»']
+    assert formatter.format_header() == ['  id', ('theader_sep', '|'), ' ',
+            'na»']